@@ -0,0 +1,129 @@
+"""Compare compiled fieldz functions against each library's native implementation.
+
+Run with `python benchmarks/bench_compiled.py`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import timeit
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import attrs
+
+import fieldz
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclasses.dataclass
+class DataclassRecord:
+    a: int = 0
+    b: str = "b"
+    c: float = 0.0
+    d: bool = False
+    e: str | None = None
+    f: int = 1
+
+
+@attrs.define
+class AttrsRecord:
+    a: int = 0
+    b: str = "b"
+    c: float = 0.0
+    d: bool = False
+    e: str | None = None
+    f: int = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class FrozenDataclassRecord:
+    a: int = 0
+    b: str = "b"
+    c: float = 0.0
+    d: bool = False
+    e: str | None = None
+    f: int = 1
+
+
+@attrs.frozen
+class FrozenAttrsRecord:
+    a: int = 0
+    b: str = "b"
+    c: float = 0.0
+    d: bool = False
+    e: str | None = None
+    f: int = 1
+
+
+class NamedTupleRecord(NamedTuple):
+    a: int = 0
+    b: str = "b"
+    c: float = 0.0
+    d: bool = False
+    e: str | None = None
+    f: int = 1
+
+
+NATIVE_ASDICT: dict[type, Callable[[Any], Any]] = {
+    DataclassRecord: dataclasses.asdict,
+    AttrsRecord: attrs.asdict,
+    NamedTupleRecord: NamedTupleRecord._asdict,
+}
+NATIVE_ASTUPLE: dict[type, Callable[[Any], Any]] = {
+    DataclassRecord: dataclasses.astuple,
+    AttrsRecord: attrs.astuple,
+    NamedTupleRecord: tuple,
+}
+
+NATIVE_REPLACE: dict[type, Callable[..., Any]] = {
+    DataclassRecord: dataclasses.replace,
+    FrozenDataclassRecord: dataclasses.replace,
+    AttrsRecord: attrs.evolve,
+    FrozenAttrsRecord: attrs.evolve,
+}
+
+
+def _time(fn: Callable[[], Any], number: int) -> float:
+    """Return the best time per call, in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def _report(label: str, native: float, default: float, compiled: float) -> None:
+    print(
+        f"{label:<30} native {native:7.3f} us  fieldz {default:7.3f} us  "
+        f"compiled {compiled:7.3f} us  (x{default / compiled:.1f} vs fieldz)"
+    )
+
+
+def bench_asdict(number: int = 20_000) -> None:
+    for op, natives in (("asdict", NATIVE_ASDICT), ("astuple", NATIVE_ASTUPLE)):
+        func = getattr(fieldz, op)
+        for cls, native_fn in natives.items():
+            obj = cls()
+            native = _time(lambda: native_fn(obj), number)  # noqa: B023
+            default = _time(lambda: func(obj), number)  # noqa: B023
+            compiled = _time(lambda: func(obj, compiled=True), number)  # noqa: B023
+            _report(f"{op} {cls.__name__}", native, default, compiled)
+
+
+def bench_replace(number: int = 20_000) -> None:
+    # the fieldz column is the library's replace function plus fieldz's dispatch,
+    # which is what fieldz.replace did before it was compiled.
+    for cls, native_fn in NATIVE_REPLACE.items():
+        obj = cls()
+        adapter = fieldz.get_adapter(obj)
+        native = _time(lambda: native_fn(obj, a=1, e="e"), number)  # noqa: B023
+        default = _time(
+            lambda: fieldz.get_adapter(obj).replace(obj, a=1, e="e"),  # noqa: B023
+            number,
+        )
+        compiled = _time(lambda: fieldz.replace(obj, a=1, e="e"), number)  # noqa: B023
+        _report(f"replace {cls.__name__}", native, default, compiled)
+        assert adapter.replace(obj, a=1) == fieldz.replace(obj, a=1)
+
+
+if __name__ == "__main__":
+    bench_asdict()
+    bench_replace()
@@ -0,0 +1,144 @@
+"""Measure the time to extract the fields of many models in a fresh process.
+
+Generates a package of models (pydantic models, attrs classes and dataclasses,
+with `Annotated` constraints) in a temporary directory, then, in new processes,
+imports it and times `fieldz.fields` for every model: without a persistent cache,
+with an empty one (which is filled) and with a filled one (see
+`fieldz.persistent_cache`). Prints the best time of each.
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py -n 6000 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+MODELS_PER_MODULE = 50
+
+HEADER = """\
+import dataclasses
+from typing import Annotated, Optional
+
+import annotated_types as at
+import attrs
+import pydantic
+"""
+
+PYDANTIC = """
+class P{i}(pydantic.BaseModel):
+    id: int = pydantic.Field(0, ge=0, description="id")
+    name: Annotated[str, at.MaxLen(20)] = "x"
+    score: float = pydantic.Field(0.5, gt=0, lt=1)
+    tags: list[str] = []
+    parent: Optional[int] = None
+    ratio: Annotated[float, at.Ge(0), at.Le(10)] = 1.0
+    label: str = pydantic.Field("a", min_length=1, max_length=8)
+    flag: bool = False
+"""
+
+ATTRS = """
+@attrs.define
+class A{i}:
+    id: int = 0
+    name: Annotated[str, at.MaxLen(20)] = "x"
+    score: float = 0.5
+    tags: list[str] = attrs.Factory(list)
+    parent: Optional[int] = None
+    flag: bool = False
+"""
+
+DATACLASS = """
+@dataclasses.dataclass
+class D{i}:
+    id: int = 0
+    name: Annotated[str, at.MaxLen(20)] = "x"
+    score: float = 0.5
+    tags: list[str] = dataclasses.field(default_factory=list)
+    parent: Optional[int] = None
+    flag: bool = False
+"""
+
+# run in a new process: prints the time taken by fields() for every model, in ms
+SCRIPT = """
+import importlib, sys, time
+import fieldz
+
+modules = [importlib.import_module(f"models.m{{i}}") for i in range({modules})]
+classes = [v for m in modules for v in vars(m).values() if getattr(v, "_model", 0)]
+if sys.argv[1:]:
+    fieldz.persistent_cache(sys.argv[1])
+start = time.perf_counter()
+for cls in classes:
+    fieldz.fields(cls)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _write_models(root: Path, n: int) -> int:
+    package = root / "models"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    templates = (PYDANTIC, ATTRS, DATACLASS)
+    modules = max(1, n // MODELS_PER_MODULE)
+    for m in range(modules):
+        lines = [HEADER]
+        for i in range(m * MODELS_PER_MODULE, (m + 1) * MODELS_PER_MODULE):
+            name = "PAD"[i % 3] + str(i)
+            lines += [templates[i % 3].format(i=i), f"{name}._model = 1"]
+        (package / f"m{m}.py").write_text("\n".join(lines))
+    return modules
+
+
+def _run(root: Path, script: str, *args: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=3000, help="number of models")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        modules = _write_models(root, args.n)
+        script = SCRIPT.format(modules=modules)
+        cache = str(root / "cache")
+        _run(root, script)  # compile the modules to bytecode first
+
+        def cold() -> float:
+            shutil.rmtree(cache, ignore_errors=True)
+            return _run(root, script, cache)
+
+        results = {
+            "no persistent cache": lambda: _run(root, script),
+            "empty cache (filled)": cold,
+            "filled cache": lambda: _run(root, script, cache),
+        }
+        times: dict[str, list[float]] = {label: [] for label in results}
+        for _ in range(args.repeat):  # interleaved, so that all see the same noise
+            for label, fn in results.items():
+                times[label].append(fn())
+        print(
+            f"fields() of {modules * MODELS_PER_MODULE} models, best of {args.repeat}\n"
+        )
+        for label, values in times.items():
+            print(f"{label:<22} {min(values):>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Equivalent models for every library supported by fieldz, in several shapes.
+
+Each builder takes a class name and a list of `(name, type, default)` specs and
+returns a class. Libraries that are not installed are skipped.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+Spec = list[tuple[str, Any, Any]]
+Builder = Callable[[str, Spec], type]
+
+
+def _dataclass(name: str, spec: Spec) -> type:
+    return dataclasses.make_dataclass(
+        name, [(n, t, dataclasses.field(default=d)) for n, t, d in spec]
+    )
+
+
+def _attrs(name: str, spec: Spec) -> type:
+    import attrs
+
+    return attrs.make_class(
+        name, {n: attrs.field(default=d, type=t) for n, t, d in spec}
+    )
+
+
+def _pydantic(name: str, spec: Spec) -> type:
+    import pydantic
+
+    model: type = pydantic.create_model(name, **{n: (t, d) for n, t, d in spec})
+    return model
+
+
+def _pydantic_v1(name: str, spec: Spec) -> type:
+    import pydantic.v1
+
+    model: type = pydantic.v1.create_model(name, **{n: (t, d) for n, t, d in spec})
+    return model
+
+
+def _msgspec(name: str, spec: Spec) -> type:
+    import msgspec
+
+    return msgspec.defstruct(name, spec)
+
+
+def _dataclassy(name: str, spec: Spec) -> type:
+    import dataclassy
+
+    ns = {n: d for n, _, d in spec}
+    ns["__annotations__"] = {n: t for n, t, _ in spec}
+    return dataclassy.dataclass(type(name, (), ns))  # type: ignore [no-any-return]
+
+
+def _named_tuple(name: str, spec: Spec) -> type:
+    cls = NamedTuple(name, [(n, t) for n, t, _ in spec])  # type: ignore [misc]
+    cls.__new__.__defaults__ = tuple(d for _, _, d in spec)
+    cls._field_defaults = {n: d for n, _, d in spec}
+    return cls
+
+
+def _typed_dict(name: str, spec: Spec) -> type:
+    return typing.TypedDict(name, {n: t for n, t, _ in spec})  # type: ignore
+
+
+BUILDERS: dict[str, Builder] = {
+    "dataclasses": _dataclass,
+    "attrs": _attrs,
+    "pydantic": _pydantic,
+    "pydantic_v1": _pydantic_v1,
+    "msgspec": _msgspec,
+    "dataclassy": _dataclassy,
+    "named_tuple": _named_tuple,
+    "typed_dict": _typed_dict,
+}
+
+FLAT: Spec = [
+    ("a", int, 0),
+    ("b", str, "b"),
+    ("c", float, 0.0),
+    ("d", bool, False),
+    ("e", typing.Optional[str], None),  # noqa: UP045
+    ("f", tuple[int, ...], ()),
+]
+
+_WIDE_TYPES = [(int, 0), (str, ""), (float, 0.0), (bool, False)]
+WIDE: Spec = [(f"f{i}", *_WIDE_TYPES[i % len(_WIDE_TYPES)]) for i in range(200)]
+
+
+@dataclasses.dataclass
+class Case:
+    """A model class (and a sample instance) for one library and shape."""
+
+    library: str
+    shape: str
+    cls: type
+    instance: Any
+
+
+def build_cases(libraries: list[str] | None = None) -> list[Case]:
+    """Build flat, wide and nested models for each (installed) library."""
+    cases = []
+    for library, builder in BUILDERS.items():
+        if libraries and library not in libraries:
+            continue
+        try:
+            flat = builder(f"Flat_{library}", FLAT)
+            wide = builder(f"Wide_{library}", WIDE)
+            # nested: a model holding one inner model and a tuple of them
+            nested = builder(
+                f"Nested_{library}",
+                [
+                    ("id", int, 0),
+                    ("child", flat, None),
+                    ("children", tuple[flat, ...], ()),
+                ],
+            )
+        except ImportError:
+            continue
+        values = {n: d for n, _, d in FLAT}
+        cases.append(Case(library, "flat", flat, flat(**values)))
+        cases.append(Case(library, "wide", wide, wide(**{n: d for n, _, d in WIDE})))
+        nested_values = {
+            "id": 1,
+            "child": flat(**values),
+            "children": tuple(flat(**values) for _ in range(10)),
+        }
+        cases.append(Case(library, "nested", nested, nested(**nested_values)))
+    return cases
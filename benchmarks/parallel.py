@@ -0,0 +1,88 @@
+"""Measure the scaling of `fieldz.parallel.asdict_many` with the number of workers.
+
+Converts a collection of nested records (a dataclass holding an attrs object, a
+list and a dict) in-process with `fieldz.asdict_many`, and in parallel with 1, 2,
+4, 8 and 16 worker processes, and prints the speedup of each.
+
+    python benchmarks/parallel.py
+    python benchmarks/parallel.py -n 1000000 --workers 8 16 --compiled
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+import fieldz
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@attrs.define
+class Item:
+    name: str
+    tags: list[str] = attrs.Factory(list)
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    item: Item
+    values: dict[str, float] = dataclasses.field(default_factory=dict)
+    children: list[Item] = dataclasses.field(default_factory=list)
+
+
+def _records(n: int) -> list[Record]:
+    return [
+        Record(i, Item(f"i{i}", ["a", "b"]), {"x": i / 2}, [Item("c")] * (i % 4))
+        for i in range(n)
+    ]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000, help="number of records")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--compiled", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    records = _records(args.n)
+    kwargs = {"compiled": args.compiled}
+    print(f"{args.n} records, {os.cpu_count()} CPUs, compiled={args.compiled}\n")
+
+    base = _best(lambda: fieldz.asdict_many(records, **kwargs), args.repeat)
+    print(f"{'in-process':<14} {base:>8.2f} s")
+    for workers in args.workers:
+        with ProcessPoolExecutor(workers) as pool:
+            pool.submit(int).result()  # start the workers before timing
+            elapsed = _best(
+                lambda pool=pool: fieldz.parallel.asdict_many(
+                    records, executor=pool, chunksize=args.chunksize, **kwargs
+                ),
+                args.repeat,
+            )
+        print(f"{f'{workers} workers':<14} {elapsed:>8.2f} s {base / elapsed:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Benchmark every public fieldz operation across all supported libraries.
+
+Each operation is timed (best of several repeats) and its peak memory is measured
+with tracemalloc, for flat, wide (200 fields) and nested models of each installed
+library (see `models.py`).
+
+    python benchmarks/suite.py                         # print a table
+    python benchmarks/suite.py --json base.json        # save results
+    python benchmarks/suite.py --compare base.json     # exit 1 on regressions
+
+Results are keyed by `operation/library/shape`, e.g. `asdict/attrs/wide`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from models import Case, build_cases
+
+import fieldz
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# peak memory changes below this many bytes are ignored when comparing runs
+MEMORY_NOISE_BYTES = 1024
+
+
+def _operations(case: Case) -> dict[str, Callable[[], Any]]:
+    """Return {operation name: zero-argument callable} for a model."""
+    cls, obj = case.cls, case.instance
+    first = next(iter(fieldz.fields(cls))).name
+    value = getattr(obj, first, None)
+    field_types = [f.type for f in fieldz.fields(cls)]
+
+    def fields_cold() -> Any:
+        fieldz.clear_cache(cls)
+        return fieldz.fields(cls)
+
+    def display_as_type() -> Any:
+        return [fieldz.display_as_type(tp) for tp in field_types]
+
+    ops: dict[str, Callable[[], Any]] = {
+        "get_adapter": lambda: fieldz.get_adapter(cls),
+        "fields": lambda: fieldz.fields(cls),
+        "fields[raw]": lambda: fieldz.fields(cls, parse_annotated=False),
+        "fields[cold]": fields_cold,
+        "params": lambda: fieldz.params(cls),
+        "display_as_type": display_as_type,
+    }
+    if case.library != "typed_dict":  # TypedDict instances are plain dicts
+        data = fieldz.asdict(obj, compiled=True)
+        ops.update(
+            {
+                "get_adapter": lambda: fieldz.get_adapter(obj),
+                "asdict": lambda: fieldz.asdict(obj),
+                "asdict[compiled]": lambda: fieldz.asdict(obj, compiled=True),
+                "asdict[shallow]": lambda: fieldz.asdict(obj, recurse=False),
+                "astuple": lambda: fieldz.astuple(obj),
+                "astuple[compiled]": lambda: fieldz.astuple(obj, compiled=True),
+                "astuple[shallow]": lambda: fieldz.astuple(obj, recurse=False),
+                "replace": lambda: fieldz.replace(obj, **{first: value}),
+                "from_dict": lambda: fieldz.from_dict(cls, data),
+            }
+        )
+    return ops
+
+
+def _time(fn: Callable[[], Any], min_time: float, repeat: int) -> float:
+    """Return the best time per call, in nanoseconds."""
+    # calibrate the number of calls per repeat so that each takes >= min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+def _peak_memory(fn: Callable[[], Any]) -> int:
+    """Return the peak memory (in bytes) allocated during a single call."""
+    fn()  # warm up caches, so that only the steady state is measured
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def run(
+    filters: list[str], libraries: list[str], min_time: float, repeat: int
+) -> dict[str, dict[str, float]]:
+    """Run all benchmarks matching `filters`, printing each as it completes."""
+    results = {}
+    print(f"{'benchmark':<42} {'time':>12} {'peak memory':>14}")
+    for case in build_cases(libraries):
+        for op, fn in _operations(case).items():
+            name = f"{op}/{case.library}/{case.shape}"
+            if filters and not any(f in name for f in filters):
+                continue
+            ns = _time(fn, min_time, repeat)
+            peak = _peak_memory(fn)
+            results[name] = {"ns": ns, "peak_bytes": peak}
+            print(f"{name:<42} {_fmt_time(ns):>12} {peak:>12} B", flush=True)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Print a comparison with `baseline` and return the regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<42} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, current in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        ratio = current["ns"] / base["ns"]
+        extra_bytes = current["peak_bytes"] - base["peak_bytes"]
+        slower = ratio > 1 + threshold
+        bigger = extra_bytes > max(MEMORY_NOISE_BYTES, base["peak_bytes"] * threshold)
+        flag = "  SLOWER" if slower else ""
+        if bigger:
+            flag += f"  +{extra_bytes} B"
+        if slower or bigger:
+            regressions.append(name)
+        print(
+            f"{name:<42} {_fmt_time(base['ns']):>12} {_fmt_time(current['ns']):>12} "
+            f"{ratio:>7.2f}x{flag}"
+        )
+    return regressions
+
+
+def _fmt_time(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def _metadata() -> dict[str, Any]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    libraries = {}
+    for dist in ("attrs", "pydantic", "msgspec", "dataclassy", "numpy"):
+        try:
+            libraries[dist] = version(dist)
+        except PackageNotFoundError:
+            pass
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "fieldz": fieldz.__version__,
+        "libraries": libraries,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this string (repeatable)",
+    )
+    parser.add_argument(
+        "-l",
+        "--library",
+        action="append",
+        default=[],
+        help="only benchmark models of this library (repeatable)",
+    )
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="compare against a saved --json file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown (or memory growth) counted as a regression",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.02,
+        help="minimum duration of each timing repeat, in seconds",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.library, args.min_time, args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": _metadata(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if regressions := compare(results, baseline, args.threshold):
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for name in regressions:
+                print(f"  {name}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Measure how fieldz operations scale across threads.
+
+Each operation is called in a loop by 1, 2, 4, 8 and 16 threads at once, on the
+same (shared) classes and instances, and the total throughput is compared with
+that of a single thread. On free-threaded builds of Python (e.g. 3.13t, 3.14t),
+cached lookups take no lock and should scale nearly linearly up to the number of
+cores. With the GIL, throughput stays flat.
+
+    python benchmarks/threads.py                   # all operations
+    python benchmarks/threads.py -k fields -l attrs
+    python benchmarks/threads.py --threads 1 4 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from models import build_cases
+
+import fieldz
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _operations(libraries: list[str]) -> dict[str, Callable[[], Any]]:
+    """Return {name: zero-argument callable} for the flat model of each library."""
+    ops: dict[str, Callable[[], Any]] = {}
+    for case in build_cases(libraries):
+        if case.shape != "flat" or case.library == "typed_dict":
+            continue
+        cls, obj = case.cls, case.instance
+        ops[f"fields/{case.library}"] = lambda cls=cls: fieldz.fields(cls)
+        ops[f"asdict/{case.library}"] = lambda obj=obj: fieldz.asdict(obj)
+        ops[f"asdict[compiled]/{case.library}"] = lambda obj=obj: fieldz.asdict(
+            obj, compiled=True
+        )
+        ops[f"asdict[shallow]/{case.library}"] = lambda obj=obj: fieldz.asdict(
+            obj, recurse=False
+        )
+    return ops
+
+
+def _throughput(fn: Callable[[], Any], threads: int, duration: float) -> float:
+    """Return the total number of calls per second made by `threads` threads."""
+    fn()  # warm up caches
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(i: int) -> None:
+        n = 0
+        barrier.wait()
+        while not stop.is_set():
+            for _ in range(100):
+                fn()
+            n += 100
+        counts[i] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def run(
+    filters: list[str], libraries: list[str], threads: list[int], duration: float
+) -> dict[str, dict[int, float]]:
+    """Print a table of throughputs, and their ratio to `threads[0]` x one thread."""
+    header = "".join(f"{n:>14}" for n in threads)
+    print(f"{'calls/s (parallel efficiency)':<36}{header}")
+    results = {}
+    for name, fn in _operations(libraries).items():
+        if filters and not any(f in name for f in filters):
+            continue
+        results[name] = {n: _throughput(fn, n, duration) for n in threads}
+        base = results[name][threads[0]] / threads[0]
+        cells = "".join(
+            f"{rate / 1e3:>8.0f}k {rate / base / n:>4.0%}"
+            for n, rate in results[name].items()
+        )
+        print(f"{name:<36}{cells}", flush=True)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this string (repeatable)",
+    )
+    parser.add_argument(
+        "-l",
+        "--library",
+        action="append",
+        default=[],
+        help="only benchmark models of this library (repeatable)",
+    )
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.5,
+        help="duration of each measurement, in seconds",
+    )
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    state = "enabled" if gil else "disabled"
+    print(f"Python {sys.version.split()[0]} (GIL {state}), {os.cpu_count()} CPUs\n")
+    run(args.filter, args.library, args.threads, args.duration)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,152 @@
 """Utilities for providing compatibility with many dataclass-like libraries."""
 
-from importlib.metadata import PackageNotFoundError, version
-
-try:
-    __version__ = version("fieldz")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "uninstalled"
+# NOTE: submodules (and the version) are imported lazily, on first attribute access,
+# to keep `import fieldz` fast. tests/test_import_time.py guards this.
+TYPE_CHECKING = False
 
 __all__ = [
     "Adapter",
+    "ConstraintViolation",
     "Constraints",
     "DataclassParams",
     "Field",
     "asdict",
+    "asdict_many",
     "astuple",
+    "astuple_many",
+    "clear_cache",
+    "diff",
+    "diff_many",
     "display_as_type",
     "fields",
+    "fingerprint",
+    "from_columns",
+    "from_dict",
+    "from_dicts",
+    "from_records",
     "get_adapter",
+    "iter_asdict",
     "params",
+    "persistent_cache",
+    "profile",
+    "register_adapter",
     "replace",
+    "replace_many",
+    "schema",
+    "schema_hash",
+    "stats",
+    "to_columns",
+    "to_dtype",
+    "to_structured_array",
+    "validate_columns",
+    "validate_many",
+    "validator",
 ]
 
-from ._functions import asdict, astuple, fields, get_adapter, params, replace
-from ._repr import display_as_type
-from ._types import Constraints, DataclassParams, Field
-from .adapters import Adapter
+if TYPE_CHECKING:
+    from ._cache import clear_cache
+    from ._columns import (
+        from_columns,
+        from_records,
+        to_columns,
+        to_dtype,
+        to_structured_array,
+    )
+    from ._diff import diff, diff_many
+    from ._functions import (
+        asdict,
+        asdict_many,
+        astuple,
+        astuple_many,
+        fields,
+        get_adapter,
+        params,
+        replace,
+        replace_many,
+    )
+    from ._hashing import fingerprint, schema, schema_hash
+    from ._instrument import profile, stats
+    from ._persist import persistent_cache
+    from ._registry import register_adapter
+    from ._repr import display_as_type
+    from ._stream import iter_asdict
+    from ._structure import from_dict, from_dicts
+    from ._types import Constraints, DataclassParams, Field
+    from ._validate import (
+        ConstraintViolation,
+        validate_columns,
+        validate_many,
+        validator,
+    )
+    from .adapters import Adapter
+
+    __version__: str
+
+# public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "Adapter": "adapters",
+    "ConstraintViolation": "_validate",
+    "Constraints": "_types",
+    "DataclassParams": "_types",
+    "Field": "_types",
+    "asdict": "_functions",
+    "asdict_many": "_functions",
+    "astuple": "_functions",
+    "astuple_many": "_functions",
+    "clear_cache": "_cache",
+    "diff": "_diff",
+    "diff_many": "_diff",
+    "display_as_type": "_repr",
+    "fields": "_functions",
+    "fingerprint": "_hashing",
+    "schema": "_hashing",
+    "schema_hash": "_hashing",
+    "from_columns": "_columns",
+    "from_dict": "_structure",
+    "from_dicts": "_structure",
+    "from_records": "_columns",
+    "get_adapter": "_functions",
+    "iter_asdict": "_stream",
+    "params": "_functions",
+    "persistent_cache": "_persist",
+    "profile": "_instrument",
+    "register_adapter": "_registry",
+    "replace": "_functions",
+    "replace_many": "_functions",
+    "stats": "_instrument",
+    "to_columns": "_columns",
+    "to_dtype": "_columns",
+    "to_structured_array": "_columns",
+    "validate_columns": "_validate",
+    "validate_many": "_validate",
+    "validator": "_validate",
+}
+
+# public submodules, imported on first access (e.g. `fieldz.aio.aiter_asdict`)
+_LAZY_SUBMODULES = {"adapters", "aio", "parallel"}
+
+
+def __getattr__(name: str) -> object:
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value: object = version("fieldz")
+        except PackageNotFoundError:  # pragma: no cover
+            value = "uninstalled"
+    elif (module := _LAZY_ATTRS.get(name)) is not None:
+        from importlib import import_module
+
+        value = getattr(import_module(f"{__name__}.{module}"), name)
+    elif name in _LAZY_SUBMODULES:
+        from importlib import import_module
+
+        value = import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # so that __getattr__ is only called once per name
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__, "__version__"})
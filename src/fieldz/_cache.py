@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import sys
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_V = TypeVar("_V")
+
+# sentinel returned by TypeCache.get when there is no entry for a class
+MISS: Any = object()
+
+# whether cache hits are counted. Counting makes every lookup write to the cache,
+# which prevents lookups from scaling across threads on free-threaded builds,
+# where hits are only counted during a `fieldz.profile()`.
+count_hits: bool = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# every cache created, so that they can all be cleared (or inspected) at once.
+# Caches are created when (lazily imported) modules are, possibly while another
+# thread iterates over them: see `all_caches`.
+_CACHES: weakref.WeakSet[TypeCache | IdentityCache] = weakref.WeakSet()
+_CACHES_LOCK = threading.Lock()
+
+
+def all_caches() -> list[TypeCache | IdentityCache]:
+    """Return a snapshot of every cache created."""
+    with _CACHES_LOCK:
+        return list(_CACHES)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for one of fieldz's internal caches."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class TypeCache(Generic[_V]):
+    """A bounded mapping of classes to cached values, with weakly-held keys.
+
+    Entries are dropped automatically when their class is garbage collected, so
+    dynamically created classes are never kept alive by the cache. When `maxsize`
+    is reached, the oldest entries are evicted first.
+
+    Lookups are safe from any thread and take no lock: entries are keyed by the
+    `id` of their class, and hold a weak reference to it that is checked on each
+    lookup (ids may be reused once a class is collected). On free-threaded builds,
+    hits are only counted while a `fieldz.profile()` is active (see `count_hits`),
+    so that concurrent lookups never write to shared memory.
+    """
+
+    __slots__ = ("__weakref__", "_data", "hits", "maxsize", "misses", "name")
+
+    def __init__(self, name: str, maxsize: int | None = 4096) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # id(cls) -> (weakref to cls, value)
+        self._data: dict[int, tuple[weakref.ref[type], _V]] = {}
+        with _CACHES_LOCK:
+            _CACHES.add(self)
+
+    def get(self, cls: type) -> _V:
+        """Return the value cached for `cls`, or `MISS` if there is none."""
+        entry = self._data.get(id(cls))
+        if entry is not None and entry[0]() is cls:
+            if count_hits:
+                self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return cast("_V", MISS)
+
+    def set(self, cls: type, value: _V) -> _V:
+        """Cache `value` for `cls` (evicting old entries if needed) and return it."""
+        data = self._data
+        data[id(cls)] = (weakref.ref(cls, _remover(self, id(cls))), value)
+        if self.maxsize is not None:
+            _evict(data, self.maxsize)
+        return value
+
+    def discard(self, cls: type) -> None:
+        """Remove the entry for `cls`, if present."""
+        _discard(self._data, id(cls), cls)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss statistics for this cache."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, cls: type) -> bool:
+        entry = self._data.get(id(cls))
+        return entry is not None and entry[0]() is cls
+
+
+def _remover(cache: TypeCache | IdentityCache, key: Any) -> Callable[[Any], None]:
+    """Return a weakref callback removing the entry `key` of `cache`."""
+    cacheref = weakref.ref(cache)
+
+    def _remove(wr: weakref.ref) -> None:
+        # the key (an id) may have been reused for a new entry in the meantime
+        if (cache := cacheref()) is not None:
+            _discard(cache._data, key, wr)
+
+    return _remove
+
+
+def _discard(data: dict, key: Any, ref: Any) -> None:
+    """Remove `data[key]` if it holds `ref` (or a weakref to it)."""
+    if (entry := data.get(key)) is not None and (
+        entry[0] is ref or (type(entry[0]) is weakref.ref and entry[0]() is ref)
+    ):
+        # another thread may have replaced (or removed) the entry since the check,
+        # in which case a valid entry may be dropped, which is harmless
+        data.pop(key, None)
+
+
+def _evict(data: dict, maxsize: int) -> None:
+    """Remove the oldest entries of `data` until it has at most `maxsize`."""
+    while len(data) > maxsize:
+        try:
+            del data[next(iter(data))]
+        except (KeyError, RuntimeError, StopIteration):  # pragma: no cover
+            # another thread modified the cache at the same time
+            break
+
+
+class IdentityCache(Generic[_V]):
+    """A bounded mapping of (hashable) objects, compared by identity, to values.
+
+    Looking up an entry costs the same for any object, however expensive it is to
+    hash or compare (e.g. a `Union` of hundreds of types). Entries can be keyed by
+    an additional `tag`. Objects that support weak references are held weakly,
+    and their entries dropped when they are garbage collected. Others (e.g.
+    `int | str`) are kept alive until evicted.
+
+    Unhashable objects are never cached, since they may be mutable.
+    """
+
+    __slots__ = ("__weakref__", "_data", "hits", "maxsize", "misses", "name")
+
+    def __init__(self, name: str, maxsize: int | None = 4096) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # (id(obj), tag) -> (obj, or a weakref to it, value)
+        self._data: dict[tuple[int, Any], tuple[Any, _V]] = {}
+        with _CACHES_LOCK:
+            _CACHES.add(self)
+
+    def get(self, obj: Any, tag: Any = None) -> _V:
+        """Return the value cached for `obj` and `tag`, or `MISS` if there is none."""
+        entry = self._data.get((id(obj), tag))
+        if entry is not None:
+            ref = entry[0]
+            if ref is obj or (type(ref) is weakref.ref and ref() is obj):
+                if count_hits:
+                    self.hits += 1
+                return entry[1]
+        self.misses += 1
+        return cast("_V", MISS)
+
+    def set(self, obj: Any, value: _V, tag: Any = None) -> _V:
+        """Cache `value` for `obj` and `tag` (if `obj` is hashable) and return it."""
+        try:
+            hash(obj)
+        except TypeError:
+            return value
+        key = (id(obj), tag)
+        try:
+            ref: Any = weakref.ref(obj, _remover(self, key))
+        except TypeError:
+            ref = obj
+        self._data[key] = (ref, value)
+        if self.maxsize is not None:
+            _evict(self._data, self.maxsize)
+        return value
+
+    def discard(self, obj: Any) -> None:
+        """Remove all entries for `obj`, if present."""
+        # (a copy of the keys: other threads may add entries in the meantime)
+        for key in [k for k in list(self._data) if k[0] == id(obj)]:
+            _discard(self._data, key, obj)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss statistics for this cache."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def clear_cache(cls: type | None = None) -> None:
+    """Clear fieldz's internal caches.
+
+    fieldz caches per-class information (such as the adapter, fields and params
+    of a class). Call this if that information may have changed, for example after
+    a library has been imported or monkeypatched, or after a class has been mutated.
+    The fields stored by `fieldz.persistent_cache` are also cleared (for the rest of
+    the process, or for `cls` only).
+
+    Parameters
+    ----------
+    cls : type, optional
+        If provided, only entries for this class are removed.
+    """
+    for cache in all_caches():
+        if cls is None:
+            cache.clear()
+        else:
+            cache.discard(cls)
+    # the fields stored by `fieldz.persistent_cache`, if enabled
+    functions = sys.modules.get("fieldz._functions")
+    if (store := getattr(functions, "_persistent", None)) is not None:
+        if cls is None:
+            store.clear()
+        else:
+            store.discard(cls)
@@ -0,0 +1,362 @@
+"""Generation of specialized per-class functions from `fields()` output."""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import inspect
+import keyword
+import types
+from typing import TYPE_CHECKING, Any
+
+from . import _functions, adapters
+from ._cache import MISS, TypeCache
+from ._types import _is_initvar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# types that are returned as-is (never copied) by asdict/astuple
+# (this is the same set used by `dataclasses.asdict` in python >= 3.12)
+_ATOMIC_TYPES = frozenset(
+    {
+        types.NoneType,
+        bool,
+        int,
+        float,
+        str,
+        complex,
+        bytes,
+        types.EllipsisType,
+        types.NotImplementedType,
+        types.CodeType,
+        types.BuiltinFunctionType,
+        types.FunctionType,
+        type,
+        range,
+        property,
+    }
+)
+
+
+def compile_function(
+    name: str, lines: list[str], namespace: dict[str, Any]
+) -> Callable[..., Any]:
+    """Compile a function from lines of source, with `namespace` as its globals."""
+    source = "\n".join(lines)
+    exec(compile(source, f"<fieldz generated {name}>", "exec"), namespace)
+    fn: Callable[..., Any] = namespace[name]
+    return fn
+
+
+def keyword_argument(keyword_: str, value: str) -> str:
+    """Return source passing `value` as keyword argument `keyword_` in a call."""
+    if keyword_.isidentifier() and not keyword.iskeyword(keyword_):
+        return f"{keyword_}={value}"
+    return f"**{{{keyword_!r}: {value}}}"
+
+
+def call_arguments(cls: type, arguments: dict[str, str]) -> str:
+    """Return source of the arguments to call `cls` with {keyword: value source}.
+
+    The leading arguments that `cls` accepts positionally are passed as such,
+    since keyword arguments are much slower to bind (e.g. ~2x for dataclasses).
+    """
+    try:
+        parameters = inspect.signature(cls).parameters.values()
+    except (TypeError, ValueError):  # pragma: no cover
+        parameters = ()  # type: ignore [assignment]
+    positional = []
+    for param in parameters:
+        if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            break
+        if param.name not in arguments:
+            break
+        positional.append(param.name)
+    args = [arguments[name] for name in positional]
+    args.extend(
+        keyword_argument(kw, value)
+        for kw, value in arguments.items()
+        if kw not in positional
+    )
+    return ", ".join(args)
+
+
+def attribute_names(cls: type) -> tuple[str, ...] | None:
+    """Return field names of `cls`, or None if they can't be used as attributes."""
+    names = tuple(f.name for f in _functions.fields(cls, parse_annotated=False))
+    if all(n.isidentifier() and not keyword.iskeyword(n) for n in names):
+        return names
+    return None  # pragma: no cover
+
+
+def init_keywords(cls: type) -> dict[str, str]:
+    """Return {field name: `__init__` keyword} for fields of `cls` with `init=True`.
+
+    (These differ for private attrs attributes and for pydantic aliases.)
+    """
+    adapter = _functions.get_adapter(cls)
+    keywords = {}
+    for f in _functions.fields(cls, parse_annotated=False):
+        if not f.init:
+            continue
+        kw = f.name
+        if adapter is adapters._attrs:
+            kw = getattr(f.native_field, "alias", None) or f.name.lstrip("_")
+        elif adapter is adapters._pydantic:
+            if getattr(f.native_field, "init", None) is False:
+                continue  # pydantic dataclass field with init=False
+            kw = getattr(f.native_field, "alias", None) or f.name
+        keywords[f.name] = kw
+    return keywords
+
+
+# ---------------------------- asdict / astuple ----------------------------
+
+
+def _can_compile_asdict(cls: type, adapter: adapters.Adapter) -> bool:
+    if adapter is adapters._typed_dict:
+        # TypedDict instances are plain dicts, there is nothing to compile
+        return False
+    if adapter is adapters._pydantic and adapters._pydantic.has_custom_serialization(
+        cls
+    ):
+        return False
+    return attribute_names(cls) is not None
+
+
+def _build_converter(cls: type, as_tuple: bool) -> Callable[[Any], Any] | None:
+    """Build the compiled asdict (or astuple) function for `cls`.
+
+    Returns None if `cls` is not supported by fieldz, and falls back to the native
+    adapter function if the class cannot be compiled.
+    """
+    try:
+        adapter = _functions.get_adapter(cls)
+    except TypeError:
+        return None
+    if not _can_compile_asdict(cls, adapter):
+        return adapter.astuple if as_tuple else adapter.asdict
+
+    names = attribute_names(cls) or ()
+    fn_name = "__fieldz_astuple__" if as_tuple else "__fieldz_asdict__"
+    lines = [f"def {fn_name}(obj):"]
+    if adapter is adapters._named_tuple and names:
+        # unpacking is much faster than attribute access for named tuples
+        lines.append(f"    {', '.join(f'_{i}' for i in range(len(names)))}, = obj")
+    else:
+        lines.extend(f"    _{i} = obj.{name}" for i, name in enumerate(names))
+    items = []
+    for i, name in enumerate(names):
+        value = f"_{i} if _type(_{i}) in _atomic else _inner(_{i})"
+        items.append(value if as_tuple else f"{name!r}: {value}")
+    if as_tuple:
+        lines.append(f"    return ({', '.join(items)}{',' if len(items) == 1 else ''})")
+    else:
+        lines.append(f"    return {{{', '.join(items)}}}")
+
+    namespace = {
+        "_type": type,
+        "_atomic": _ATOMIC_TYPES,
+        "_inner": _astuple_inner if as_tuple else _asdict_inner,
+    }
+    return compile_function(fn_name, lines, namespace)
+
+
+def _convert_inner(value: Any, cache: TypeCache, as_tuple: bool) -> Any:
+    """Convert a nested value, following the semantics of `dataclasses.asdict`."""
+    cls = type(value)
+    if cls in _ATOMIC_TYPES:
+        return value
+    if (fn := cache.get(cls)) is MISS:
+        fn = cache.set(cls, _build_converter(cls, as_tuple))
+    inner = _astuple_inner if as_tuple else _asdict_inner
+    if fn is not None:
+        if isinstance(value, tuple):
+            # nested named tuples are rebuilt, like in `dataclasses.asdict`
+            return cls(*map(inner, value))
+        return fn(value)
+
+    if isinstance(value, (list, tuple)):
+        return cls(inner(v) for v in value)
+    if isinstance(value, dict):
+        if hasattr(cls, "default_factory"):
+            # defaultdict, which takes the default_factory as first argument
+            result = cls(value.default_factory)  # type: ignore [attr-defined]
+            for k, v in value.items():
+                result[inner(k)] = inner(v)
+            return result
+        return cls((inner(k), inner(v)) for k, v in value.items())
+    return copy.deepcopy(value)
+
+
+def _asdict_inner(value: Any) -> Any:
+    return _convert_inner(value, _ASDICT_FNS, False)
+
+
+def _astuple_inner(value: Any) -> Any:
+    return _convert_inner(value, _ASTUPLE_FNS, True)
+
+
+_ASDICT_FNS: TypeCache[Callable[[Any], dict[str, Any]] | None] = TypeCache(
+    "compiled asdict"
+)
+_ASTUPLE_FNS: TypeCache[Callable[[Any], tuple[Any, ...]] | None] = TypeCache(
+    "compiled astuple"
+)
+
+
+def asdict_function(cls: type) -> Callable[[Any], dict[str, Any]]:
+    """Return the (cached) compiled asdict function for instances of `cls`."""
+    if (fn := _ASDICT_FNS.get(cls)) is MISS:
+        fn = _ASDICT_FNS.set(cls, _build_converter(cls, as_tuple=False))
+    if fn is None:
+        _functions.get_adapter(cls)  # raise the usual TypeError
+    return fn  # type: ignore [return-value]
+
+
+def astuple_function(cls: type) -> Callable[[Any], tuple[Any, ...]]:
+    """Return the (cached) compiled astuple function for instances of `cls`."""
+    if (fn := _ASTUPLE_FNS.get(cls)) is MISS:
+        fn = _ASTUPLE_FNS.set(cls, _build_converter(cls, as_tuple=True))
+    if fn is None:
+        _functions.get_adapter(cls)  # raise the usual TypeError
+    return fn  # type: ignore [return-value]
+
+
+# ------------------------- shallow asdict / astuple -------------------------
+
+
+def _build_shallow(cls: type, as_tuple: bool) -> Callable[[Any], Any]:
+    """Build `fn(obj)` returning the top-level field values of `obj`, uncopied."""
+    adapter = _functions.get_adapter(cls)
+    if as_tuple and adapter is adapters._named_tuple:
+        return tuple
+    names = [f.name for f in _functions.fields(cls, parse_annotated=False)]
+    fn_name = "__fieldz_shallow_astuple__" if as_tuple else "__fieldz_shallow_asdict__"
+    lines = [f"def {fn_name}(obj):"]
+    if adapter is adapters._named_tuple and names:
+        lines.append(f"    {', '.join(f'_{i}' for i in range(len(names)))}, = obj")
+        values = [f"_{i}" for i in range(len(names))]
+    elif attribute_names(cls) is not None:
+        values = [f"obj.{name}" for name in names]
+    else:  # pragma: no cover
+        values = [f"_getattr(obj, {name!r})" for name in names]
+    if as_tuple:
+        lines.append(
+            f"    return ({', '.join(values)}{',' if len(values) == 1 else ''})"
+        )
+    else:
+        items = (
+            f"{name!r}: {value}" for name, value in zip(names, values, strict=True)
+        )
+        lines.append(f"    return {{{', '.join(items)}}}")
+    return compile_function(fn_name, lines, {"_getattr": getattr})
+
+
+_SHALLOW_ASDICT_FNS: TypeCache[Callable[[Any], dict[str, Any]]] = TypeCache(
+    "shallow asdict"
+)
+_SHALLOW_ASTUPLE_FNS: TypeCache[Callable[[Any], tuple[Any, ...]]] = TypeCache(
+    "shallow astuple"
+)
+
+
+def shallow_asdict_function(cls: type) -> Callable[[Any], dict[str, Any]]:
+    """Return the (cached) `asdict(recurse=False)` function for instances of `cls`."""
+    if (fn := _SHALLOW_ASDICT_FNS.get(cls)) is MISS:
+        fn = _SHALLOW_ASDICT_FNS.set(cls, _build_shallow(cls, as_tuple=False))
+    return fn
+
+
+def shallow_astuple_function(cls: type) -> Callable[[Any], tuple[Any, ...]]:
+    """Return the (cached) `astuple(recurse=False)` function for instances of `cls`."""
+    if (fn := _SHALLOW_ASTUPLE_FNS.get(cls)) is MISS:
+        fn = _SHALLOW_ASTUPLE_FNS.set(cls, _build_shallow(cls, as_tuple=True))
+    return fn
+
+
+# -------------------------------- replace --------------------------------
+
+# maximum number of distinct sets of changed keys compiled per class
+MAX_REPLACE_VARIANTS = 128
+
+
+def _replace_arguments(cls: type) -> dict[str, str] | None:
+    """Return {init keyword: attribute name} used to re-create an instance of cls.
+
+    This is only returned for classes where the library's own replace function is
+    equivalent to calling `cls(**{keyword: getattr(obj, attribute)}, **changes)`
+    for all fields with `init=True` (`dataclasses.replace` and `attrs.evolve`).
+    """
+    try:
+        adapter = _functions.get_adapter(cls)
+    except TypeError:
+        return None
+    if adapter is adapters._dataclasses or (
+        adapter is adapters._pydantic and hasattr(cls, "__dataclass_fields__")
+    ):
+        # dataclasses.replace requires InitVars to be passed explicitly
+        for f in cls.__dataclass_fields__.values():  # type: ignore [attr-defined]
+            if _is_initvar(f.type) or (isinstance(f.type, str) and "InitVar" in f.type):
+                return None
+        return {f.name: f.name for f in dataclasses.fields(cls) if f.init}
+    if adapter is adapters._attrs:
+        args = {}
+        for f in _functions.fields(cls, parse_annotated=False):
+            if f.init:
+                alias = getattr(f.native_field, "alias", None)
+                args[alias or f.name.lstrip("_")] = f.name
+        return args
+    return None
+
+
+class _ReplaceVariants(dict[tuple[str, ...], "Callable[[Any, dict], Any] | None"]):
+    """Compiled replace functions for one class, keyed on the changed keys."""
+
+    def __init__(self, arguments: dict[str, str]) -> None:
+        self.arguments = arguments
+
+    def __missing__(self, keys: tuple[str, ...]) -> Callable[[Any, dict], Any] | None:
+        fn = self._build(keys)
+        if len(self) < MAX_REPLACE_VARIANTS:
+            self[keys] = fn
+        return fn
+
+    def _build(self, keys: tuple[str, ...]) -> Callable[[Any, dict], Any] | None:
+        changed = set(keys)
+        if not changed.issubset(self.arguments):
+            # let the library raise its usual error for invalid changes
+            return None
+        args = ", ".join(
+            keyword_argument(kw, f"changes[{kw!r}]" if kw in changed else f"obj.{attr}")
+            for kw, attr in self.arguments.items()
+        )
+        lines = [
+            "def __fieldz_replace__(obj, changes):",
+            # note: type(obj) rather than a reference to the class, which would keep
+            # the class alive as long as it is in the cache.
+            f"    return _type(obj)({args})",
+        ]
+        return compile_function("__fieldz_replace__", lines, {"_type": type})
+
+
+_REPLACE_VARIANTS: TypeCache[_ReplaceVariants | None] = TypeCache("compiled replace")
+
+
+def replace_function(
+    cls: type, keys: tuple[str, ...]
+) -> Callable[[Any, dict], Any] | None:
+    """Return a compiled `fn(obj, changes)` replacing `keys` in instances of `cls`.
+
+    Returns None if there is no compiled replace function for this class (or these
+    keys), in which case the adapter's replace function should be used.
+    """
+    if (variants := _REPLACE_VARIANTS.get(cls)) is MISS:
+        args = _replace_arguments(cls)
+        variants = _REPLACE_VARIANTS.set(
+            cls, None if args is None else _ReplaceVariants(args)
+        )
+    if variants is None:
+        return None
+    return variants[keys]
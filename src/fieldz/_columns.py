@@ -0,0 +1,449 @@
+"""Conversion between collections of instances and columns of field values."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Any, Literal, overload
+
+from . import _codegen, _functions, _structure, adapters
+from ._cache import MISS, TypeCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+
+    import numpy as np
+    import numpy.typing as npt
+
+    from ._types import Field
+
+# NumPy dtypes used for columns of fields annotated with these (exact) types.
+# Other fields (including optional ones) use the object dtype.
+NUMPY_DTYPES: dict[Any, str] = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    complex: "complex128",
+    str: "str",
+    bytes: "bytes",
+}
+# the (exact) types of the values that may be stored in these columns. Others,
+# e.g. a float in an `int` field or None in a `str` one, use the object dtype.
+_COLUMN_TYPES: dict[Any, tuple[type, ...]] = {
+    float: (float, int),
+    complex: (complex, float, int),
+}
+
+
+def _build_column_filler(cls: type) -> Callable[[Sequence[Any]], tuple[list, ...]]:
+    """Build `fn(objs)` returning one (preallocated, filled) list per field."""
+    names = _codegen.attribute_names(cls)
+    if names is None:  # pragma: no cover
+        raise TypeError(f"Cannot extract columns from {cls}")
+    cols = [f"_{i}" for i in range(len(names))]
+    lines = ["def __fieldz_columns__(objs):", "    n = len(objs)"]
+    lines.extend(f"    {col} = [None] * n" for col in cols)
+    lines.append("    for i, obj in enumerate(objs):")
+    if _functions.get_adapter(cls) is adapters._named_tuple and names:
+        lines.append(f"        {', '.join(f'{col}[i]' for col in cols)}, = obj")
+    else:
+        lines.extend(
+            f"        {col}[i] = obj.{name}"
+            for col, name in zip(cols, names, strict=False)
+        )
+    if not cols:
+        lines.append("        pass")
+    lines.append(f"    return ({', '.join(cols)}{',' if len(cols) == 1 else ''})")
+    return _codegen.compile_function("__fieldz_columns__", lines, {})
+
+
+_COLUMN_FILLERS: TypeCache[Callable[[Sequence[Any]], tuple[list, ...]]] = TypeCache(
+    "to_columns"
+)
+
+
+@overload
+def to_columns(
+    objs: Iterable[Any], *, backend: Literal["list"] = ...
+) -> dict[str, list[Any]]: ...
+@overload
+def to_columns(
+    objs: Iterable[Any], *, backend: Literal["numpy"]
+) -> dict[str, np.ndarray]: ...
+def to_columns(
+    objs: Iterable[Any], *, backend: Literal["list", "numpy"] = "list"
+) -> dict[str, list[Any]] | dict[str, np.ndarray]:
+    """Return the field values of `objs` as columns: `{field name: values}`.
+
+    All objects must be instances of the same class. Values are written directly
+    into one preallocated list per field, without creating a dict per object.
+
+    Parameters
+    ----------
+    objs : Iterable[Any]
+        Instances of a class supported by fieldz.
+    backend : {"list", "numpy"}
+        If "numpy", each column is converted to a NumPy array (numpy must be
+        installed). The dtype is chosen from the field's type using
+        `NUMPY_DTYPES`, falling back to the object dtype for other types, or if
+        any value is not of the field's type (ints are accepted for `float`
+        fields) or does not fit (e.g. an int beyond 64 bits).
+    """
+    if backend not in ("list", "numpy"):
+        raise ValueError(f"backend must be 'list' or 'numpy', not {backend!r}")
+    if not isinstance(objs, list | tuple):
+        objs = list(objs)
+    if not objs:
+        return {}
+    classes = set(map(type, objs))
+    if len(classes) > 1:
+        names = sorted(c.__qualname__ for c in classes)
+        raise TypeError(f"All objects must be of the same class, got {names}")
+    cls = classes.pop()
+
+    if (filler := _COLUMN_FILLERS.get(cls)) is MISS:
+        filler = _COLUMN_FILLERS.set(cls, _build_column_filler(cls))
+    flds = _functions.fields(cls)
+    columns = dict(zip((f.name for f in flds), filler(objs), strict=False))
+    if backend == "numpy":
+        return {f.name: _to_array(columns[f.name], f.type) for f in flds}
+    return columns
+
+
+def _to_array(values: list[Any], type_: Any) -> np.ndarray:
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("backend='numpy' requires numpy to be installed") from e
+
+    if (dtype := NUMPY_DTYPES.get(type_)) is not None and set(
+        map(type, values)
+    ).issubset(_COLUMN_TYPES.get(type_, (type_,))):
+        try:
+            return np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    # fromiter never tries to nest sequence values into extra dimensions
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _build_constructor(cls: type, names: tuple[str, ...]) -> Callable[..., list[Any]]:
+    """Build `fn(cls, *columns)` that creates one instance per row of `columns`."""
+    keywords = _codegen.init_keywords(cls)
+    args = [f"_{i}" for i in range(len(names))]
+    call = _codegen.call_arguments(
+        cls,
+        {
+            keywords[name]: arg
+            for name, arg in zip(names, args, strict=False)
+            if name in keywords
+        },
+    )
+    lines = [
+        f"def __fieldz_from_columns__(cls, {', '.join(args)}):",
+        f"    return [cls({call}) for {', '.join(args) or '_'}, in "
+        f"_zip({', '.join(args)}, strict=True)]",
+    ]
+    return _codegen.compile_function("__fieldz_from_columns__", lines, {"_zip": zip})
+
+
+_CONSTRUCTORS: TypeCache[dict[tuple[str, ...], Callable[..., list[Any]]]] = TypeCache(
+    "from_columns"
+)
+
+
+def _constructor(cls: type, names: tuple[str, ...]) -> Callable[..., list[Any]]:
+    """Return the (cached) constructor of `cls` from columns of fields `names`."""
+    if (constructors := _CONSTRUCTORS.get(cls)) is MISS:
+        constructors = _CONSTRUCTORS.set(cls, {})
+    if (build := constructors.get(names)) is None:
+        build = constructors[names] = _build_constructor(cls, names)
+    return build
+
+
+def from_columns(cls: type, columns: Mapping[str, Sequence[Any]]) -> list[Any]:
+    """Create a list of `cls` instances from columns of field values.
+
+    This is the inverse of `to_columns`. `columns` maps field names to sequences
+    (e.g. lists or NumPy arrays) of equal length. Fields without a column use
+    their default, and columns for fields with `init=False` are ignored.
+    """
+    field_names = {f.name for f in _functions.fields(cls)}
+    if unknown := set(columns) - field_names:
+        raise ValueError(f"Unknown fields for {cls.__qualname__}: {sorted(unknown)}")
+    build = _constructor(cls, tuple(columns))
+    # NumPy arrays are converted to lists of python scalars in bulk
+    values = [
+        col.tolist() if hasattr(col, "tolist") else col for col in columns.values()
+    ]
+    return build(cls, *values)
+
+
+@overload
+def from_records(
+    cls: type,
+    records: Any,
+    *,
+    dtype: npt.DTypeLike | None = ...,
+    lazy: Literal[False] = ...,
+    chunk_size: int = ...,
+) -> list[Any]: ...
+@overload
+def from_records(
+    cls: type,
+    records: Any,
+    *,
+    dtype: npt.DTypeLike | None = ...,
+    lazy: Literal[True],
+    chunk_size: int = ...,
+) -> Iterator[Any]: ...
+def from_records(
+    cls: type,
+    records: Any,
+    *,
+    dtype: npt.DTypeLike | None = None,
+    lazy: bool = False,
+    chunk_size: int = 65536,
+) -> list[Any] | Iterator[Any]:
+    """Create `cls` instances from the rows of a NumPy structured array.
+
+    The columns of `records` are mapped onto `fields(cls)` by name: fields without
+    a column use their default, and other columns are ignored. Each column is
+    converted to python scalars in bulk (e.g. `int`, `float`, `str`; subarrays
+    become lists), and instances are created with the same compiled constructor as
+    `from_columns`. Nested structures (e.g. from `to_structured_array`) become
+    instances of their field's class if it is supported by fieldz (and tuples
+    otherwise).
+
+    Parameters
+    ----------
+    cls : type
+        A class supported by fieldz.
+    records : np.ndarray or buffer
+        A one-dimensional structured array (or record array), or any object
+        supporting the buffer protocol (e.g. `bytes`, `memoryview`, `mmap`), which
+        is then read with `dtype` (without copying).
+    dtype : np.dtype, optional
+        The structured dtype of the records in a buffer. If `records` is an array,
+        it is viewed with this dtype.
+    lazy : bool
+        If True, return an iterator creating the instances `chunk_size` rows at a
+        time, so that only one chunk of python values is in memory at once.
+    chunk_size : int
+        The number of rows converted at once when `lazy` is True.
+
+    Examples
+    --------
+    >>> arr = np.array([(1, 2.0)], dtype=[("x", "i4"), ("y", "f8")])
+    >>> from_records(Point, arr)
+    [Point(x=1, y=2.0)]
+    """
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("from_records requires numpy to be installed") from e
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if isinstance(records, np.ndarray):
+        array = records if dtype is None else records.view(dtype)
+    elif dtype is None:
+        raise TypeError("dtype is required to read records from a buffer")
+    else:
+        array = np.frombuffer(records, dtype=dtype)
+    if array.dtype.names is None or array.ndim != 1:
+        raise TypeError(
+            "records must be a one-dimensional structured array, "
+            f"got {array.ndim}-d array of dtype {array.dtype}"
+        )
+    field_names = {f.name for f in _functions.fields(cls)}
+    names = tuple(n for n in array.dtype.names if n in field_names)
+    build = _constructor(cls, names)
+    nested = _nested_classes(cls, array.dtype)
+    if not lazy:
+        return build(cls, *_record_columns(array, names, nested))
+    return _iter_records(cls, build, array, names, nested, chunk_size)
+
+
+def _nested_classes(cls: type, dtype: np.dtype) -> dict[str, type]:
+    """Return {name: class} of the fields of `cls` stored as sub-structures.
+
+    (i.e. the fields annotated with a class supported by fieldz, whose values are
+    structured in `dtype`.)
+    """
+    nested = {}
+    for f in _resolved_fields(cls):
+        if (
+            f.name in (dtype.names or ())
+            and dtype[f.name].names is not None
+            and isinstance(f.type, type)
+            and _functions._adapter_for(f.type) not in (None, adapters._typed_dict)
+        ):
+            nested[f.name] = f.type
+    return nested
+
+
+def _record_columns(
+    array: np.ndarray, names: tuple[str, ...], nested: dict[str, type]
+) -> list[list[Any]]:
+    """Return the python values of the columns `names` of a structured array."""
+    return [
+        from_records(nested[n], array[n]) if n in nested else array[n].tolist()
+        for n in names
+    ]
+
+
+def _iter_records(
+    cls: type,
+    build: Callable[..., list[Any]],
+    array: np.ndarray,
+    names: tuple[str, ...],
+    nested: dict[str, type],
+    chunk_size: int,
+) -> Iterator[Any]:
+    for start in range(0, len(array), chunk_size):
+        chunk = array[start : start + chunk_size]
+        yield from build(cls, *_record_columns(chunk, names, nested))
+
+
+def _resolved_fields(cls: type) -> list[Field]:
+    """Return `fields(cls)`, with string annotations resolved where possible."""
+    flds = _functions.fields(cls)
+    types = _structure._field_types(cls, flds)
+    return [
+        f
+        if types[f.name] is f.type
+        else dataclasses.replace(f, type=types[f.name]).parse_annotated()
+        for f in flds
+    ]
+
+
+def _field_dtype(f: Field, parents: tuple[type, ...]) -> Any:
+    """Return the dtype (or dtype spec) of the values of field `f`."""
+    import numpy as np
+
+    tp = f.type
+    max_length = f.constraints.max_length if f.constraints else None
+    if tp is str or tp is bytes:
+        if max_length is None:
+            raise TypeError(
+                f"Field {f.name!r} of type {tp.__name__} needs a max_length "
+                "constraint (e.g. Annotated[str, annotated_types.MaxLen(8)]) to "
+                "be stored in a structured array"
+            )
+        return f"{'U' if tp is str else 'S'}{max_length}"
+    if (name := NUMPY_DTYPES.get(tp)) is not None:
+        return name
+    if isinstance(tp, type):
+        if issubclass(tp, np.generic):
+            return np.dtype(tp)
+        if (adapter := _functions._adapter_for(tp)) is not None:
+            if tp in parents:
+                raise TypeError(f"Cannot derive a dtype for recursive class {tp}")
+            if adapter is not adapters._typed_dict:
+                return _build_dtype(tp, parents)
+    raise TypeError(f"Cannot derive a dtype for field {f.name!r} of type {tp!r}")
+
+
+def _build_dtype(cls: type, parents: tuple[type, ...] = ()) -> np.dtype:
+    import numpy as np
+
+    parents = (*parents, cls)
+    spec = [(f.name, _field_dtype(f, parents)) for f in _resolved_fields(cls)]
+    return np.dtype(spec)
+
+
+_DTYPES: TypeCache[np.dtype] = TypeCache("to_dtype")
+
+
+def to_dtype(cls: type) -> np.dtype:
+    """Return the NumPy structured dtype with one field per field of `cls`.
+
+    Fields annotated with `bool`, `int`, `float` and `complex` use the dtypes of
+    `NUMPY_DTYPES` (e.g. `int64`), NumPy scalar types (e.g. `np.int32`) are used
+    as-is, and `str` and `bytes` need a `max_length` constraint (e.g.
+    `Annotated[str, annotated_types.MaxLen(8)]`, or `pydantic.Field(max_length=8)`)
+    to become fixed-length strings. Fields annotated with another class supported
+    by fieldz become nested structured dtypes. Other types raise a `TypeError`.
+
+    Results are cached per class (see `fields`).
+
+    Examples
+    --------
+    >>> to_dtype(Particle)
+    dtype([('id', '<i8'), ('pos', [('x', '<f8'), ('y', '<f8')]), ('kind', '<U4')])
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("to_dtype requires numpy to be installed") from e
+
+    if (dtype := _DTYPES.get(cls)) is MISS:
+        dtype = _DTYPES.set(cls, _build_dtype(cls))
+    return dtype
+
+
+def to_structured_array(
+    objs: Iterable[Any], *, dtype: npt.DTypeLike | None = None
+) -> np.ndarray:
+    """Pack `objs` into a (preallocated) NumPy structured array.
+
+    All objects must be instances of the same class. The array is filled one
+    column at a time, from the field values extracted as by `to_columns`, and
+    nested objects are packed recursively into their sub-arrays.
+
+    Parameters
+    ----------
+    objs : Iterable[Any]
+        Instances of a class supported by fieldz.
+    dtype : np.dtype, optional
+        The structured dtype of the array, whose names must be fields of the
+        objects (e.g. to use smaller integer types, or to omit fields). Defaults
+        to `to_dtype` of their class (required if `objs` is empty).
+
+    Raises
+    ------
+    ValueError
+        If a string or bytes value is longer than its field's dtype allows, rather
+        than silently truncating it, or if a string or bytes field holds another
+        value (e.g. None).
+    """
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover
+        raise ImportError("to_structured_array requires numpy to be installed") from e
+
+    if not isinstance(objs, list | tuple):
+        objs = list(objs)
+    if not objs and dtype is None:
+        raise ValueError("dtype is required to create an array from no objects")
+    struct: np.dtype = to_dtype(type(objs[0])) if dtype is None else np.dtype(dtype)
+    if struct.names is None:
+        raise TypeError(f"dtype must be a structured dtype, got {struct}")
+    if not objs:
+        return np.empty(0, dtype=struct)
+    columns = to_columns(objs)
+    if unknown := set(struct.names) - set(columns):
+        cls = type(objs[0])
+        raise ValueError(f"Unknown fields for {cls.__qualname__}: {sorted(unknown)}")
+
+    array = np.empty(len(objs), dtype=struct)
+    for name in struct.names:
+        field_dtype, values = struct[name], columns[name]
+        if field_dtype.names is not None:
+            array[name] = to_structured_array(values, dtype=field_dtype)
+            continue
+        if field_dtype.kind in "US":
+            size = field_dtype.itemsize // (4 if field_dtype.kind == "U" else 1)
+            try:
+                longest = max(map(len, values))
+            except TypeError:  # e.g. None
+                value = next(v for v in values if not isinstance(v, str | bytes))
+                raise ValueError(
+                    f"Values of field {name!r} must be str or bytes, got {value!r}"
+                ) from None
+            if longest > size:
+                raise ValueError(
+                    f"Values of field {name!r} are longer than {size} characters"
+                )
+        array[name] = values
+    return array
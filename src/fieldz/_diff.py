@@ -0,0 +1,112 @@
+"""Comparison of two instances of the same class, field by field."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from . import _codegen, _functions, adapters
+from ._cache import MISS, TypeCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    Changes = dict[str, tuple[Any, Any]]
+    Comparator = Callable[[Any, Any], Changes]
+
+
+def _build_comparator(cls: type, recurse: bool) -> Comparator:
+    """Build `fn(a, b)` returning {name: (old, new)} for each changed field."""
+    lines = ["def __fieldz_diff__(a, b):", "    if a is b:", "        return {}"]
+    lines.append("    changes = {}")
+    as_attributes = _codegen.attribute_names(cls) is not None
+    for field in _functions.fields(cls, parse_annotated=False):
+        if not field.compare:
+            continue
+        name = field.name
+        if as_attributes:
+            lines.append(f"    x = a.{name}; y = b.{name}")
+        else:  # pragma: no cover
+            lines.append(f"    x = _getattr(a, {name!r}); y = _getattr(b, {name!r})")
+        lines.append("    if x is not y and x != y:")
+        if recurse:
+            lines += [
+                "        if (nested := _nested(x, y)):",
+                "            for k, v in nested.items():",
+                f"                changes[{name + '.'!r} + k] = v",
+                "        else:",
+                f"            changes[{name!r}] = (x, y)",
+            ]
+        else:
+            lines.append(f"        changes[{name!r}] = (x, y)")
+    lines.append("    return changes")
+    namespace = {"_getattr": getattr, "_nested": _nested_changes}
+    return _codegen.compile_function("__fieldz_diff__", lines, namespace)
+
+
+def _nested_changes(x: Any, y: Any) -> Changes | None:
+    """Return the (recursive) diff of two fieldz-supported objects of one class."""
+    cls = type(x)
+    if cls is not type(y) or cls in _codegen._ATOMIC_TYPES:
+        return None
+    adapter = _functions._adapter_for(cls)
+    if adapter is None or adapter is adapters._typed_dict:
+        return None
+    return comparator(cls, recurse=True)(x, y)
+
+
+_COMPARATORS: TypeCache[Comparator] = TypeCache("diff")
+_RECURSIVE_COMPARATORS: TypeCache[Comparator] = TypeCache("diff(recurse)")
+
+
+def comparator(cls: type, recurse: bool = False) -> Comparator:
+    """Return the (cached) function comparing two instances of `cls`."""
+    cache = _RECURSIVE_COMPARATORS if recurse else _COMPARATORS
+    if (fn := cache.get(cls)) is MISS:
+        fn = cache.set(cls, _build_comparator(cls, recurse))
+    return fn
+
+
+def diff(a: Any, b: Any, *, recurse: bool = False) -> dict[str, tuple[Any, Any]]:
+    """Return the fields that differ between `a` and `b`, as `{name: (old, new)}`.
+
+    `a` and `b` must be instances of the same class. Fields with `compare=False`
+    are ignored. A function comparing all fields (returning early if `a is b`, and
+    skipping values that are identical) is generated once per class.
+
+    If `recurse` is True, fields whose values are both instances of the same class
+    supported by fieldz are compared recursively, and the changes within them are
+    reported with dotted names (e.g. `{"owner.name": ("old", "new")}`).
+
+    Examples
+    --------
+    >>> fieldz.diff(Model(x=1, y=2), Model(x=1, y=3))
+    {'y': (2, 3)}
+    """
+    cls = type(a)
+    if type(b) is not cls:
+        raise TypeError(
+            f"Cannot diff instances of different classes: {cls} and {type(b)}"
+        )
+    return comparator(cls, recurse)(a, b)
+
+
+def diff_many(
+    olds: Iterable[Any], news: Iterable[Any], *, recurse: bool = False
+) -> list[dict[str, tuple[Any, Any]]]:
+    """Return `diff(old, new)` for each pair of `olds` and `news`.
+
+    `olds` and `news` must have the same length. The comparator is looked up only
+    once per class.
+    """
+    comparators: dict[type, Comparator] = {}
+    result = []
+    for a, b in zip(olds, news, strict=True):
+        cls = type(a)
+        if type(b) is not cls:
+            raise TypeError(
+                f"Cannot diff instances of different classes: {cls} and {type(b)}"
+            )
+        if (fn := comparators.get(cls)) is None:
+            fn = comparators[cls] = comparator(cls, recurse)
+        result.append(fn(a, b))
+    return result
@@ -1,56 +1,338 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import warnings
+from typing import TYPE_CHECKING, Any, Literal, overload
 
-from . import adapters
+from . import _codegen, _registry, adapters
+from ._cache import MISS, TypeCache
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+    from ._instrument import Profiler
+    from ._persist import FieldStore
     from ._types import DataclassParams, Field
 
+# the active `fieldz.profile()`, if any. Public functions hand their calls to it.
+_recorder: Profiler | None = None
+# the store of `fieldz.persistent_cache()`, if enabled
+_persistent: FieldStore | None = None
+
+
+def asdict(obj: Any, *, compiled: bool = False, recurse: bool = True) -> dict[str, Any]:
+    """Return a dict representation of obj.
+
+    By default, this uses the underlying library's own implementation (e.g.
+    `dataclasses.asdict`, `attrs.asdict`, `pydantic.BaseModel.model_dump`).
 
-def asdict(obj: Any) -> dict[str, Any]:
-    """Return a dict representation of obj."""
+    If `compiled` is True, a function specialized for the class of `obj` is
+    generated (once) from its fields and used instead. It follows the semantics of
+    `dataclasses.asdict` for all libraries: nested objects supported by fieldz are
+    converted recursively (except named tuples, which are rebuilt with their items
+    converted), lists, tuples and dicts are rebuilt, and other values that are not
+    immutable builtins are deep-copied. Classes that can't be compiled (e.g.
+    pydantic models with computed fields or custom serializers, including
+    `Annotated` ones) fall back to the library's implementation.
+
+    If `recurse` is False (regardless of `compiled`), the result is the same for
+    every library: a new dict with the value of each field (in the order of
+    `fields(obj)`), read directly from the attribute of the same name, without
+    converting or copying anything. Nested objects are returned as-is. For
+    pydantic models, computed fields, serializers, aliases and extra fields are
+    ignored. This skips the copies made by the libraries' own functions, and is
+    typically several times faster (see the README).
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record(
+            "asdict", asdict, obj, compiled=compiled, recurse=recurse
+        )
+    if not recurse:
+        return _codegen.shallow_asdict_function(type(obj))(obj)
+    if compiled:
+        return _codegen.asdict_function(type(obj))(obj)
     return get_adapter(obj).asdict(obj)
 
 
-def astuple(obj: Any) -> tuple[Any, ...]:
-    """Return a tuple representation of obj."""
+def astuple(
+    obj: Any, *, compiled: bool = False, recurse: bool = True
+) -> tuple[Any, ...]:
+    """Return a tuple representation of obj.
+
+    See `asdict` for the meaning of `compiled` and `recurse`. (With
+    `recurse=False`, a NamedTuple is simply converted to a plain tuple.)
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record(
+            "astuple", astuple, obj, compiled=compiled, recurse=recurse
+        )
+    if not recurse:
+        return _codegen.shallow_astuple_function(type(obj))(obj)
+    if compiled:
+        return _codegen.astuple_function(type(obj))(obj)
     return get_adapter(obj).astuple(obj)
 
 
 def replace(obj: Any, /, **changes: Any) -> Any:
-    """Return a copy of obj with the specified changes."""
+    """Return a copy of obj with the specified changes.
+
+    For dataclasses and attrs classes, a function specialized for the class and
+    the set of changed fields is generated (once) and used instead of
+    `dataclasses.replace` or `attrs.evolve`, with identical semantics.
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record("replace", replace, obj, **changes)
+    if (fn := _codegen.replace_function(type(obj), tuple(changes))) is not None:
+        return fn(obj, changes)
     return get_adapter(obj).replace(obj, **changes)
 
 
 def fields(obj: Any | type[Any], *, parse_annotated: bool = True) -> tuple[Field, ...]:
-    """Return a tuple of fields for the class or instance."""
-    fields = get_adapter(obj).fields(obj)
+    """Return a tuple of fields for the class or instance.
+
+    Results are cached per class, and the same (immutable) tuple is returned on
+    subsequent calls. Use `fieldz.clear_cache` if the fields of a class may have
+    changed (e.g. after `pydantic.BaseModel.model_rebuild`). They can also be
+    stored across processes, see `fieldz.persistent_cache`.
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record("fields", fields, obj, parse_annotated=parse_annotated)
+    cls = obj if isinstance(obj, type) else type(obj)
     if parse_annotated:
-        fields = tuple(field.parse_annotated() for field in fields)
-    return fields
+        if (result := _FIELDS_CACHE.get(cls)) is MISS:
+            if _persistent is None or (stored := _persistent.load(cls)) is None:
+                raw = fields(cls, parse_annotated=False)
+                result = tuple(field.parse_annotated() for field in raw)
+                if _persistent is not None:
+                    _persistent.store(cls, result)
+            else:
+                result = stored
+            _FIELDS_CACHE.set(cls, result)
+    elif (result := _RAW_FIELDS_CACHE.get(cls)) is MISS:
+        result = _RAW_FIELDS_CACHE.set(cls, get_adapter(cls).fields(cls))
+    return result
 
 
 def params(obj: Any) -> DataclassParams:
-    """Return parameters used to define the dataclass."""
-    return get_adapter(obj).params(obj)
+    """Return parameters used to define the dataclass.
+
+    Results are cached per class (see `fields`).
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record("params", params, obj)
+    cls = obj if isinstance(obj, type) else type(obj)
+    if (result := _PARAMS_CACHE.get(cls)) is MISS:
+        result = _PARAMS_CACHE.set(cls, get_adapter(cls).params(cls))
+    return result
+
+
+@overload
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[False] = ...,
+) -> list[dict[str, Any]]: ...
+@overload
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[True],
+) -> Iterator[dict[str, Any]]: ...
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = False,
+    recurse: bool = True,
+    lazy: bool = False,
+) -> list[dict[str, Any]] | Iterator[dict[str, Any]]:
+    """Return a dict representation of each object in `objs`.
+
+    Equivalent to `[asdict(obj, compiled=compiled, recurse=recurse) for obj in
+    objs]`, but the conversion function is looked up only once per class. If
+    `lazy` is True, a generator is returned instead of a list.
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record(
+            "asdict_many",
+            asdict_many,
+            objs,
+            compiled=compiled,
+            recurse=recurse,
+            lazy=lazy,
+        )
+    if not recurse:
+        return _map_by_class(_codegen.shallow_asdict_function, objs, lazy)
+    if compiled:
+        return _map_by_class(_codegen.asdict_function, objs, lazy)
+    return _map_by_class(lambda cls: get_adapter(cls).asdict, objs, lazy)
+
+
+@overload
+def astuple_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[False] = ...,
+) -> list[tuple[Any, ...]]: ...
+@overload
+def astuple_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[True],
+) -> Iterator[tuple[Any, ...]]: ...
+def astuple_many(
+    objs: Iterable[Any],
+    *,
+    compiled: bool = False,
+    recurse: bool = True,
+    lazy: bool = False,
+) -> list[tuple[Any, ...]] | Iterator[tuple[Any, ...]]:
+    """Return a tuple representation of each object in `objs`.
+
+    See `asdict_many`.
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record(
+            "astuple_many",
+            astuple_many,
+            objs,
+            compiled=compiled,
+            recurse=recurse,
+            lazy=lazy,
+        )
+    if not recurse:
+        return _map_by_class(_codegen.shallow_astuple_function, objs, lazy)
+    if compiled:
+        return _map_by_class(_codegen.astuple_function, objs, lazy)
+    return _map_by_class(lambda cls: get_adapter(cls).astuple, objs, lazy)
+
 
+@overload
+def replace_many(
+    objs: Iterable[Any],
+    changes: Mapping[str, Any] | None = ...,
+    /,
+    *,
+    lazy: Literal[False] = ...,
+    **kwargs: Any,
+) -> list[Any]: ...
+@overload
+def replace_many(
+    objs: Iterable[Any],
+    changes: Mapping[str, Any] | None = ...,
+    /,
+    *,
+    lazy: Literal[True],
+    **kwargs: Any,
+) -> Iterator[Any]: ...
+def replace_many(
+    objs: Iterable[Any],
+    changes: Mapping[str, Any] | None = None,
+    /,
+    *,
+    lazy: bool = False,
+    **kwargs: Any,
+) -> list[Any] | Iterator[Any]:
+    """Return a copy of each object in `objs`, with the same changes applied.
 
-# Order matters here. The first adapter to return True for is_instance will be used.
-ADAPTERS: tuple[adapters.Adapter, ...] = (
-    adapters._pydantic,
-    adapters._attrs,
-    adapters._msgspec,
-    adapters._dataclassy,
-    adapters._dataclasses,
-    adapters._named_tuple,
-    adapters._typed_dict,
-)
+    Equivalent to `[replace(obj, **changes, **kwargs) for obj in objs]`, but the
+    replace function is looked up only once per class. If `lazy` is True, a
+    generator is returned instead of a list.
+
+    Changes may be given as a mapping, as keyword arguments, or both. Use the
+    mapping for fields named like an option of this function (e.g.
+    `replace_many(objs, {"lazy": True})`).
+    """
+    changes = {**changes, **kwargs} if changes else kwargs
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record(
+            "replace_many",
+            lambda objs, lazy: replace_many(objs, changes, lazy=lazy),
+            objs,
+            lazy=lazy,
+        )
+    keys = tuple(changes)
+
+    def _replacer(cls: type) -> Callable[[Any], Any]:
+        if (fn := _codegen.replace_function(cls, keys)) is not None:
+            return lambda obj: fn(obj, changes)
+        replace = get_adapter(cls).replace
+        return lambda obj: replace(obj, **changes)
+
+    return _map_by_class(_replacer, objs, lazy)
+
+
+def _map_by_class(
+    resolve: Callable[[type], Callable[[Any], Any]], objs: Iterable[Any], lazy: bool
+) -> list[Any] | Iterator[Any]:
+    """Apply `resolve(type(obj))(obj)` to each obj, resolving once per class."""
+    if lazy:
+        return _imap_by_class(resolve, objs)
+    if not isinstance(objs, list | tuple):
+        objs = list(objs)
+    classes = set(map(type, objs))
+    if len(classes) == 1:
+        # homogeneous sequence: a single tight loop
+        return list(map(resolve(classes.pop()), objs))
+    return list(_imap_by_class(resolve, objs))
+
+
+def _imap_by_class(
+    resolve: Callable[[type], Callable[[Any], Any]], objs: Iterable[Any]
+) -> Iterator[Any]:
+    functions: dict[type, Callable[[Any], Any]] = {}
+    for obj in objs:
+        cls = type(obj)
+        if (fn := functions.get(cls)) is None:
+            fn = functions[cls] = resolve(cls)
+        yield fn(obj)
+
+
+# per-class caches of the results of `fields` and `params`
+_FIELDS_CACHE: TypeCache[tuple[Field, ...]] = TypeCache("fields")
+_RAW_FIELDS_CACHE: TypeCache[tuple[Field, ...]] = TypeCache("fields(raw)")
+_PARAMS_CACHE: TypeCache[DataclassParams] = TypeCache("params")
+
+
+# class -> adapter (or None if no adapter supports the class)
+_ADAPTER_CACHE: TypeCache[adapters.Adapter | None] = TypeCache("get_adapter")
 
 
 def get_adapter(obj: Any) -> adapters.Adapter:
-    """Return the module of the given object."""
-    for mod in ADAPTERS:
-        if mod.is_instance(obj):
-            return mod
-    raise TypeError(f"Unsupported dataclass type: {type(obj)}")  # pragma: no cover
+    """Return the module of the given object.
+
+    The result is cached per class (including negative results), use
+    `fieldz.clear_cache` if a class may have become supported after the first call.
+    """
+    if _recorder is not None and not _recorder.local.busy:
+        return _recorder.record("get_adapter", get_adapter, obj)
+    cls = obj if isinstance(obj, type) else type(obj)
+    if (adapter := _adapter_for(cls)) is None:
+        raise TypeError(f"Unsupported dataclass type: {cls}")
+    return adapter
+
+
+def _adapter_for(cls: type) -> adapters.Adapter | None:
+    """Return the (cached) adapter for `cls`, or None if it is not supported."""
+    if (adapter := _ADAPTER_CACHE.get(cls)) is MISS:
+        adapter = _ADAPTER_CACHE.set(cls, _registry.find_adapter(cls))
+    return adapter
+
+
+def __getattr__(name: str) -> object:
+    # ADAPTERS, the tuple of built-in adapters, was replaced by the registry
+    if name == "ADAPTERS":
+        warnings.warn(
+            "fieldz._functions.ADAPTERS is deprecated: adapters are registered "
+            "with fieldz.register_adapter",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return _registry.registered_adapters()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,239 @@
+"""Stable digests of instances and schemas, independent of the process."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import fractions
+import hashlib
+import json
+import pathlib
+import uuid
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from . import _codegen, _functions, adapters
+from ._cache import MISS, TypeCache
+from ._repr import display_as_type
+from ._types import Field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# values that are left as-is in canonical trees: their `repr` is exact, and
+# distinguishes them from each other and from the (tuple) nodes of the tree
+_PLAIN_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes})
+
+# other types whose repr is deterministic and round-trips the value
+_REPR_TYPES = (
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    datetime.tzinfo,
+    decimal.Decimal,
+    fractions.Fraction,
+    uuid.UUID,
+    pathlib.PurePath,
+    range,
+)
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def canonical(value: Any) -> Any:
+    """Return a canonical tree (of tuples and plain values) representing `value`.
+
+    Every container is turned into a tuple whose first item is a tag, so that no
+    two different values have the same tree. Objects supported by fieldz are
+    tagged with their class and field names, dicts and sets are sorted.
+    """
+    cls = type(value)
+    if cls in _PLAIN_TYPES:
+        return value
+    if (adapter := _functions._adapter_for(cls)) is not None and (
+        adapter is not adapters._typed_dict
+    ):
+        return canonicalizer(cls)(value)
+    if isinstance(value, list | tuple):
+        return ("list" if isinstance(value, list) else "tuple", *map(canonical, value))
+    if isinstance(value, dict):
+        items = [(canonical(k), canonical(v)) for k, v in value.items()]
+        return ("dict", *sorted(items, key=lambda item: ascii(item[0])))
+    if isinstance(value, set | frozenset):
+        return ("set", *sorted(map(canonical, value), key=ascii))
+    if isinstance(value, enum.Enum):
+        return ("enum", _qualified_name(cls), canonical(value.value))
+    if isinstance(value, type):
+        return ("type", _qualified_name(value))
+    if isinstance(value, _REPR_TYPES):
+        return ("repr", _qualified_name(cls), repr(value))
+    if hasattr(value, "dtype") and hasattr(value, "tobytes"):  # e.g. NumPy arrays
+        shape = getattr(value, "shape", ())
+        if getattr(value.dtype, "hasobject", False):
+            # the bytes of object arrays are pointers: canonicalize the items
+            return ("array", str(value.dtype), shape, canonical(value.tolist()))
+        data = hashlib.blake2b(value.tobytes()).hexdigest()
+        return ("array", str(value.dtype), shape, data)
+    raise TypeError(f"Cannot fingerprint value of type {_qualified_name(cls)}")
+
+
+def _build_canonicalizer(cls: type) -> Callable[[Any], tuple]:
+    """Build `fn(obj)` returning the canonical tree of an instance of `cls`."""
+    names = tuple(f.name for f in _functions.fields(cls, parse_annotated=False))
+    if _codegen.attribute_names(cls) is not None:
+        values = [f"obj.{name}" for name in names]
+    else:  # pragma: no cover
+        values = [f"_getattr(obj, {name!r})" for name in names]
+    items = [f"_v if _type(_v := {v}) in _plain else _canonical(_v)" for v in values]
+    lines = [
+        "def __fieldz_canonical__(obj):",
+        f"    return (_tag, {''.join(f'{item}, ' for item in items)})",
+    ]
+    namespace = {
+        "_tag": f"{_qualified_name(cls)}({','.join(names)})",
+        "_type": type,
+        "_plain": _PLAIN_TYPES,
+        "_canonical": canonical,
+        "_getattr": getattr,
+    }
+    return _codegen.compile_function("__fieldz_canonical__", lines, namespace)
+
+
+_CANONICALIZERS: TypeCache[Callable[[Any], tuple]] = TypeCache("fingerprint")
+
+
+def canonicalizer(cls: type) -> Callable[[Any], tuple]:
+    """Return the (cached) function building canonical trees of `cls` instances."""
+    if (fn := _CANONICALIZERS.get(cls)) is MISS:
+        fn = _CANONICALIZERS.set(cls, _build_canonicalizer(cls))
+    return fn
+
+
+def fingerprint(obj: Any) -> str:
+    """Return a stable digest of the class, field names and field values of `obj`.
+
+    Objects of the same class whose field values are equal, and of the same types,
+    have the same fingerprint, in any process: it does not depend on `hash()` (or
+    `PYTHONHASHSEED`), nor on the order of dict items and set members. Values are
+    not normalized: values that compare equal but differ in type or in
+    representation (e.g. `1` and `1.0`, or `0.0` and `-0.0`) give different
+    fingerprints. Nested objects supported by fieldz, lists, tuples,
+    dicts, sets, enums and common value types (dates, decimals, UUIDs, paths,
+    NumPy arrays, etc.) are supported. Other values raise a `TypeError`.
+
+    The result is the hex digest of a 128-bit BLAKE2b hash of the `ascii()` of a
+    canonical tree of tuples built by a function generated once per class (so the
+    same value of different classes, or of differently named fields, differs).
+    Unlike `hash`, it works for unhashable (mutable) objects.
+
+    Examples
+    --------
+    >>> a, b = Config(tags={"x": 1, "y": 2}), Config(tags={"y": 2, "x": 1})
+    >>> fieldz.fingerprint(a) == fieldz.fingerprint(b)
+    True
+    """
+    if (adapter := _functions._adapter_for(type(obj))) is None or (
+        adapter is adapters._typed_dict
+    ):
+        raise TypeError(f"Unsupported dataclass type: {type(obj)}")
+    tree = canonicalizer(type(obj))(obj)
+    return hashlib.blake2b(ascii(tree).encode(), digest_size=16).hexdigest()
+
+
+# bumped whenever the format of `schema` snapshots changes
+SCHEMA_VERSION = 1
+
+
+def _portable(value: Any) -> Any:
+    """Return a JSON-compatible representation of a default or constraint value."""
+    if value is None or type(value) in (bool, int, float, str):
+        return value
+    if callable(value) and hasattr(value, "__qualname__"):  # factories, predicates
+        return f"{getattr(value, '__module__', None)}.{value.__qualname__}"
+    try:
+        return ascii(canonical(value))
+    except TypeError:  # the repr of other objects may hold their memory address
+        return f"<{_qualified_name(type(value))}>"
+
+
+def _type_string(tp: Any) -> str:
+    # string annotations (forward references) are kept as written
+    return tp if isinstance(tp, str) else display_as_type(tp, modern_union=True)
+
+
+def schema(obj: Any) -> dict[str, Any]:
+    """Return a JSON-compatible snapshot of the schema of a class (or instance).
+
+    The snapshot holds the qualified name and `params()` of the class and, for each
+    field, its name, type (as rendered by `display_as_type`), default value or
+    factory and (non-None) constraints. It can be stored (e.g. with `json.dump`)
+    and passed to `schema_hash` later, without importing the class.
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    return {
+        "version": SCHEMA_VERSION,
+        "name": _qualified_name(cls),
+        "params": dataclasses.asdict(_functions.params(cls)),
+        "fields": [_field_schema(f) for f in _functions.fields(cls)],
+    }
+
+
+def _field_schema(field: Field) -> dict[str, Any]:
+    constraints = {}
+    if field.constraints is not None:
+        for key, value in dataclasses.asdict(field.constraints).items():
+            if value is not None:
+                constraints[key] = _portable(value)
+    default, factory = field.default, field.default_factory
+    return {
+        "name": field.name,
+        "type": _type_string(field.type),
+        "required": default is factory is Field.MISSING,
+        "default": None if default is Field.MISSING else _portable(default),
+        "default_factory": None if factory is Field.MISSING else _portable(factory),
+        "constraints": constraints,
+    }
+
+
+_SCHEMA_HASHES: TypeCache[str] = TypeCache("schema_hash")
+
+
+def _digest(snapshot: Mapping[str, Any]) -> str:
+    text = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def schema_hash(obj: Any) -> str:
+    """Return a stable digest of the schema of a class (or instance).
+
+    The digest covers the names, types, defaults and constraints of the fields and
+    the `params()` of the class (see `schema`), and changes whenever one of them
+    does: use it to invalidate caches or to check that the producer and consumer
+    of a message agree on a model. It is computed once per class. `obj` may also
+    be a snapshot previously returned by `schema`, whose digest is the same as
+    that of the class it was taken from.
+
+    The digest is stable across processes and Python versions: it is the BLAKE2b
+    hash of the JSON dump (with sorted keys) of the snapshot, which holds only
+    strings, numbers and booleans. Types are rendered by fieldz itself (e.g.
+    `int | None`, whatever `repr(Optional[int])` is), and defaults as canonical
+    trees (see `fingerprint`). Objects without a stable representation (e.g. a
+    default instance of a plain class) are represented by their class only.
+    A change in the snapshot format bumps its `version`, and thus all digests.
+
+    Examples
+    --------
+    >>> snapshot = fieldz.schema(Model)
+    >>> fieldz.schema_hash(Model) == fieldz.schema_hash(snapshot)
+    True
+    """
+    if isinstance(obj, Mapping) and not isinstance(obj, type):
+        return _digest(obj)
+    cls = obj if isinstance(obj, type) else type(obj)
+    if (result := _SCHEMA_HASHES.get(cls)) is MISS:
+        result = _SCHEMA_HASHES.set(cls, _digest(schema(cls)))
+    return result
@@ -0,0 +1,332 @@
+"""Opt-in instrumentation of the public functions in `fieldz._functions`.
+
+While a `profile()` is active, `_functions._recorder` is set to a `Profiler`, and
+each public function hands its call to `Profiler.record` (which times it and
+attributes it to an adapter, class and operation). Calls made while a recorded
+call is running (e.g. `fields` calling `get_adapter`) are not recorded
+separately. When no profile is active, the only cost is a check of
+`_recorder is not None` at the start of each function.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import random
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from . import _cache, _functions, _registry
+from ._cache import CacheInfo, all_caches
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from typing import TextIO
+
+_R = TypeVar("_R")
+
+# maximum number of latency samples kept for each (class, operation), for the
+# percentiles. Beyond this, a uniform random sample of all calls is kept.
+MAX_SAMPLES = 4096
+
+
+class OpStats(NamedTuple):
+    """Call statistics for one operation on one class.
+
+    Times are in nanoseconds. Percentiles are estimated from (at most
+    `MAX_SAMPLES`) sampled calls.
+    """
+
+    adapter: str
+    cls: str
+    operation: str
+    calls: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+    p50_ns: int
+    p90_ns: int
+    p99_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        """Mean time per call."""
+        return self.total_ns / self.calls
+
+
+class Stats(NamedTuple):
+    """Statistics returned by `fieldz.stats()`."""
+
+    calls: tuple[OpStats, ...]
+    caches: dict[str, CacheInfo]
+
+
+class _Timings:
+    __slots__ = ("count", "max", "min", "samples", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = sys.maxsize
+        self.max = 0
+        self.samples: list[int] = []
+
+    def add(self, elapsed: int, rng: random.Random) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(elapsed)
+        elif (i := rng.randrange(self.count)) < MAX_SAMPLES:  # reservoir sampling
+            self.samples[i] = elapsed
+
+
+class _Local(threading.local):
+    busy = False
+
+
+class Profiler:
+    """Records the calls made to fieldz's public functions (see `profile`)."""
+
+    def __init__(self) -> None:
+        self.local = _Local()
+        self._timings: dict[tuple[str, str], _Timings] = {}
+        self._adapters: dict[str, str] = {}
+        self._rng = random.Random(0)
+        # calls may be recorded from several threads at once
+        self._lock = threading.Lock()
+        self._cache_start = _cache_infos()
+        self._cache_end: dict[str, CacheInfo] | None = None
+
+    def record(
+        self, operation: str, func: Callable[..., _R], obj: Any, /, **kwargs: Any
+    ) -> _R:
+        """Call `func(obj, **kwargs)`, recording its duration."""
+        if operation.endswith("_many"):
+            return self._record_many(operation, func, obj, **kwargs)
+        local = self.local
+        local.busy = True
+        start = time.perf_counter_ns()
+        try:
+            return func(obj, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            try:
+                self._add(
+                    operation, obj if isinstance(obj, type) else type(obj), elapsed
+                )
+            finally:
+                local.busy = False
+
+    def _record_many(
+        self, operation: str, func: Callable[..., _R], objs: Any, /, **kwargs: Any
+    ) -> _R:
+        # batches are attributed to the class of their first item
+        classes: list[type] = []
+        if isinstance(objs, list | tuple):
+            classes.extend(map(type, objs[:1]))
+        else:
+            objs = _first_class(objs, classes)
+        if kwargs.get("lazy"):
+            lazy = self._record_lazy(operation, func, objs, classes, **kwargs)
+            return lazy  # type: ignore[return-value]
+        local = self.local
+        local.busy = True
+        start = time.perf_counter_ns()
+        try:
+            return func(objs, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            try:
+                self._add(operation, classes[0] if classes else None, elapsed)
+            finally:
+                local.busy = False
+
+    def _record_lazy(
+        self,
+        operation: str,
+        func: Callable[..., Any],
+        objs: Any,
+        classes: list[type],
+        /,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        # the time spent producing the items is recorded once the generator is
+        # exhausted or closed (generators never started are not recorded)
+        local = self.local
+        elapsed = 0
+        results: Iterator[Any] | None = None
+        try:
+            while True:
+                local.busy = True
+                start = time.perf_counter_ns()
+                try:
+                    if results is None:
+                        results = func(objs, **kwargs)
+                    result = next(results)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter_ns() - start
+                    local.busy = False
+                yield result
+        finally:
+            self._add(operation, classes[0] if classes else None, elapsed)
+
+    def _add(self, operation: str, cls: type | None, elapsed: int) -> None:
+        if cls is None:
+            name = "-"  # e.g. an empty batch
+        else:
+            name = f"{cls.__module__}.{cls.__qualname__}"
+            if name not in self._adapters:
+                mod = _registry.find_adapter(cls)
+                # the name of the adapter's module, e.g. fieldz.adapters._attrs
+                module_name = getattr(mod, "__name__", "-")
+                self._adapters[name] = module_name.rpartition("._")[2]
+        key = (name, operation)
+        with self._lock:
+            if (timings := self._timings.get(key)) is None:
+                timings = self._timings[key] = _Timings()
+            timings.add(elapsed, self._rng)
+
+    def stats(self) -> Stats:
+        """Return the statistics recorded so far.
+
+        Cache statistics are those accumulated since the profile started.
+        """
+        calls = []
+        with self._lock:
+            timings = [(key, t, sorted(t.samples)) for key, t in self._timings.items()]
+        for (name, operation), t, samples in timings:
+            p50, p90, p99 = (samples[int(q * (len(samples) - 1))] for q in _QUANTILES)
+            calls.append(
+                OpStats(
+                    self._adapters.get(name, "-"),
+                    name,
+                    operation,
+                    t.count,
+                    t.total,
+                    t.min,
+                    t.max,
+                    p50,
+                    p90,
+                    p99,
+                )
+            )
+        end = self._cache_end or _cache_infos()
+        caches = {}
+        for name, info in end.items():
+            if (start := self._cache_start.get(name)) is not None and (
+                info.hits >= start.hits and info.misses >= start.misses
+            ):
+                info = info._replace(
+                    hits=info.hits - start.hits, misses=info.misses - start.misses
+                )
+            caches[name] = info
+        return Stats(tuple(calls), caches)
+
+    def format_table(self) -> str:
+        """Return the recorded statistics as a table, most expensive classes first."""
+        stats = self.stats()
+        by_class: dict[str, list[OpStats]] = {}
+        for op in stats.calls:
+            by_class.setdefault(op.cls, []).append(op)
+        ranked = sorted(
+            by_class.values(), key=lambda ops: -sum(o.total_ns for o in ops)
+        )
+
+        lines = [
+            f"{'class':<40} {'adapter':<12} {'operation':<16} {'calls':>8} "
+            f"{'total ms':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}"
+        ]
+        for ops in ranked:
+            for op in sorted(ops, key=lambda o: -o.total_ns):
+                lines.append(
+                    f"{_truncate(op.cls, 40):<40} {op.adapter:<12} "
+                    f"{op.operation:<16} {op.calls:>8} {op.total_ns / 1e6:>10.3f} "
+                    f"{op.mean_ns / 1e3:>9.2f} {op.p50_ns / 1e3:>9.2f} "
+                    f"{op.p99_ns / 1e3:>9.2f}"
+                )
+        lines += ["", f"{'cache':<24} {'hits':>10} {'misses':>10} {'hit rate':>9}"]
+        for name, info in sorted(stats.caches.items()):
+            if total := info.hits + info.misses:
+                lines.append(
+                    f"{name:<24} {info.hits:>10} {info.misses:>10} "
+                    f"{info.hits / total:>9.1%}"
+                )
+        return "\n".join(lines)
+
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+# the active profile, or the most recent one once it has finished
+_last_profiler: Profiler | None = None
+
+
+def _cache_infos() -> dict[str, CacheInfo]:
+    return {cache.name: cache.info() for cache in all_caches()}
+
+
+def _first_class(objs: Iterable[Any], classes: list[type]) -> Iterator[Any]:
+    """Yield the items of `objs`, appending the class of the first to `classes`."""
+    it = iter(objs)
+    for obj in it:
+        classes.append(type(obj))
+        yield obj
+        break
+    yield from it
+
+
+def _truncate(s: str, width: int) -> str:
+    return s if len(s) <= width else "..." + s[-(width - 3) :]
+
+
+@contextlib.contextmanager
+def profile(*, file: TextIO | None = None, quiet: bool = False) -> Iterator[Profiler]:
+    """Record the calls made to fieldz functions within the context.
+
+    On exit, a table of call counts and latencies per class and operation (most
+    expensive classes first), followed by the hit rates of fieldz's internal
+    caches, is printed to `file` (`sys.stdout` by default) unless `quiet` is True.
+    The statistics remain available from `fieldz.stats()` after the context exits.
+
+    Only one profile may be active at a time. Instrumentation has no cost when no
+    profile is active.
+
+    Examples
+    --------
+    >>> with fieldz.profile():  # doctest: +SKIP
+    ...     run_my_app()
+    """
+    global _last_profiler
+
+    if _functions._recorder is not None:
+        raise RuntimeError("A fieldz profile is already active.")
+    count_hits = _cache.count_hits
+    _cache.count_hits = True  # see _cache.count_hits
+    profiler = _last_profiler = Profiler()
+    _functions._recorder = profiler
+    try:
+        yield profiler
+    finally:
+        _functions._recorder = None
+        profiler._cache_end = _cache_infos()
+        _cache.count_hits = count_hits
+    if not quiet:
+        print(profiler.format_table(), file=file or sys.stdout)
+
+
+def stats() -> Stats:
+    """Return call and cache statistics.
+
+    Call statistics are those of the active `fieldz.profile()` (or of the last one,
+    if none is active), and are empty if no profile was ever started. Cache
+    statistics are for the same profile or, without one, since the caches were
+    created (or last cleared). On free-threaded builds of Python, cache hits are
+    only counted while a profile is active.
+    """
+    if _last_profiler is None:
+        return Stats((), _cache_infos())
+    return _last_profiler.stats()
@@ -0,0 +1,366 @@
+"""Opt-in persistent cache of the fields of classes (see `persistent_cache`)."""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import io
+import os
+import pickle
+import sys
+import threading
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import _codegen, _functions
+from ._types import Constraints, Field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    # (path, mtime_ns, size) of each file that the fields of a class depend on
+    Key = tuple[tuple[str, int, int], ...]
+    # an object reachable from a class: (class attribute, item, *attributes)
+    Reference = tuple[Any, ...]
+    # (name of the adapter, key, references, pickled attributes of the fields)
+    Entry = tuple[str, Key, tuple[Reference, ...], bytes]
+
+# bumped whenever the format of the stored files changes
+FORMAT_VERSION = 1
+
+# libraries whose version may change the fields extracted from a class
+_LIBRARIES = ("annotated_types", "attr", "msgspec", "pydantic", "pydantic_core")
+
+# the class attributes holding the objects that fields are extracted from (e.g.
+# native fields), and the attributes of those objects that fields may refer to
+_ROOTS = (
+    "__dataclass_fields__",
+    "__attrs_attrs__",
+    "__pydantic_fields__",
+    "__fields__",  # pydantic v1
+    "_field_defaults",
+    "__annotations__",
+)
+_ATTRIBUTES = ("default", "default_factory", "type", "annotation", "metadata")
+_NESTED_ATTRIBUTES = ("__origin__", "factory")  # e.g. of Annotated types
+
+# values that are stored as-is, rather than referenced
+_PLAIN_TYPES = (type(None), bool, int, float, str)
+
+_FIELD_NAMES = tuple(f.name for f in dataclasses.fields(Field))
+_CONSTRAINT_NAMES = tuple(f.name for f in dataclasses.fields(Constraints))
+
+
+def _values(fields: tuple[Field, ...]) -> tuple[Any, ...]:
+    """Return the values of the attributes of all `fields`, as they are stored."""
+    values = []
+    for field in fields:
+        row = [getattr(field, name) for name in _FIELD_NAMES]
+        if (constraints := field.constraints) is not None:
+            row[_FIELD_NAMES.index("constraints")] = {
+                name: value
+                for name in _CONSTRAINT_NAMES
+                if (value := getattr(constraints, name)) is not None
+            }
+        values += row
+    return tuple(values)
+
+
+def _build_loader() -> Callable[[tuple[Any, ...]], tuple[Field, ...]]:
+    """Build `fn(values)` returning the fields whose attributes are in `values`.
+
+    Loading is dominated by the creation of objects (and the garbage collections
+    they trigger): the fields are created from a flat tuple of values, and their
+    slots are set directly, which takes half the time of `Field.__init__`.
+    """
+    size = len(_FIELD_NAMES)
+    lines = [
+        "def __fieldz_load__(values):",
+        "    result = []",
+        f"    for i in range(0, len(values), {size}):",
+        "        field = _new(_Field)",
+    ]
+    namespace: dict[str, Any] = {
+        "_new": object.__new__,
+        "_Field": Field,
+        "_Constraints": Constraints,
+    }
+    for index, name in enumerate(_FIELD_NAMES):
+        namespace[f"_set_{name}"] = getattr(Field, name).__set__
+        value = f"values[i + {index}]"
+        if name == "constraints":
+            value = f"None if (c := {value}) is None else _Constraints(**c)"
+        lines.append(f"        _set_{name}(field, {value})")
+    lines += ["        result.append(field)", "    return tuple(result)"]
+    return _codegen.compile_function("__fieldz_load__", lines, namespace)
+
+
+_load_fields = _build_loader()
+
+
+def _references(cls: type) -> dict[int, Reference]:
+    """Return the references of the objects (by id) that the fields of `cls` use.
+
+    These objects (native fields, types, defaults, etc.) are stored as references,
+    and looked up in the class when the fields are loaded: they are the same
+    objects as if the fields had been extracted.
+    """
+    refs: dict[int, Reference] = {}
+
+    def add(obj: Any, ref: Reference) -> None:
+        if not isinstance(obj, _PLAIN_TYPES):
+            refs.setdefault(id(obj), ref)
+
+    for root in _ROOTS:
+        if root == "__fields__":
+            # (in pydantic v2, a deprecated property of the metaclass)
+            container = vars(cls).get(root)
+        else:
+            container = getattr(cls, root, None)
+        if isinstance(container, dict):
+            items = list(container.items())
+        elif isinstance(container, tuple):
+            items = list(enumerate(container))
+        else:
+            continue
+        for key, item in items:
+            add(item, (root, key))
+            for nested in _NESTED_ATTRIBUTES:
+                if (inner := getattr(item, nested, None)) is not None:
+                    add(inner, (root, key, nested))
+            for name in _ATTRIBUTES:
+                if (value := getattr(item, name, None)) is None:
+                    continue
+                add(value, (root, key, name))
+                for nested in _NESTED_ATTRIBUTES:
+                    if (inner := getattr(value, nested, None)) is not None:
+                        add(inner, (root, key, name, nested))
+    return refs
+
+
+def _resolve(cls: type, ref: Reference) -> Any:
+    obj = getattr(cls, ref[0])[ref[1]]
+    for name in ref[2:]:
+        obj = getattr(obj, name)
+    return obj
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles the objects found in `refs` as (the index of) their reference."""
+
+    def __init__(self, file: io.BytesIO, refs: dict[int, Reference]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.refs = refs
+        self.used: dict[int, int] = {}  # id -> index in `references`
+        self.references: list[Reference] = []
+
+    def persistent_id(self, obj: Any) -> int | None:
+        if (index := self.used.get(id(obj))) is None:
+            if (ref := self.refs.get(id(obj))) is None:
+                return None
+            index = self.used[id(obj)] = len(self.references)
+            self.references.append(ref)
+        return index
+
+
+def _is_importable(cls: type) -> bool:
+    """Return True if `cls` is the object found at its qualified name."""
+    obj: Any = sys.modules.get(cls.__module__)
+    for name in cls.__qualname__.split("."):
+        obj = getattr(obj, name, None)
+    return obj is cls
+
+
+class FieldStore:
+    """Fields of classes, stored in a directory with one file per module.
+
+    The fields of a class are stored with a key: the path, modification time and
+    size of the files of the modules defining the class and its bases, and of the
+    libraries they are extracted with. They are loaded only if none of these
+    files has changed since. Files are only checked once per process.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory)
+        self.env = (FORMAT_VERSION, sys.version, _fieldz_version())
+        self._lock = threading.Lock()
+        # module name -> {class qualname: entry}
+        self._modules: dict[str, dict[str, Entry]] = {}
+        self._dirty: set[str] = set()
+        self._cleared = False  # whether stored files are ignored (see `clear`)
+        self._stats: dict[str, tuple[int, int] | None] = {}
+        self._valid: dict[Key, bool] = {}
+
+    def load(self, cls: type) -> tuple[Field, ...] | None:
+        """Return the stored fields of `cls`, or None if they are missing or stale."""
+        if (entry := self._entries(cls.__module__).get(cls.__qualname__)) is None:
+            return None
+        adapter, key, references, data = entry
+        if (valid := self._valid.get(key)) is None:
+            valid = self._valid[key] = all(
+                self._stat(path) == (mtime, size) for path, mtime, size in key
+            )
+        if not valid:
+            return None
+        if getattr(_functions._adapter_for(cls), "__name__", None) != adapter:
+            return None  # e.g. another adapter was registered for the class
+        try:
+            objects = [_resolve(cls, ref) for ref in references]
+            unpickler = pickle.Unpickler(io.BytesIO(data))
+            unpickler.persistent_load = objects.__getitem__  # type: ignore[method-assign]
+            return _load_fields(unpickler.load())
+        except Exception:  # e.g. the class was modified at runtime
+            return None
+
+    def store(self, cls: type, fields: tuple[Field, ...]) -> None:
+        """Store the fields of `cls`, if they can be loaded by another process."""
+        adapter = getattr(_functions._adapter_for(cls), "__name__", None)
+        if adapter is None or not _is_importable(cls):
+            return  # e.g. classes defined in functions
+        if (key := self._key(cls)) is None:
+            return
+        try:
+            refs = _references(cls)
+        except Exception:  # e.g. a default with a broken __getattr__
+            return
+        for field in fields:
+            if type(field) is not Field:
+                return
+            # native fields belong to the class: they can't be stored by value
+            if field.native_field is not None and id(field.native_field) not in refs:
+                return
+        buffer = io.BytesIO()
+        pickler = _Pickler(buffer, refs)
+        try:
+            pickler.dump(_values(fields))
+        except Exception:  # e.g. a default that can't be pickled
+            return
+        entry = (adapter, key, tuple(pickler.references), buffer.getvalue())
+        entries = self._entries(cls.__module__)
+        with self._lock:
+            entries[cls.__qualname__] = entry
+            self._dirty.add(cls.__module__)
+
+    def discard(self, cls: type) -> None:
+        """Remove the stored fields of `cls`."""
+        entries = self._entries(cls.__module__)
+        with self._lock:
+            if entries.pop(cls.__qualname__, None) is not None:
+                self._dirty.add(cls.__module__)
+
+    def clear(self) -> None:
+        """Ignore the fields stored so far, for the rest of the process."""
+        with self._lock:
+            self._modules.clear()
+            self._cleared = True
+
+    def flush(self) -> None:
+        """Write the files of the modules whose entries have changed."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            contents = {name: dict(self._modules.get(name, {})) for name in dirty}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for name, entries in contents.items():
+                path = self._path(name)
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(tmp, "wb") as f:
+                    pickle.dump((self.env, entries), f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)  # other processes never read partial files
+        except OSError as e:
+            warnings.warn(
+                f"Failed to write fieldz cache to {str(self.directory)!r}: {e}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+    def _path(self, module: str) -> Path:
+        return self.directory / f"{module}.pickle"
+
+    def _entries(self, module: str) -> dict[str, Entry]:
+        if (entries := self._modules.get(module)) is None:
+            entries = {} if self._cleared else self._read(module)
+            with self._lock:
+                entries = self._modules.setdefault(module, entries)
+        return entries
+
+    def _read(self, module: str) -> dict[str, Entry]:
+        try:
+            with open(self._path(module), "rb") as f:
+                env, entries = pickle.load(f)
+        except Exception:  # e.g. missing
+            return {}
+        return entries if env == self.env else {}
+
+    def _stat(self, path: str) -> tuple[int, int] | None:
+        if path not in self._stats:
+            try:
+                st = os.stat(path)
+                self._stats[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                self._stats[path] = None
+        return self._stats[path]
+
+    def _key(self, cls: type) -> Key | None:
+        names = {base.__module__ for base in cls.__mro__} - {"builtins"}
+        names.update(name for name in _LIBRARIES if name in sys.modules)
+        key = []
+        for name in sorted(names):
+            path = getattr(sys.modules.get(name), "__file__", None)
+            if path is None or (stat := self._stat(path)) is None:
+                return None  # e.g. a module created at runtime
+            key.append((path, *stat))
+        return tuple(key)
+
+
+def _fieldz_version() -> str:
+    import fieldz
+
+    return str(fieldz.__version__)
+
+
+def persistent_cache(directory: str | os.PathLike[str] | None) -> None:
+    """Store the fields of classes in `directory`, to speed up later processes.
+
+    The fields of a class are extracted (and their `Annotated` types and
+    constraints parsed) once per process. With a persistent cache, the result of
+    `fieldz.fields` is also stored in `directory`, and loaded from it by later
+    processes, until the file of the module defining the class (or one of its
+    bases), or the version of Python, fieldz or the library of the class changes.
+    Loading the fields of a class takes about a quarter less time than extracting
+    them (storing them, once, takes longer): this reduces the start-up time of
+    applications using many models (see `benchmarks/cold_start.py`).
+
+    Only the values computed by fieldz are stored: native fields, types and
+    defaults are looked up in the class when the fields are loaded, and are the
+    same objects as when extracted. Classes that can't be found by their qualified
+    name (e.g. defined in a function) and fields with values that can't be pickled
+    are not stored. The files are written when the process exits, or when the
+    cache is disabled. `fieldz.clear_cache` also clears the stored fields (for
+    the current process).
+
+    Changes that don't modify the file of the class or its bases are not detected
+    (e.g. to an `Annotated` alias defined in another module, or to a class
+    modified at runtime): remove the directory after such changes.
+
+    The stored files are unpickled, which can run arbitrary code: only use a
+    directory that you trust, and that others can't write to.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike | None
+        The directory (created if needed) in which fields are stored. None
+        disables the persistent cache.
+
+    Examples
+    --------
+    >>> fieldz.persistent_cache(Path.home() / ".cache" / "myapp")  # doctest: +SKIP
+    """
+    if (previous := _functions._persistent) is not None:
+        _functions._persistent = None
+        atexit.unregister(previous.flush)
+        previous.flush()
+    if directory is not None:
+        _functions._persistent = store = FieldStore(directory)
+        atexit.register(store.flush)
@@ -0,0 +1,187 @@
+"""Registry of the adapters that fieldz dispatches to (see `register_adapter`)."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import warnings
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+from . import _cache, adapters
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from importlib.metadata import EntryPoint
+
+# entry point group of third-party adapters (see `register_adapter`)
+ENTRY_POINT_GROUP = "fieldz.adapters"
+
+# the functions that adapters need to implement (see `fieldz.Adapter`)
+_PROTOCOL = ("is_instance", "asdict", "astuple", "replace", "fields", "params")
+
+_A = TypeVar("_A", bound=adapters.Adapter)
+
+
+class _Registration(NamedTuple):
+    adapter: adapters.Adapter
+    priority: int
+    order: int  # breaks ties in priority: the latest registration comes first
+    types: tuple[type | str, ...]
+    markers: tuple[str, ...]
+
+
+class _Index(NamedTuple):
+    """Registrations by what they own. Replaced (never mutated) on registration."""
+
+    by_type: dict[type, tuple[_Registration, ...]]
+    by_name: dict[str, tuple[_Registration, ...]]  # "module.QualName" -> ...
+    by_marker: dict[str, tuple[_Registration, ...]]
+    anywhere: tuple[_Registration, ...]  # registered without types nor markers
+
+
+_lock = threading.RLock()
+_order = itertools.count()
+_registrations: list[_Registration] = []
+_index = _Index({}, {}, {}, ())
+# top-level module name -> entry points not loaded yet (None until first lookup)
+_pending: dict[str, list[EntryPoint]] | None = None
+
+
+def register_adapter(
+    adapter: _A,
+    *,
+    priority: int = 100,
+    types: Iterable[type | str] = (),
+    markers: Iterable[str] = (),
+) -> _A:
+    """Register `adapter` to support the classes it owns, and return it.
+
+    `adapter` is any object (typically a module) implementing the `fieldz.Adapter`
+    protocol. The classes it owns are declared with `types` (base classes, or their
+    qualified names, e.g. `"mylib.records.Record"`, which don't require importing
+    them) and `markers` (names of class attributes, e.g. `"__attrs_attrs__"`). To
+    find the adapter of a class, fieldz looks its bases and markers up in the
+    registry (whatever the number of adapters), then calls `is_instance` on the
+    candidates only, in order of decreasing `priority` (the built-in adapters range
+    from 70 for pydantic to 10 for TypedDict). An adapter registered without
+    `types` nor `markers` is a candidate for every class.
+
+    Registering an adapter again replaces its previous registration. Since the
+    adapter of each class is cached, registering clears fieldz's caches.
+
+    Third-party packages can provide adapters with an entry point in the
+    `"fieldz.adapters"` group, named after the top-level package of the classes it
+    supports (e.g. `mylib = "mylib.fieldz_adapter"`). The module is imported (and
+    should call `register_adapter`) when a class of that package, or inheriting
+    from one, is first looked up.
+
+    Examples
+    --------
+    >>> fieldz.register_adapter(my_adapter, types=["mylib.Record"])  # doctest: +SKIP
+    """
+    global _index
+    if missing := [name for name in _PROTOCOL if not hasattr(adapter, name)]:
+        raise TypeError(f"{adapter!r} is not an adapter: missing {missing}")
+    types = (types,) if isinstance(types, (str, type)) else tuple(types)
+    markers = (markers,) if isinstance(markers, str) else tuple(markers)
+    with _lock:
+        _registrations[:] = [r for r in _registrations if r.adapter is not adapter]
+        _registrations.append(
+            _Registration(adapter, priority, next(_order), types, markers)
+        )
+        _index = _build_index(_registrations)
+    # (fields stored by `fieldz.persistent_cache` are kept: they are only loaded
+    # for classes whose adapter is the one they were extracted with)
+    for cache in _cache.all_caches():
+        cache.clear()
+    return adapter
+
+
+def _build_index(registrations: list[_Registration]) -> _Index:
+    by_type: dict[type, tuple[_Registration, ...]] = {}
+    by_name: dict[str, tuple[_Registration, ...]] = {}
+    by_marker: dict[str, tuple[_Registration, ...]] = {}
+    anywhere: list[_Registration] = []
+    for reg in registrations:
+        for tp in reg.types:
+            if isinstance(tp, str):
+                by_name[tp] = (*by_name.get(tp, ()), reg)
+            else:
+                by_type[tp] = (*by_type.get(tp, ()), reg)
+        for marker in reg.markers:
+            by_marker[marker] = (*by_marker.get(marker, ()), reg)
+        if not reg.types and not reg.markers:
+            anywhere.append(reg)
+    return _Index(by_type, by_name, by_marker, tuple(anywhere))
+
+
+def find_adapter(cls: type) -> adapters.Adapter | None:
+    """Return the adapter of `cls`, or None if no registered adapter supports it."""
+    if _pending is None or _pending:
+        _load_entry_points(cls)
+    index = _index
+    candidates = list(index.anywhere)
+    for base in cls.__mro__:
+        if (regs := index.by_type.get(base)) is not None:
+            candidates += regs
+        name = f"{base.__module__}.{base.__qualname__}"
+        if (regs := index.by_name.get(name)) is not None:
+            candidates += regs
+        namespace = base.__dict__  # markers are looked up without getattr's cost
+        for marker, regs in index.by_marker.items():
+            if marker in namespace:
+                candidates += regs
+    candidates.sort(key=_rank)
+    for reg in candidates:
+        if reg.adapter.is_instance(cls):
+            return reg.adapter
+    return None
+
+
+def registered_adapters() -> tuple[adapters.Adapter, ...]:
+    """Return the registered adapters, in the order they are tried."""
+    return tuple(reg.adapter for reg in sorted(_registrations, key=_rank))
+
+
+def _rank(reg: _Registration) -> tuple[int, int]:
+    return (-reg.priority, -reg.order)
+
+
+def _load_entry_points(cls: type) -> None:
+    """Import the third-party adapters of the packages that `cls` comes from."""
+    global _pending
+    if _pending is None:
+        from importlib.metadata import entry_points
+
+        pending: dict[str, list[EntryPoint]] = {}
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            pending.setdefault(ep.name, []).append(ep)
+        _pending = pending
+    for root in {base.__module__.partition(".")[0] for base in cls.__mro__}:
+        if root not in _pending:
+            continue
+        with _lock:  # other threads wait for the adapter to be registered
+            for ep in _pending.pop(root, ()):
+                try:
+                    ep.load()
+                except Exception as e:
+                    warnings.warn(
+                        f"Failed to load fieldz adapter {ep.value!r}: {e}",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+
+
+# built-in adapters
+register_adapter(
+    adapters._pydantic,
+    priority=70,
+    types=["pydantic.main.BaseModel", "pydantic.v1.main.BaseModel"],
+    markers=["__pydantic_model__", "__pydantic_fields__"],
+)
+register_adapter(adapters._attrs, priority=60, markers=["__attrs_attrs__"])
+register_adapter(adapters._msgspec, priority=50, types=["msgspec.Struct"])
+register_adapter(adapters._dataclassy, priority=40, markers=["__dataclass__"])
+register_adapter(adapters._dataclasses, priority=30, markers=["__dataclass_fields__"])
+register_adapter(adapters._named_tuple, priority=20, markers=["_fields"])
+register_adapter(adapters._typed_dict, priority=10, types=[dict])
@@ -5,7 +5,7 @@ import types
 import typing
 from typing import Any
 
-import typing_extensions
+from ._cache import MISS, IdentityCache
 
 try:
     from typing import _TypingBase  # type: ignore[attr-defined]
@@ -30,8 +30,13 @@ _GenericTypes = (typing._GenericAlias, types.GenericAlias)  # type: ignore[attr-
 WithArgsTypes = (*_GenericTypes, types.UnionType)
 
 
-def origin_is_literal(tp: type[Any] | None) -> bool:
-    return tp is typing_extensions.Literal  # type: ignore
+def origin_is_literal(tp: Any) -> bool:
+    if tp is typing.Literal:
+        return True
+    # typing_extensions.Literal differs from typing.Literal on python 3.10.0
+    # (typing_extensions is not imported here to keep `import fieldz` fast)
+    te = sys.modules.get("typing_extensions")
+    return te is not None and tp is te.Literal
 
 
 class PlainRepr(str):
@@ -50,12 +55,27 @@ class PlainRepr(str):
         return PlainRepr(display_as_type(tp, modern_union=modern_union))
 
 
+# (type object, modern_union) -> display_as_type result
+_DISPLAY_CACHE: IdentityCache[str] = IdentityCache("display_as_type")
+
+
 def display_as_type(obj: Any, *, modern_union: bool = False) -> str:
     """Pretty representation of a type.
 
     Should be as close as possible to the original type definition string.
     Takes some logic from `typing._type_repr`.
+
+    Results are cached by the identity of (hashable) `obj`, so repeated calls with
+    the same type object (e.g. a large `Union`) cost a single lookup.
     """
+    if (result := _DISPLAY_CACHE.get(obj, modern_union)) is MISS:
+        result = _DISPLAY_CACHE.set(
+            obj, _display_as_type(obj, modern_union), modern_union
+        )
+    return result
+
+
+def _display_as_type(obj: Any, modern_union: bool) -> str:
     if isinstance(obj, types.FunctionType):
         # In python < 3.10, NewType was a function with __supertype__ set to the
         # wrapped type, so NewTypes pass through here
@@ -90,13 +110,13 @@ def display_as_type(obj: Any, *, modern_union: bool = False) -> str:
         # TypeVar repr includes a prepended ~, so we use __name__ to get a clean name
         return obj.__name__
 
-    origin = typing_extensions.get_origin(obj)
+    origin = typing.get_origin(obj)
     if origin_is_literal(origin):
         # For Literal types, represent the actual values, not their types
-        arg_reprs = [repr(arg) for arg in typing_extensions.get_args(obj)]
+        arg_reprs = [repr(arg) for arg in typing.get_args(obj)]
         return f"Literal[{', '.join(arg_reprs)}]"
     elif origin_is_union(origin):
-        args = [display_as_type(x) for x in typing_extensions.get_args(obj)]
+        args = [display_as_type(x) for x in typing.get_args(obj)]
         if modern_union:
             return " | ".join(args)
         if len(args) == 2 and "None" in args:
@@ -104,7 +124,7 @@ def display_as_type(obj: Any, *, modern_union: bool = False) -> str:
             return f"Optional[{args[0]}]"
         return f"Union[{', '.join(args)}]"
     elif isinstance(obj, _GenericTypes):
-        argstr = ", ".join(map(display_as_type, typing_extensions.get_args(obj)))
+        argstr = ", ".join(map(display_as_type, typing.get_args(obj)))
         return f"{obj.__qualname__}[{argstr}]"
     elif isinstance(obj, type):
         return obj.__qualname__
@@ -0,0 +1,90 @@
+"""Incremental (non-recursive) conversion of nested objects."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from . import _codegen, _functions, adapters
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    Path = tuple[Any, ...]
+
+
+def _expand(
+    value: Any, root: bool = False
+) -> tuple[Any, Iterable[tuple[Any, Any]]] | None:
+    """Return (empty container, items) for a value that has children, else None."""
+    cls = type(value)
+    if cls in _codegen._ATOMIC_TYPES:
+        return None
+    adapter = _functions._adapter_for(cls)
+    if (
+        adapter is not None
+        and adapter is not adapters._typed_dict
+        # nested named tuples are kept as tuples by `asdict`
+        and (root or not isinstance(value, tuple))
+    ):
+        if _codegen._can_compile_asdict(cls, adapter):
+            names = _codegen.attribute_names(cls) or ()
+            return {}, ((name, getattr(value, name)) for name in names)
+        # e.g. pydantic models with custom serialization: use the library's dict
+        return {}, adapter.asdict(value).items()
+    if isinstance(value, list | tuple):
+        return [], enumerate(value)
+    if isinstance(value, dict):
+        return {}, value.items()
+    return None
+
+
+def iter_asdict(obj: Any) -> Iterator[tuple[Path, Any]]:
+    """Convert `obj` to a dict incrementally, yielding `(path, value)` events.
+
+    This follows the semantics of `asdict(obj, compiled=True)`, but instead of
+    building the result, it walks `obj` depth-first (without recursion, so object
+    graphs of any depth are supported) and yields one event per value:
+
+    - `path` is a tuple of keys from `obj` to the value: field names, list/tuple
+      indices or dict keys. The path of `obj` itself is `()`.
+    - for objects supported by fieldz (of any library) and for dicts, the value is
+      an empty dict `{}`, followed by the events of their fields or items.
+      Similarly, lists and tuples (including nested named tuples) yield an empty
+      list `[]`, followed by the events of their items.
+    - all other values are yielded as-is (they are not copied).
+
+    An object that contains itself raises a `ValueError` (the same object may
+    appear more than once elsewhere).
+
+    Examples
+    --------
+    >>> list(iter_asdict(Model(x=1, items=[2, 3])))
+    [((), {}), (('x',), 1), (('items',), []), (('items', 0), 2), (('items', 1), 3)]
+    """
+    if (root := _expand(obj, root=True)) is None:
+        raise TypeError(f"Unsupported dataclass type: {type(obj)}")
+    marker, items = root
+    yield (), marker
+
+    # each entry is (path, remaining items, id of the container)
+    stack: list[tuple[Path, Iterator[tuple[Any, Any]], int]] = [
+        ((), iter(items), id(obj))
+    ]
+    ancestors = {id(obj)}
+    while stack:
+        path, remaining, container_id = stack[-1]
+        for key, value in remaining:
+            child_path = (*path, key)
+            if (expanded := _expand(value)) is None:
+                yield child_path, value
+                continue
+            if id(value) in ancestors:
+                raise ValueError(f"Circular reference detected at {child_path}")
+            marker, items = expanded
+            yield child_path, marker
+            stack.append((child_path, iter(items), id(value)))
+            ancestors.add(id(value))
+            break  # continue with the children of `value`
+        else:
+            stack.pop()
+            ancestors.discard(container_id)
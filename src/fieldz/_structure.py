@@ -0,0 +1,237 @@
+"""Creation of instances from plain dicts (the inverse of `asdict`)."""
+
+from __future__ import annotations
+
+import collections.abc
+import types
+import typing
+import weakref
+from typing import TYPE_CHECKING, Any, Literal, Union, overload
+
+from . import _codegen, _functions, adapters
+from ._cache import MISS, TypeCache
+from ._types import Field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping
+
+    Structurer = Callable[[Any], Any]
+
+# generic origins whose items are structured into a list, tuple, set or frozenset
+_SEQUENCES: dict[Any, type] = {
+    list: list,
+    collections.abc.Sequence: list,
+    collections.abc.MutableSequence: list,
+    collections.abc.Collection: list,
+    collections.abc.Iterable: list,
+    tuple: tuple,
+    set: set,
+    collections.abc.Set: set,
+    collections.abc.MutableSet: set,
+    frozenset: frozenset,
+}
+_MAPPINGS = {dict, collections.abc.Mapping, collections.abc.MutableMapping}
+
+# adapters for which passing the default of a missing field is equivalent to
+# omitting it. (Others, e.g. pydantic whose defaults may be validated or computed
+# from other fields, get missing fields omitted from the call.)
+_INLINE_DEFAULTS = {adapters._dataclasses, adapters._attrs, adapters._msgspec}
+
+
+def _structurer(tp: Any) -> Structurer | None:
+    """Return a function structuring values annotated with `tp`, or None if as-is.
+
+    Dicts are structured into the (nested) classes supported by fieldz, and the
+    items of lists, tuples, sets and dict values annotated with such classes are
+    structured recursively. Unions are only structured if a single alternative
+    (besides None) needs it.
+    """
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is typing.Annotated:
+        return _structurer(args[0])
+    if isinstance(tp, type) and origin is None:
+        if tp in _codegen._ATOMIC_TYPES or _functions._adapter_for(tp) is None:
+            return None
+        return _nested(weakref.ref(tp), issubclass(tp, tuple))
+    if origin is Union or origin is types.UnionType:
+        structured = [s for arg in args if (s := _structurer(arg)) is not None]
+        if len(structured) != 1 or any(
+            arg is dict or typing.get_origin(arg) in _MAPPINGS for arg in args
+        ):
+            return None  # ambiguous: which alternative would a dict be?
+        inner = structured[0]
+        return lambda value: None if value is None else inner(value)
+    if origin in _SEQUENCES and args:
+        factory = _SEQUENCES[origin]
+        if origin is tuple and not (len(args) == 2 and args[1] is ...):
+            items = [_structurer(arg) for arg in args]
+            if not any(items):
+                return None
+            return lambda value: tuple(
+                v if s is None else s(v) for s, v in zip(items, value, strict=False)
+            )
+        if (item := _structurer(args[0])) is None:
+            return None
+        return lambda value: factory(map(item, value))
+    if origin in _MAPPINGS and len(args) == 2:
+        key, val = _structurer(args[0]), _structurer(args[1])
+        if key is None and val is None:
+            return None
+        key = key or _identity
+        val = val or _identity
+        return lambda value: {key(k): val(v) for k, v in value.items()}
+    return None
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _nested(ref: weakref.ref[type], named_tuple: bool) -> Structurer:
+    # a weak reference: a class referring to itself (e.g. a tree) would otherwise
+    # keep itself alive through its cached constructor.
+    def structure(value: Any) -> Any:
+        cls: Any = ref()
+        if named_tuple and isinstance(value, list | tuple):
+            # named tuples are kept as such by `asdict` (and are lists in JSON),
+            # with their items converted
+            value = dict(zip(cls._fields, value, strict=False))
+        elif not isinstance(value, dict):
+            return value  # e.g. already an instance
+        return from_dict_function(cls)(cls, value)
+
+    return structure
+
+
+def _field_types(cls: type, flds: tuple[Field, ...]) -> dict[str, Any]:
+    """Return {field name: type}, resolving string annotations where possible."""
+    types_ = {f.name: f.type for f in flds}
+    if any(isinstance(tp, str | typing.ForwardRef) for tp in types_.values()):
+        try:
+            hints = typing.get_type_hints(cls, include_extras=True)
+        except Exception:  # e.g. NameError for names defined in a function
+            hints = {}
+        types_.update((name, hints[name]) for name in types_ if name in hints)
+    return types_
+
+
+def _inline_default(f: Field, adapter: adapters.Adapter) -> tuple[str, Any] | None:
+    """Return ("default" or "factory", value) if it can be applied by from_dict."""
+    if adapter not in _INLINE_DEFAULTS:
+        return None
+    if f.default is not Field.MISSING:
+        if type(f.default) in _codegen._ATOMIC_TYPES:
+            return "default", f.default
+        return None  # may be copied by the library (e.g. msgspec's empty lists)
+    if f.default_factory is not Field.MISSING:
+        native_default = getattr(f.native_field, "default", None)
+        if getattr(native_default, "takes_self", False):
+            return None  # attrs.Factory(takes_self=True)
+        return "factory", f.default_factory
+    return None
+
+
+def _build_from_dict(cls: type) -> Callable[[type, Mapping[str, Any]], Any]:
+    """Build `fn(cls, data)` creating an instance of `cls` from a mapping.
+
+    Values of missing fields without a default are left out of the call (so that
+    the class raises its usual error), as are those with defaults that fieldz
+    can't apply itself.
+    """
+    adapter = _functions.get_adapter(cls)
+    keywords = _codegen.init_keywords(cls)
+    flds = [
+        f for f in _functions.fields(cls, parse_annotated=False) if f.name in keywords
+    ]
+    field_types = _field_types(cls, tuple(flds))
+
+    namespace: dict[str, Any] = {}
+    args = []  # when all required keys are present
+    optional = []  # otherwise, one `if` per field
+    required = []
+    for i, f in enumerate(flds):
+        kw, key = keywords[f.name], repr(f.name)
+        value = f"data[{key}]"
+        if (structure := _structurer(field_types[f.name])) is not None:
+            namespace[f"_s{i}"] = structure
+            value = f"_s{i}({value})"
+        if (default := _inline_default(f, adapter)) is not None:
+            kind, namespace[f"_d{i}"] = default
+            fallback = f"_d{i}" if kind == "default" else f"_d{i}()"
+            args.append(
+                _codegen.keyword_argument(
+                    kw, f"{value} if {key} in data else {fallback}"
+                )
+            )
+        else:
+            required.append(f"{key} in data")
+            args.append(_codegen.keyword_argument(kw, value))
+        optional.append(f"    if {key} in data: kw[{kw!r}] = {value}")
+
+    lines = ["def __fieldz_from_dict__(cls, data):"]
+    if required:
+        lines.append(f"    if {' and '.join(required)}:")
+        lines.append(f"        return cls({', '.join(args)})")
+        lines.extend(["    kw = {}", *optional, "    return cls(**kw)"])
+    else:
+        lines.append(f"    return cls({', '.join(args)})")
+    return _codegen.compile_function("__fieldz_from_dict__", lines, namespace)
+
+
+_FROM_DICT_FNS: TypeCache[Callable[[type, Mapping[str, Any]], Any]] = TypeCache(
+    "from_dict"
+)
+
+
+def from_dict_function(cls: type) -> Callable[[type, Mapping[str, Any]], Any]:
+    """Return the (cached) compiled `fn(cls, data)` creating instances of `cls`."""
+    if (fn := _FROM_DICT_FNS.get(cls)) is MISS:
+        fn = _FROM_DICT_FNS.set(cls, _build_from_dict(cls))
+    return fn
+
+
+def from_dict(cls: type, data: Mapping[str, Any]) -> Any:
+    """Create an instance of `cls` from a mapping of field names to values.
+
+    This is the inverse of `asdict` (e.g. for decoded JSON): values of fields
+    annotated with classes supported by fieldz are structured recursively from
+    dicts (or, for named tuples, from tuples and lists), including the items of
+    lists, tuples, sets and dicts annotated as such (e.g. `list[Model]`,
+    `dict[str, Model] | None`). Other values are passed as-is. Keys that aren't
+    the name of a field with `init=True` are ignored, and fields without a key get
+    their default (or default factory). Missing fields without a default raise the
+    class's usual error.
+
+    A constructor specialized for `cls` is generated (once) from its fields, which
+    is typically several times faster than a generic `cls(**data)` with nested
+    classes handled by hand. Pydantic models still validate their input.
+
+    Examples
+    --------
+    >>> from_dict(Model, {"x": 1, "items": [{"name": "a"}]})
+    Model(x=1, items=[Item(name='a')])
+    """
+    return from_dict_function(cls)(cls, data)
+
+
+@overload
+def from_dicts(
+    cls: type, data: Iterable[Mapping[str, Any]], *, lazy: Literal[False] = ...
+) -> list[Any]: ...
+@overload
+def from_dicts(
+    cls: type, data: Iterable[Mapping[str, Any]], *, lazy: Literal[True]
+) -> Iterator[Any]: ...
+def from_dicts(
+    cls: type, data: Iterable[Mapping[str, Any]], *, lazy: bool = False
+) -> list[Any] | Iterator[Any]:
+    """Create an instance of `cls` from each mapping in `data`.
+
+    Equivalent to `[from_dict(cls, d) for d in data]`, but the constructor is looked
+    up only once. If `lazy` is True, a generator is returned instead of a list.
+    """
+    build = from_dict_function(cls)
+    if lazy:
+        return (build(cls, d) for d in data)
+    return [build(cls, d) for d in data]
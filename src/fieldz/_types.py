@@ -16,6 +16,7 @@ from typing import (
     get_origin,
 )
 
+from fieldz._cache import MISS, TypeCache
 from fieldz._repr import PlainRepr
 
 if TYPE_CHECKING:
@@ -170,6 +171,39 @@ CONSTRAINT_NAMES = {f.name for f in dataclasses.fields(Constraints)}
 FIELD_NAMES = {f.name for f in dataclasses.fields(Field)}
 
 
+# annotated_types metadata class -> the names of the constraints its instances
+# define, and the (name, key) pairs of its other attributes that map to constraints
+_META_ATTRIBUTES: TypeCache[tuple[tuple[str, ...], tuple[tuple[str, str], ...]]] = (
+    TypeCache("annotated_types")
+)
+
+
+def _meta_attributes(
+    item: Any,
+) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+    # the annotated_types metadata classes are dataclasses: every instance of a
+    # class has the same attributes, so they are only looked up once per class.
+    # Others (e.g. pydantic's _PydanticGeneralMetadata) can differ per instance.
+    cls = type(item)
+    if (result := _META_ATTRIBUTES.get(cls)) is MISS:
+        names = tuple(k for k in sorted(CONSTRAINT_NAMES) if hasattr(item, k))
+        # annotated types calls the value of a Predicate "func", and
+        # min_inclusive/max_exclusive were changed in v0.4.0
+        others = tuple(
+            (attr, key)
+            for attr, key in (
+                ("func", "predicate"),
+                ("min_inclusive", "min_length"),
+                ("max_exclusive", "max_length"),
+            )
+            if hasattr(item, attr)
+        )
+        result = (names, others)
+        if dataclasses.is_dataclass(cls):
+            _META_ATTRIBUTES.set(cls, result)
+    return result
+
+
 def _parse_annotatedtypes_meta(metadata: list[Any]) -> dict[str, Any]:
     """Extract constraints from annotated_types metadata."""
     if TYPE_CHECKING:
@@ -183,17 +217,12 @@ def _parse_annotatedtypes_meta(metadata: list[Any]) -> dict[str, Any]:
     for item in metadata:
         # annotated_types >= 0.3.0 is supported
         if isinstance(item, at.BaseMetadata | at.GroupedMetadata):
-            values = {k: getattr(item, k) for k in CONSTRAINT_NAMES if hasattr(item, k)}
-            a_kwargs.update(values)
-            # annotated types calls the value of a Predicate "func"
-            if hasattr(item, "func"):
-                a_kwargs["predicate"] = item.func
-
-            # these were changed in v0.4.0
-            if hasattr(item, "min_inclusive"):  # pragma: no cover
-                a_kwargs["min_length"] = item.min_inclusive
-            if hasattr(item, "max_exclusive"):  # pragma: no cover
-                a_kwargs["max_length"] = item.max_exclusive - 1
+            names, others = _meta_attributes(item)
+            for k in names:
+                a_kwargs[k] = getattr(item, k)
+            for attr, key in others:
+                value = getattr(item, attr)
+                a_kwargs[key] = value - 1 if attr == "max_exclusive" else value
     return a_kwargs
 
 
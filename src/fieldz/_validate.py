@@ -0,0 +1,271 @@
+"""Checking of field values against their `Constraints`."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import re
+from typing import TYPE_CHECKING, Any
+
+from . import _codegen, _functions, adapters
+from ._cache import MISS, TypeCache
+from ._types import DC_KWARGS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    Validator = Callable[[Any], tuple["ConstraintViolation", ...]]
+
+
+@dataclasses.dataclass(**DC_KWARGS)
+class ConstraintViolation:
+    """A field value that does not satisfy one of the field's constraints."""
+
+    field: str
+    constraint: str  # name of the `Constraints` attribute, e.g. "ge"
+    expected: Any  # value of the constraint
+    value: Any
+
+    def __str__(self) -> str:
+        return (
+            f"{self.field}: {self.value!r} violates {self.constraint}={self.expected!r}"
+        )
+
+
+def _decimal_digits(value: Any) -> tuple[int, int]:
+    """Return (number of digits, number of decimal places) of a Decimal."""
+    _, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):  # NaN or infinity
+        return 0, 0
+    if exponent >= 0:
+        return len(digits) + exponent, 0
+    return max(len(digits), -exponent), -exponent
+
+
+# constraint -> source of a condition on `v` that is true when it's violated,
+# where `c` is the (precompiled) value of the constraint
+_CONDITIONS = {
+    "gt": "not v > {c}",
+    "ge": "not v >= {c}",
+    "lt": "not v < {c}",
+    "le": "not v <= {c}",
+    "multiple_of": "v % {c}",
+    "min_length": "len(v) < {c}",
+    "max_length": "len(v) > {c}",
+    "max_digits": "_decimal_digits(v)[0] > {c}",
+    "decimal_places": "_decimal_digits(v)[1] > {c}",
+    "pattern": "{c}(v) is None",
+    "tz": "(getattr(v, 'tzinfo', None) is not None) is not {c}",
+    "predicate": "not {c}(v)",
+}
+
+
+def _build_validator(cls: type) -> Validator:
+    adapter = _functions.get_adapter(cls)
+    lines = ["def __fieldz_validate__(obj):", "    errors = []"]
+    namespace: dict[str, Any] = {
+        "_Violation": ConstraintViolation,
+        "_decimal_digits": _decimal_digits,
+    }
+    for i, field in enumerate(_functions.fields(cls)):
+        if field.constraints is None:
+            continue
+        checks = []
+        for constraint, condition in _CONDITIONS.items():
+            if (expected := getattr(field.constraints, constraint)) is None:
+                continue
+            const = f"_{constraint}_{i}"
+            namespace[const] = expected
+            if constraint == "pattern":
+                # the bound `search` method of the compiled regex
+                namespace[f"{const}_search"] = re.compile(expected).search
+                condition = condition.format(c=f"{const}_search")
+            else:
+                condition = condition.format(c=const)
+            checks += [
+                f"        if {condition}:",
+                f"            errors.append(_Violation({field.name!r}, "
+                f"{constraint!r}, {const}, v))",
+            ]
+        if not checks:
+            continue
+        if adapter is adapters._typed_dict:
+            lines.append(f"    v = obj.get({field.name!r})")
+        else:
+            lines.append(f"    v = obj.{field.name}")
+        lines += ["    if v is not None:", *checks]
+    lines.append("    return tuple(errors)")
+    return _codegen.compile_function("__fieldz_validate__", lines, namespace)
+
+
+_VALIDATORS: TypeCache[Validator] = TypeCache("validator")
+
+
+def validator(obj: Any) -> Validator:
+    """Return a function that checks an instance against its fields' constraints.
+
+    The function is generated (once, and cached) for the class of `obj` from the
+    `Constraints` of its fields (see `Field.parse_annotated`), and returns a tuple
+    of all `ConstraintViolation`s found in the instance, which is empty when the
+    instance is valid. Fields whose value is None are not checked.
+
+    Parameters
+    ----------
+    obj : Any
+        A class (or an instance of a class) supported by fieldz. For TypedDicts,
+        pass the class: the returned function accepts any mapping.
+
+    Examples
+    --------
+    >>> @dataclass
+    ... class Model:
+    ...     x: Annotated[int, annotated_types.Ge(0)] = 0
+    >>> fieldz.validator(Model)(Model(x=-1))
+    (ConstraintViolation(field='x', constraint='ge', expected=0, value=-1),)
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    if (fn := _VALIDATORS.get(cls)) is MISS:
+        fn = _VALIDATORS.set(cls, _build_validator(cls))
+    return fn
+
+
+def validate_many(
+    objs: Iterable[Any], cls: type | None = None
+) -> dict[int, tuple[ConstraintViolation, ...]]:
+    """Check each object in `objs` against the constraints of its fields.
+
+    Returns `{index: violations}` for each invalid object (so an empty dict if all
+    objects are valid). The validator is looked up only once per class. Pass `cls`
+    to use the validator of that class for all objects (which is required for
+    TypedDicts).
+    """
+    invalid = {}
+    validators: dict[type, Validator] = {}
+    for i, obj in enumerate(objs):
+        if (check := validators.get(type(obj))) is None:
+            check = validators[type(obj)] = validator(cls or type(obj))
+        if errors := check(obj):
+            invalid[i] = errors
+    return invalid
+
+
+# ---------------------------- columns ----------------------------
+
+# constraints that `validate_columns` checks
+COLUMN_CONSTRAINTS = ("gt", "ge", "lt", "le", "multiple_of", "min_length", "max_length")
+_NUMERIC = frozenset(COLUMN_CONSTRAINTS[:5])
+_LENGTH = frozenset(COLUMN_CONSTRAINTS[5:])
+
+
+@functools.lru_cache(maxsize=256)
+def _column_checker(
+    checks: tuple[tuple[str, Any], ...],
+) -> Callable[[Iterable[Any]], list[bool]]:
+    """Build `fn(column)` returning whether each value violates any of `checks`."""
+    namespace: dict[str, Any] = {}
+    conditions = []
+    for constraint, expected in checks:
+        namespace[f"_{constraint}"] = expected
+        conditions.append(_CONDITIONS[constraint].format(c=f"_{constraint}"))
+    lines = [
+        "def __fieldz_check_column__(column):",
+        f"    return [v is not None and ({' or '.join(conditions)}) for v in column]",
+    ]
+    return _codegen.compile_function("__fieldz_check_column__", lines, namespace)
+
+
+def _column_mask_numpy(np: Any, column: Any, checks: dict[str, Any]) -> Any:
+    arr = np.asarray(column)
+    mask = np.zeros(arr.shape[:1], dtype=bool)
+    if arr.dtype.kind in "biuf":
+        vectorized = _NUMERIC
+        values = arr
+    elif arr.dtype.kind in "US":
+        vectorized = _LENGTH
+        values = np.char.str_len(arr)
+    else:
+        vectorized = frozenset()
+    rest = []
+    for constraint, expected in checks.items():
+        if constraint not in vectorized:
+            rest.append((constraint, expected))
+        elif constraint == "gt":
+            mask |= ~(values > expected)
+        elif constraint == "ge":
+            mask |= ~(values >= expected)
+        elif constraint == "lt":
+            mask |= ~(values < expected)
+        elif constraint == "le":
+            mask |= ~(values <= expected)
+        elif constraint == "multiple_of":
+            mask |= (values % expected) != 0
+        elif constraint == "min_length":
+            mask |= values < expected
+        else:  # max_length
+            mask |= values > expected
+    if rest:
+        # e.g. object arrays, or length constraints of numeric columns
+        mask |= np.asarray(_column_checker(tuple(rest))(arr.tolist()), dtype=bool)
+    return mask
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+def validate_columns(
+    cls: type, columns: Mapping[str, Any], *, indices: bool = False
+) -> dict[str, Any]:
+    """Check whole columns of field values against the constraints of `cls`.
+
+    `columns` maps field names to columns of values, as returned by `to_columns`
+    (e.g. lists, NumPy arrays or objects supporting the buffer protocol, such as
+    `array.array`). The numeric (gt/ge/lt/le/multiple_of) and length
+    (min_length/max_length) constraints of each field are evaluated on the whole
+    column at once. Other constraints are not checked (see `validate_many`).
+
+    If NumPy is installed, columns that are not lists or tuples are checked with
+    vectorized NumPy operations, and the results are NumPy arrays. Otherwise,
+    each column is checked by a single generated list comprehension and the
+    results are lists. As with `validator`, None values are never violations.
+
+    Parameters
+    ----------
+    cls : type
+        A class supported by fieldz.
+    columns : Mapping[str, Any]
+        Columns of field values. Fields without constraints (or without a column)
+        are skipped.
+    indices : bool
+        If True, return the indices of the violating rows of each column, rather
+        than a boolean mask that is True for the violating rows.
+
+    Returns
+    -------
+    dict[str, Any]
+        `{field name: mask or indices}` for each checked column.
+    """
+    constraints = {f.name: f.constraints for f in _functions.fields(cls)}
+    if unknown := set(columns) - set(constraints):
+        raise ValueError(f"Unknown fields for {cls.__qualname__}: {sorted(unknown)}")
+    np = _import_numpy()
+    result = {}
+    for name, column in columns.items():
+        if (c := constraints[name]) is None:
+            continue
+        checks = {
+            k: value for k in COLUMN_CONSTRAINTS if (value := getattr(c, k)) is not None
+        }
+        if not checks:
+            continue
+        if np is not None and not isinstance(column, list | tuple):
+            mask = _column_mask_numpy(np, column, checks)
+            result[name] = np.flatnonzero(mask) if indices else mask
+        else:
+            mask = _column_checker(tuple(checks.items()))(column)
+            result[name] = [i for i, m in enumerate(mask) if m] if indices else mask
+    return result
@@ -1,15 +1,7 @@
 """Adapter modules for fieldz."""
 
-from . import (
-    _attrs,
-    _dataclasses,
-    _dataclassy,
-    _msgspec,
-    _named_tuple,
-    _pydantic,
-    _typed_dict,
-)
-from .protocol import Adapter
+# NOTE: adapter modules are imported lazily, on first attribute access.
+TYPE_CHECKING = False
 
 __all__ = [
     "Adapter",
@@ -21,3 +13,32 @@ __all__ = [
     "_pydantic",
     "_typed_dict",
 ]
+
+if TYPE_CHECKING:
+    from . import (
+        _attrs,
+        _dataclasses,
+        _dataclassy,
+        _msgspec,
+        _named_tuple,
+        _pydantic,
+        _typed_dict,
+    )
+    from .protocol import Adapter
+
+
+def __getattr__(name: str) -> object:
+    from importlib import import_module
+
+    if name == "Adapter":
+        value: object = import_module(f"{__name__}.protocol").Adapter
+    elif name in __all__:
+        value = import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -58,6 +58,52 @@ def asdict(obj: pydantic.BaseModel) -> dict[str, Any]:
     return obj.dict()
 
 
+def has_custom_serialization(cls: type) -> bool:
+    """Return True if `asdict` output for `cls` is not simply its field values.
+
+    (e.g. computed fields, serializers, excluded or extra fields, root models)
+    """
+    if hasattr(cls, "__dataclass_params__"):
+        return False
+    if hasattr(cls, "model_fields"):
+        decorators = cls.__pydantic_decorators__  # type: ignore [attr-defined]
+        return bool(
+            cls.__pydantic_computed_fields__  # type: ignore [attr-defined]
+            or decorators.field_serializers
+            or decorators.model_serializers
+            or getattr(cls, "__pydantic_root_model__", False)
+            or cls.model_config.get("extra") == "allow"  # type: ignore [attr-defined]
+            or any(f.exclude for f in cls.model_fields.values())
+            or _has_serializer(getattr(cls, "__pydantic_core_schema__", None))
+        )
+    return bool(
+        getattr(cls, "__custom_root_type__", False)
+        or getattr(cls, "__exclude_fields__", None)
+        or getattr(getattr(cls, "__config__", None), "extra", None) == "allow"
+    )
+
+
+def _has_serializer(core_schema: Any) -> bool:
+    """Return True if a core schema (or any nested one) has custom serialization.
+
+    (e.g. `Annotated[int, PlainSerializer(str)]` fields, or types serialized by a
+    function such as paths and URLs.) Schemas that are not built yet count as
+    custom too.
+    """
+    if not isinstance(core_schema, dict):
+        return True  # e.g. a mock schema of a model with unresolved annotations
+    stack: list[Any] = [core_schema]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if "serialization" in item:
+                return True
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple):
+            stack.extend(item)
+    return False
+
+
 def astuple(obj: pydantic.BaseModel) -> tuple[Any, ...]:
     return tuple(asdict(obj).values())
 
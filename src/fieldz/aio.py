@@ -0,0 +1,196 @@
+"""Conversion of streams of objects without blocking the asyncio event loop.
+
+Objects are read from a (sync or async) iterable in batches of `batch_size`, and
+each batch is converted at once with the batch functions of fieldz (e.g.
+`fieldz.asdict_many`). Between batches, control is given back to the event loop,
+so that a large stream never blocks it for longer than one batch takes.
+
+With an `executor` (e.g. a `ThreadPoolExecutor` or, for picklable objects, a
+`ProcessPoolExecutor`), batches are converted off the event loop, up to
+`max_pending` at a time. The source is not read further until the consumer has
+caught up (backpressure): memory use is bounded by `batch_size * max_pending`.
+
+Note that a batch is only converted once it is full (or the source exhausted):
+with slow sources, use a small `batch_size` to get results sooner.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import functools
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from . import _functions
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Callable,
+        Iterable,
+        Mapping,
+    )
+    from concurrent.futures import Executor
+
+    Source = AsyncIterable[Any] | Iterable[Any]
+
+__all__ = ["aiter_asdict", "aiter_replace", "asdict_many", "replace_many"]
+
+_R = TypeVar("_R")
+
+
+async def _batches(source: Source, batch_size: int) -> AsyncIterator[list[Any]]:
+    """Yield lists of (at most) `batch_size` items of `source`."""
+    batch: list[Any] = []
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    else:
+        for item in source:
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+async def _aiter_converted(
+    source: Source,
+    convert: Callable[[list[Any]], list[_R]],
+    batch_size: int,
+    executor: Executor | None,
+    max_pending: int,
+) -> AsyncIterator[_R]:
+    """Yield the results of `convert` applied to the batches of `source`."""
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if max_pending < 1:
+        raise ValueError(f"max_pending must be positive, got {max_pending}")
+    if executor is None:
+        async for batch in _batches(source, batch_size):
+            for result in convert(batch):
+                yield result
+            await asyncio.sleep(0)  # let other tasks run between batches
+        return
+
+    loop = asyncio.get_running_loop()
+    pending: collections.deque[asyncio.Future[list[_R]]] = collections.deque()
+    try:
+        async for batch in _batches(source, batch_size):
+            pending.append(loop.run_in_executor(executor, convert, batch))
+            if len(pending) >= max_pending:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for future in pending:  # e.g. if the consumer stopped early
+            future.cancel()
+
+
+def aiter_asdict(
+    source: Source,
+    *,
+    batch_size: int = 256,
+    executor: Executor | None = None,
+    max_pending: int = 2,
+    compiled: bool = False,
+    recurse: bool = True,
+) -> AsyncIterator[dict[str, Any]]:
+    """Asynchronously yield a dict representation of each object in `source`.
+
+    `source` may be an async iterable (e.g. an async generator reading from a
+    queue or a socket) or a regular one. See the module docstring for the meaning
+    of `batch_size`, `executor` and `max_pending`, and `fieldz.asdict` for that of
+    `compiled` and `recurse`.
+
+    Examples
+    --------
+    >>> async for record in fieldz.aio.aiter_asdict(consume(queue)):
+    ...     await publish(record)  # doctest: +SKIP
+    """
+    convert = functools.partial(
+        _functions.asdict_many, compiled=compiled, recurse=recurse
+    )
+    return _aiter_converted(source, convert, batch_size, executor, max_pending)
+
+
+def aiter_replace(
+    source: Source,
+    changes: Mapping[str, Any] | None = None,
+    /,
+    *,
+    batch_size: int = 256,
+    executor: Executor | None = None,
+    max_pending: int = 2,
+    **kwargs: Any,
+) -> AsyncIterator[Any]:
+    """Asynchronously yield a copy of each object in `source`, with changes.
+
+    Changes are given as in `fieldz.replace_many`: as a mapping, as keyword
+    arguments, or both. Use the mapping for fields named like an option (e.g.
+    `batch_size`). See `aiter_asdict` for the options.
+    """
+    changes = {**changes, **kwargs} if changes else kwargs
+    convert = functools.partial(_replace_batch, changes)
+    return _aiter_converted(source, convert, batch_size, executor, max_pending)
+
+
+def _replace_batch(changes: Mapping[str, Any], batch: list[Any]) -> list[Any]:
+    # a module-level function (rather than a lambda): picklable for process pools
+    return _functions.replace_many(batch, changes)
+
+
+async def asdict_many(
+    objs: Source,
+    *,
+    batch_size: int = 256,
+    executor: Executor | None = None,
+    max_pending: int = 2,
+    compiled: bool = False,
+    recurse: bool = True,
+) -> list[dict[str, Any]]:
+    """Return a dict representation of each object in `objs`, in batches.
+
+    Like `fieldz.asdict_many`, without blocking the event loop (see `aiter_asdict`).
+    """
+    results = aiter_asdict(
+        objs,
+        batch_size=batch_size,
+        executor=executor,
+        max_pending=max_pending,
+        compiled=compiled,
+        recurse=recurse,
+    )
+    return [result async for result in results]
+
+
+async def replace_many(
+    objs: Source,
+    changes: Mapping[str, Any] | None = None,
+    /,
+    *,
+    batch_size: int = 256,
+    executor: Executor | None = None,
+    max_pending: int = 2,
+    **kwargs: Any,
+) -> list[Any]:
+    """Return a copy of each object in `objs`, with changes, in batches.
+
+    Like `fieldz.replace_many`, without blocking the event loop (see
+    `aiter_replace`).
+    """
+    results = aiter_replace(
+        objs,
+        {**changes, **kwargs} if changes else kwargs,
+        batch_size=batch_size,
+        executor=executor,
+        max_pending=max_pending,
+    )
+    return [result async for result in results]
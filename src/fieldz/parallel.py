@@ -0,0 +1,128 @@
+"""Conversion of large collections in parallel, across processes.
+
+Objects are sent to the workers in chunks, and converted there with the same
+functions as in-process (e.g. `fieldz.asdict_many`). Since each chunk is pickled
+as a single list, each class reference and field name is sent once per chunk (not
+once per object), and each worker builds its conversion functions once per class:
+fieldz's caches persist in worker processes from one chunk to the next.
+
+Sending objects to the workers and results back costs this process as much as
+pickling the objects and unpickling the results (e.g. ~20us for the nested record
+of `benchmarks/parallel.py`, whose conversion takes ~50us): whatever the number of
+workers, the speedup is bounded by the ratio of these costs. Parallel conversion
+pays off for expensive conversions, such as the libraries' own (deep-copying)
+`asdict` of nested objects, rather than for compiled or shallow ones.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal, overload
+
+from . import _functions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Future
+
+__all__ = ["asdict_many"]
+
+
+def _asdict_chunk(
+    chunk: list[Any], compiled: bool, recurse: bool
+) -> list[dict[str, Any]]:
+    # runs in the worker processes
+    return _functions.asdict_many(chunk, compiled=compiled, recurse=recurse)
+
+
+def _iter_parallel(
+    chunks: Iterator[list[Any]],
+    executor: Executor | None,
+    compiled: bool,
+    recurse: bool,
+) -> Iterator[dict[str, Any]]:
+    own_executor = executor is None
+    pool = ProcessPoolExecutor() if executor is None else executor
+    # at most `window` chunks are submitted ahead of the one being yielded, which
+    # bounds memory use (in this process and in the executor's queue)
+    window = 2 * (os.cpu_count() or 1)
+    pending: collections.deque[Future[list[dict[str, Any]]]] = collections.deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(_asdict_chunk, chunk, compiled, recurse))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:  # e.g. if the consumer stopped early
+            future.cancel()
+        if own_executor:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+@overload
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    executor: Executor | None = ...,
+    chunksize: int = ...,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[False] = ...,
+) -> list[dict[str, Any]]: ...
+@overload
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    executor: Executor | None = ...,
+    chunksize: int = ...,
+    compiled: bool = ...,
+    recurse: bool = ...,
+    lazy: Literal[True],
+) -> Iterator[dict[str, Any]]: ...
+def asdict_many(
+    objs: Iterable[Any],
+    *,
+    executor: Executor | None = None,
+    chunksize: int = 1000,
+    compiled: bool = False,
+    recurse: bool = True,
+    lazy: bool = False,
+) -> list[dict[str, Any]] | Iterator[dict[str, Any]]:
+    """Return a dict representation of each object in `objs`, converted in parallel.
+
+    The results are the same as those of `fieldz.asdict_many` (see `fieldz.asdict`
+    for the meaning of `compiled` and `recurse`), and in the same order.
+
+    `objs` (which may be any iterable, e.g. a generator) is split into chunks of
+    `chunksize` objects, which are converted by `executor`: a new
+    `ProcessPoolExecutor` by default (shut down before returning), or any other
+    `concurrent.futures.Executor`. Objects (and their classes) must be picklable.
+    Only a bounded number of chunks are pending at any time, and with `lazy=True`
+    the results are yielded as soon as they are available: very large (or
+    unbounded) inputs can be converted in constant memory.
+
+    Inputs of fewer than two chunks are converted in this process, without
+    starting any worker.
+
+    Examples
+    --------
+    >>> for record in fieldz.parallel.asdict_many(read_records(), lazy=True):
+    ...     write(record)  # doctest: +SKIP
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    iterator = iter(objs)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunksize)), [])
+    head = list(itertools.islice(chunks, 2))
+    if len(head) < 2 or len(head[1]) < chunksize:
+        # too small to be worth sending to other processes
+        items = [obj for chunk in head for obj in chunk]
+        result = _functions.asdict_many(items, compiled=compiled, recurse=recurse)
+        return iter(result) if lazy else result
+    results = _iter_parallel(itertools.chain(head, chunks), executor, compiled, recurse)
+    return results if lazy else list(results)
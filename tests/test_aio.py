@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import fieldz
+from fieldz import aio
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Coroutine
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int = 0
+
+
+@dataclasses.dataclass
+class Options:
+    batch_size: int = 0
+    executor: str = ""
+    max_pending: int = 1
+
+
+async def _points(n: int, pulled: list[int] | None = None) -> AsyncIterator[Point]:
+    for i in range(n):
+        if pulled is not None:
+            pulled.append(i)
+        yield Point(i, -i)
+
+
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize("executor", [False, True])
+def test_asdict_many(executor: bool) -> None:
+    expected = [{"x": i, "y": -i} for i in range(25)]
+    with ThreadPoolExecutor(2) as pool:
+        kwargs: dict[str, Any] = {"batch_size": 4}
+        if executor:
+            kwargs["executor"] = pool
+        assert _run(aio.asdict_many(_points(25), **kwargs)) == expected
+        # regular iterables are accepted too
+        objs = [Point(i, -i) for i in range(25)]
+        assert _run(aio.asdict_many(objs, **kwargs)) == expected
+        assert _run(aio.asdict_many([], **kwargs)) == []
+        assert _run(aio.replace_many(_points(25), y=1, **kwargs)) == [
+            Point(i, 1) for i in range(25)
+        ]
+
+
+def test_aiter_asdict() -> None:
+    async def main() -> list[Any]:
+        results = aio.aiter_asdict(_points(5), batch_size=2, compiled=True)
+        return [r async for r in results]
+
+    assert _run(main()) == [fieldz.asdict(Point(i, -i)) for i in range(5)]
+
+
+def test_yields_to_event_loop() -> None:
+    ticks: list[int] = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        # a sync source: nothing but aio awaits
+        await aio.asdict_many([Point(i) for i in range(1000)], batch_size=100)
+        task.cancel()
+
+    _run(main())
+    assert len(ticks) >= 10  # at least once per batch
+
+
+def test_backpressure() -> None:
+    pulled: list[int] = []
+
+    async def main() -> None:
+        with ThreadPoolExecutor(2) as pool:
+            results = aio.aiter_replace(
+                _points(1000, pulled), batch_size=10, executor=pool, max_pending=3, y=5
+            )
+            assert await results.__anext__() == Point(0, 5)
+            # only `max_pending` batches were read ahead of the consumer
+            assert len(pulled) == 30
+            await results.aclose()  # type: ignore[attr-defined]
+
+    _run(main())
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError, match="batch_size"):
+        _run(aio.asdict_many(_points(2), batch_size=0))
+    with pytest.raises(ValueError, match="max_pending"):
+        _run(aio.asdict_many(_points(2), max_pending=0))
+    with pytest.raises(TypeError, match="z"):
+        _run(aio.replace_many(_points(2), z=1))
+    with ThreadPoolExecutor(1) as pool, pytest.raises(TypeError):
+        _run(aio.asdict_many([Point(1), object()], executor=pool))
+
+
+@pytest.mark.parametrize("executor", [None, ProcessPoolExecutor])
+def test_replace_fields_named_like_options(executor: Any) -> None:
+    objs = [Options(), Options()]
+    with contextlib.ExitStack() as stack:
+        pool = None if executor is None else stack.enter_context(executor(1))
+        changes = {"batch_size": 5, "executor": "e", "max_pending": 0}
+        result = _run(aio.replace_many(objs, changes, batch_size=1, executor=pool))
+    assert result == [Options(5, "e", 0)] * 2
@@ -0,0 +1,65 @@
+import dataclasses
+from typing import NamedTuple
+
+import attrs
+import pytest
+
+import fieldz
+
+
+@dataclasses.dataclass(frozen=True)
+class DC:
+    x: int = 0
+    y: str = "y"
+
+
+@attrs.define
+class AT:
+    x: int = 0
+    y: str = "y"
+
+
+class NT(NamedTuple):
+    x: int = 0
+    y: str = "y"
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_asdict_astuple_many(compiled: bool) -> None:
+    homogeneous = [DC(i) for i in range(5)]
+    assert fieldz.asdict_many(homogeneous, compiled=compiled) == [
+        fieldz.asdict(obj) for obj in homogeneous
+    ]
+
+    mixed = [DC(1), AT(2), NT(3), DC(4)]
+    expected = [{"x": i, "y": "y"} for i in range(1, 5)]
+    assert fieldz.asdict_many(mixed, compiled=compiled) == expected
+    assert fieldz.asdict_many(iter(mixed), compiled=compiled) == expected
+    lazy = fieldz.asdict_many(mixed, compiled=compiled, lazy=True)
+    assert not isinstance(lazy, list)
+    assert list(lazy) == expected
+
+    assert list(fieldz.astuple_many(mixed, compiled=compiled)) == [
+        (i, "y") for i in range(1, 5)
+    ]
+    assert fieldz.asdict_many([], compiled=compiled) == []
+
+
+def test_replace_many() -> None:
+    mixed = [DC(1), AT(2), NT(3)]
+    assert fieldz.replace_many(mixed, y="z") == [DC(1, "z"), AT(2, "z"), NT(3, "z")]
+    lazy = fieldz.replace_many(mixed, lazy=True, x=0)
+    assert list(lazy) == [DC(0), AT(0), NT(0)]
+    with pytest.raises(TypeError, match="Unsupported"):
+        fieldz.replace_many([DC(), object()], x=1)
+
+    # fields named like an option are replaced through the mapping of changes
+    @dataclasses.dataclass
+    class Options:
+        lazy: bool = False
+        x: int = 0
+
+    result = fieldz.replace_many([Options()], {"lazy": True, "x": 1}, x=2)
+    assert result == [Options(lazy=True, x=2)]
+    lazy = fieldz.replace_many([Options()], {"lazy": True}, lazy=True)
+    assert list(lazy) == [Options(lazy=True)]
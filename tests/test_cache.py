@@ -0,0 +1,151 @@
+import dataclasses
+import gc
+import weakref
+
+import pytest
+
+import fieldz
+from fieldz import _functions, _registry, get_adapter
+from fieldz._cache import TypeCache
+from fieldz.adapters import _dataclasses
+
+
+def test_get_adapter_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    @dataclasses.dataclass
+    class Model:
+        x: int = 0
+
+    calls: list[type] = []
+    original = _registry.find_adapter
+
+    def _spy(cls: type) -> object:
+        calls.append(cls)
+        return original(cls)
+
+    monkeypatch.setattr(_registry, "find_adapter", _spy)
+    assert get_adapter(Model) is _dataclasses
+    assert get_adapter(Model()) is _dataclasses
+    assert fieldz.asdict(Model()) == {"x": 0}
+    assert calls == [Model]
+
+
+def test_get_adapter_negative_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    class NotSupported:
+        pass
+
+    with pytest.raises(TypeError, match="Unsupported"):
+        get_adapter(NotSupported())
+    assert _functions._ADAPTER_CACHE.get(NotSupported) is None
+
+    # the class becomes supported: stale until the cache is cleared
+    dataclasses.dataclass(NotSupported)
+    with pytest.raises(TypeError, match="Unsupported"):
+        get_adapter(NotSupported)
+    fieldz.clear_cache(NotSupported)
+    assert get_adapter(NotSupported) is _dataclasses
+
+
+def test_type_cache_weak_and_bounded() -> None:
+    cache: TypeCache[int] = TypeCache("test", maxsize=2)
+    classes = [type(f"C{i}", (), {}) for i in range(3)]
+    for i, cls in enumerate(classes):
+        cache.set(cls, i)
+    # the oldest entry was evicted
+    assert classes[0] not in cache
+    assert cache.get(classes[2]) == 2
+    assert cache.info().currsize == 2
+
+    del cls, classes
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_fields_and_params_cached() -> None:
+    @dataclasses.dataclass(frozen=True)
+    class Model:
+        x: int = 0
+
+    f1 = fieldz.fields(Model)
+    assert fieldz.fields(Model()) is f1
+    raw = fieldz.fields(Model, parse_annotated=False)
+    assert fieldz.fields(Model, parse_annotated=False) is raw
+    assert fieldz.params(Model()) is fieldz.params(Model)
+    assert fieldz.params(Model).frozen
+
+    fieldz.clear_cache()
+    assert fieldz.fields(Model) is not f1
+    assert fieldz.fields(Model) == f1
+
+
+def test_fields_cache_evicts_dead_classes() -> None:
+    def _make() -> type:
+        @dataclasses.dataclass
+        class Model:
+            x: int = 0
+
+        return Model
+
+    cls = _make()
+    fieldz.fields(cls)
+    fieldz.params(cls)
+    assert cls in _functions._FIELDS_CACHE
+    ref = weakref.ref(cls)
+    del cls
+    gc.collect()
+    # the cache did not keep the class alive, and dropped its entry
+    assert ref() is None
+    assert all(ref() is not None for ref, _ in _functions._FIELDS_CACHE._data.values())
+
+
+def test_display_as_type_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    from typing import Annotated, Optional, Union
+
+    from fieldz import _cache
+    from fieldz._repr import _DISPLAY_CACHE
+
+    monkeypatch.setattr(_cache, "count_hits", True)  # off on free-threaded builds
+
+    big = Union[tuple(type(f"T{i}", (), {}) for i in range(300))]  # type: ignore  # noqa: UP007
+    fieldz.display_as_type(big)
+    hits = _DISPLAY_CACHE.hits
+    assert fieldz.display_as_type(big).startswith("Union[T0, T1")
+    assert _DISPLAY_CACHE.hits == hits + 1
+
+    # separate entries for modern_union
+    opt = Optional[int]  # noqa: UP045
+    assert fieldz.display_as_type(opt) == "Optional[int]"
+    assert fieldz.display_as_type(opt, modern_union=True) == "int | None"
+    assert fieldz.display_as_type(opt) == "Optional[int]"
+
+    # unhashable objects are rendered, but never cached
+    unhashable = Annotated[int, {}]
+    size = len(_DISPLAY_CACHE)
+    assert fieldz.display_as_type(unhashable) == fieldz.display_as_type(unhashable)
+    assert len(_DISPLAY_CACHE) == size
+
+    assert fieldz.stats().caches["display_as_type"].hits > 0
+
+
+def test_identity_cache_weak_and_bounded() -> None:
+    from fieldz._cache import MISS, IdentityCache
+
+    cache: IdentityCache[int] = IdentityCache("test", maxsize=2)
+    classes = [type(f"C{i}", (), {}) for i in range(3)]
+    for i, cls in enumerate(classes):
+        cache.set(cls, i)
+    assert cache.get(classes[0]) is MISS
+    assert cache.get(classes[2]) == 2
+    assert cache.get(classes[2], tag=True) is MISS
+
+    ref = weakref.ref(classes[2])
+    del cls, classes
+    gc.collect()
+    assert ref() is None
+    assert len(cache) == 0
+
+    # objects that can't be weakly referenced are kept alive while cached
+    union = int | str
+    cache.set(union, 5)
+    assert cache.get(union) == 5
+    cache.discard(union)
+    assert cache.get(union) is MISS
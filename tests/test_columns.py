@@ -0,0 +1,261 @@
+import dataclasses
+from typing import Annotated, NamedTuple
+
+import annotated_types as at
+import attrs
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+
+PYDANTIC2 = not pydantic.VERSION.startswith("1.")
+
+
+@dataclasses.dataclass
+class DC:
+    x: int = 0
+    y: Annotated[float, at.Ge(0)] = 0.0
+    name: str = ""
+    tags: list[str] = dataclasses.field(default_factory=list)
+    maybe: int | None = None
+
+
+class NT(NamedTuple):
+    x: int = 0
+    name: str = ""
+
+
+@attrs.define
+class AT:
+    _x: int = 0
+    name: str = ""
+
+
+class MS(msgspec.Struct):
+    x: int = 0
+    name: str = ""
+
+
+class PM(pydantic.BaseModel):
+    x: int = pydantic.Field(0, alias="X")
+    name: str = ""
+
+
+def test_to_columns_list() -> None:
+    objs = [DC(1, 1.5, "a", ["t"]), DC(2, 2.5, "b", [], 3)]
+    assert fieldz.to_columns(objs) == {
+        "x": [1, 2],
+        "y": [1.5, 2.5],
+        "name": ["a", "b"],
+        "tags": [["t"], []],
+        "maybe": [None, 3],
+    }
+    assert fieldz.to_columns(iter(objs))["x"] == [1, 2]
+    assert fieldz.to_columns([NT(1, "a"), NT(2, "b")]) == {
+        "x": [1, 2],
+        "name": ["a", "b"],
+    }
+    assert fieldz.to_columns([]) == {}
+    with pytest.raises(TypeError, match="same class"):
+        fieldz.to_columns([DC(), NT()])
+    with pytest.raises(ValueError, match="backend"):
+        fieldz.to_columns(objs, backend="pandas")  # type: ignore [call-overload]
+
+
+def test_to_columns_numpy() -> None:
+    np = pytest.importorskip("numpy")
+
+    objs = [DC(1, 1.5, "a", ["t", "u"]), DC(2, 2.5, "bc", ["v", "w"], 3)]
+    cols = fieldz.to_columns(objs, backend="numpy")
+    assert cols["x"].dtype == np.int64
+    assert cols["y"].dtype == np.float64
+    assert cols["name"].dtype == np.dtype("<U2")
+    # lists are not turned into an extra dimension
+    assert cols["tags"].dtype == object and cols["tags"].shape == (2,)
+    assert cols["maybe"].dtype == object
+    assert cols["maybe"].tolist() == [None, 3]
+
+    # values that don't match the field's type are not converted
+    objs = [DC(1.7, 1, None), DC(2, 2.5, "x")]  # type: ignore [arg-type]
+    cols = fieldz.to_columns(objs, backend="numpy")
+    assert cols["x"].dtype == object and cols["x"].tolist() == [1.7, 2]
+    assert cols["name"].dtype == object and cols["name"].tolist() == [None, "x"]
+    assert cols["y"].dtype == np.float64 and cols["y"].tolist() == [1.0, 2.5]
+    objs = [DC(True), DC(2**70)]
+    assert fieldz.to_columns(objs, backend="numpy")["x"].tolist() == [True, 2**70]
+
+
+@pytest.mark.parametrize("cls", [DC, NT, AT, MS, PM])
+def test_from_columns_roundtrip(cls: type) -> None:
+    objs = [cls(), cls(**{fieldz._codegen.init_keywords(cls)["name"]: "b"})]
+    columns = fieldz.to_columns(objs)
+    assert fieldz.from_columns(cls, columns) == objs
+
+
+def test_from_columns() -> None:
+    np = pytest.importorskip("numpy")
+
+    result = fieldz.from_columns(DC, {"x": np.array([1, 2]), "name": ["a", "b"]})
+    assert result == [DC(1, name="a"), DC(2, name="b")]
+    assert type(result[0].x) is int
+    assert fieldz.from_columns(PM, {"x": [5]}) == [PM(X=5)]
+
+    with pytest.raises(ValueError, match="Unknown fields"):
+        fieldz.from_columns(DC, {"z": [1]})
+    with pytest.raises(ValueError):
+        fieldz.from_columns(DC, {"x": [1, 2], "name": ["a"]})
+
+
+def _dataclassy_model() -> type:
+    dataclassy = pytest.importorskip("dataclassy")
+
+    @dataclassy.dataclass
+    class DY:
+        x: int = 0
+        name: str = ""
+
+    return DY
+
+
+@pytest.mark.parametrize("cls", [DC, NT, AT, MS, PM, _dataclassy_model])
+def test_from_records(cls: type) -> None:
+    np = pytest.importorskip("numpy")
+    if cls is _dataclassy_model:
+        cls = cls()
+
+    x, name = (f.name for f in fieldz.fields(cls)[:3] if f.name != "y")
+    dtype = np.dtype([(x, "i4"), ("extra", "f8"), (name, "U3")])
+    records = np.array([(1, 0.5, "a"), (2, 1.5, "bc"), (3, 2.5, "def")], dtype=dtype)
+    kw = fieldz._codegen.init_keywords(cls)
+    expected = [
+        cls(**{kw[x]: 1, kw[name]: "a"}),
+        cls(**{kw[x]: 2, kw[name]: "bc"}),
+        cls(**{kw[x]: 3, kw[name]: "def"}),
+    ]
+    result = fieldz.from_records(cls, records)
+    assert result == expected
+    assert type(getattr(result[0], x)) is int
+    assert type(getattr(result[0], name)) is str
+
+    # raw buffers are read with the given dtype
+    assert fieldz.from_records(cls, records.tobytes(), dtype=dtype) == expected
+    assert fieldz.from_records(cls, memoryview(records), dtype=dtype) == expected
+    lazy = fieldz.from_records(cls, records, lazy=True, chunk_size=2)
+    assert not isinstance(lazy, list)
+    assert list(lazy) == expected
+
+
+def test_from_records_errors() -> None:
+    np = pytest.importorskip("numpy")
+
+    # columns are matched by name: missing fields use their default
+    records = np.zeros(2, dtype=[("tags", "O"), ("name", "U1")])
+    records["tags"] = [["a"], ["b"]]
+    assert fieldz.from_records(DC, records) == [DC(tags=["a"]), DC(tags=["b"])]
+    assert fieldz.from_records(DC, records[:0]) == []
+
+    with pytest.raises(TypeError, match="dtype is required"):
+        fieldz.from_records(DC, b"")
+    with pytest.raises(TypeError, match="structured"):
+        fieldz.from_records(DC, np.arange(3))
+    with pytest.raises(TypeError, match="structured"):
+        fieldz.from_records(DC, np.zeros((2, 2), dtype=[("x", "i4")]))
+    with pytest.raises(ValueError, match="chunk_size"):
+        fieldz.from_records(DC, records, lazy=True, chunk_size=0)
+
+
+@dataclasses.dataclass
+class Vec:
+    x: float = 0.0
+    y: float = 0.0
+
+
+@attrs.define
+class Particle:
+    id: int
+    pos: Vec
+    kind: Annotated[str, at.MaxLen(4)] = ""
+    alive: bool = True
+
+
+@dataclasses.dataclass
+class Link:
+    value: int
+    next: "Link"
+
+
+def test_to_dtype() -> None:
+    np = pytest.importorskip("numpy")
+
+    assert fieldz.to_dtype(Particle) == np.dtype(
+        [
+            ("id", "i8"),
+            ("pos", [("x", "f8"), ("y", "f8")]),
+            ("kind", "U4"),
+            ("alive", "?"),
+        ]
+    )
+    assert fieldz.to_dtype(Particle) is fieldz.to_dtype(Particle)
+
+    class MS(msgspec.Struct):
+        name: Annotated[str, msgspec.Meta(max_length=2)]
+        value: complex
+
+    assert fieldz.to_dtype(MS) == np.dtype([("name", "U2"), ("value", "c16")])
+
+    # (pydantic v1 changes the type of constrained fields to its own classes)
+    if PYDANTIC2:
+
+        class PM(pydantic.BaseModel):
+            name: bytes = pydantic.Field(b"", max_length=3)
+            count: np.int32 = np.int32(0)  # type: ignore [valid-type]
+            model_config = {"arbitrary_types_allowed": True}
+
+        assert fieldz.to_dtype(PM) == np.dtype([("name", "S3"), ("count", "i4")])
+
+    with pytest.raises(TypeError, match="'name' of type str needs a max_length"):
+        fieldz.to_dtype(NT)
+
+    @dataclasses.dataclass
+    class Tagged:
+        tags: list[int]
+
+    with pytest.raises(TypeError, match=r"'tags' of type list\[int\]"):
+        fieldz.to_dtype(Tagged)
+    with pytest.raises(TypeError, match="recursive"):
+        fieldz.to_dtype(Link)
+
+
+def test_to_structured_array() -> None:
+    pytest.importorskip("numpy")
+
+    objs = [Particle(1, Vec(1, 2), "ab"), Particle(2, Vec(3, 4), "cdef", False)]
+    array = fieldz.to_structured_array(iter(objs))
+    assert array.dtype == fieldz.to_dtype(Particle)
+    assert array.tolist() == [
+        (1, (1.0, 2.0), "ab", True),
+        (2, (3.0, 4.0), "cdef", False),
+    ]
+    # nested structures become instances again
+    assert fieldz.from_records(Particle, array) == objs
+    assert list(fieldz.from_records(Particle, array, lazy=True, chunk_size=1)) == objs
+    assert fieldz.from_records(Vec, array["pos"]) == [Vec(1, 2), Vec(3, 4)]
+
+    # a custom dtype (e.g. smaller types, or a subset of the fields)
+    small = fieldz.to_structured_array(objs, dtype=[("kind", "U4"), ("id", "i1")])
+    assert small.tolist() == [("ab", 1), ("cdef", 2)]
+    empty = fieldz.to_structured_array([], dtype=fieldz.to_dtype(Particle))
+    assert empty.shape == (0,) and empty.dtype == fieldz.to_dtype(Particle)
+
+    with pytest.raises(ValueError, match="longer than 4"):
+        fieldz.to_structured_array([Particle(1, Vec(), "abcde")])
+    no_kind = Particle(2, Vec(), None)  # type: ignore [arg-type]
+    with pytest.raises(ValueError, match="'kind' must be str or bytes, got None"):
+        fieldz.to_structured_array([Particle(1, Vec(), "ab"), no_kind])
+    with pytest.raises(ValueError, match="dtype is required"):
+        fieldz.to_structured_array([])
+    with pytest.raises(ValueError, match="Unknown fields"):
+        fieldz.to_structured_array(objs, dtype=[("z", "i8")])
+    with pytest.raises(TypeError, match="structured"):
+        fieldz.to_structured_array(objs, dtype="i8")
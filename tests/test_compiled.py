@@ -0,0 +1,236 @@
+import dataclasses
+from collections import defaultdict
+from typing import Annotated, Any, NamedTuple
+
+import attrs
+import msgspec
+import pydantic
+import pytest
+
+from fieldz import (
+    _codegen,
+    asdict,
+    asdict_many,
+    astuple,
+    astuple_many,
+    fields,
+    replace,
+)
+
+PYDANTIC2 = not pydantic.VERSION.startswith("1.")
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@attrs.define
+class Tag:
+    name: str
+    extra: dict[str, list[int]] = attrs.field(factory=dict)
+
+
+class Meta(msgspec.Struct):
+    tags: list[Tag]
+    counts: defaultdict[str, int]
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    point: Point
+    meta: Meta
+    values: tuple[float, ...] = ()
+
+
+def _record() -> Record:
+    counts: defaultdict[str, int] = defaultdict(int, {"a": 1})
+    meta = Meta(tags=[Tag("t", {"k": [1, 2]})], counts=counts)
+    return Record(1, Point(1, 2), meta, (1.0, 2.0))
+
+
+def test_compiled_asdict_nested() -> None:
+    record = _record()
+    result = asdict(record, compiled=True)
+    assert result == {
+        "id": 1,
+        "point": Point(1, 2),
+        "meta": {
+            "tags": [{"name": "t", "extra": {"k": [1, 2]}}],
+            "counts": {"a": 1},
+        },
+        "values": (1.0, 2.0),
+    }
+    assert isinstance(result["meta"]["counts"], defaultdict)
+    # nested named tuples are kept, like in `dataclasses.asdict`
+    assert type(result["point"]) is Point
+    # containers are copied, not shared
+    assert result["meta"]["tags"][0]["extra"]["k"] is not record.meta.tags[0].extra["k"]
+
+
+def test_compiled_astuple_nested() -> None:
+    assert astuple(_record(), compiled=True) == (
+        1,
+        (1, 2),
+        ([("t", {"k": [1, 2]})], {"a": 1}),
+        (1.0, 2.0),
+    )
+
+
+def test_compiled_deepcopies_other_values() -> None:
+    @dataclasses.dataclass
+    class Model:
+        x: set[int]
+        y: int = 0
+
+    obj = Model({1, 2})
+    result = asdict(obj, compiled=True)
+    assert result == {"x": {1, 2}, "y": 0}
+    assert result["x"] is not obj.x
+    assert astuple(Model({1}, 2), compiled=True) == ({1}, 2)
+
+
+@pytest.mark.skipif(not PYDANTIC2, reason="computed fields and serializers")
+def test_compiled_pydantic_fallback() -> None:
+    class Model(pydantic.BaseModel):
+        x: int = 1
+
+        @pydantic.computed_field  # type: ignore [prop-decorator]
+        @property
+        def double(self) -> int:
+            return self.x * 2
+
+    # computed fields are only known to pydantic's own serializer
+    assert asdict(Model(), compiled=True) == {"x": 1, "double": 2}
+
+    class Annotated_(pydantic.BaseModel):
+        x: Annotated[int, pydantic.PlainSerializer(str)] = 1
+        y: list[Annotated[int, pydantic.WrapSerializer(lambda v, h: h(v) * 2)]] = [1]
+
+    assert asdict(Annotated_(), compiled=True) == Annotated_().model_dump()
+    assert asdict(Annotated_(), compiled=True) == {"x": "1", "y": [2]}
+
+
+def test_compiled_matches_dataclasses() -> None:
+    @dataclasses.dataclass
+    class Inner:
+        x: int = 0
+
+    class Pair(NamedTuple):
+        a: Inner
+        b: list[Inner]
+
+    @dataclasses.dataclass
+    class Outer:
+        pair: Pair
+        pairs: list[Pair]
+
+    obj = Outer(Pair(Inner(), [Inner(1)]), [Pair(Inner(2), [])])
+    assert asdict(obj, compiled=True) == dataclasses.asdict(obj)
+    assert type(asdict(obj, compiled=True)["pairs"][0]) is Pair
+    assert astuple(obj, compiled=True) == dataclasses.astuple(obj)
+    assert type(astuple(obj, compiled=True)[0]) is Pair
+
+
+def test_compiled_unsupported() -> None:
+    with pytest.raises(TypeError, match="Unsupported"):
+        asdict(object(), compiled=True)
+    with pytest.raises(TypeError, match="Unsupported"):
+        astuple(object(), compiled=True)
+
+
+def test_compiled_replace_dataclass() -> None:
+    @dataclasses.dataclass(frozen=True)
+    class Model:
+        x: int
+        y: list[int] = dataclasses.field(default_factory=list)
+        z: int = dataclasses.field(init=False, default=0)
+
+        def __post_init__(self) -> None:
+            object.__setattr__(self, "z", self.x * 2)
+
+    obj = Model(1, [1])
+    new = replace(obj, x=2)
+    assert new == Model(2, [1]) and new.z == 4
+    assert new.y is obj.y
+    assert replace(obj) == obj
+    assert _codegen.replace_function(Model, ("x",)) is not None
+
+    # errors are the same as dataclasses.replace
+    with pytest.raises(ValueError, match="init=False"):
+        replace(obj, z=1)
+    with pytest.raises(TypeError, match="unexpected keyword"):
+        replace(obj, w=1)
+
+
+def test_compiled_replace_initvar_fallback() -> None:
+    @dataclasses.dataclass
+    class Model:
+        x: int
+        scale: dataclasses.InitVar[int] = 1
+
+        def __post_init__(self, scale: int) -> None:
+            self.x *= scale
+
+    assert _codegen.replace_function(Model, ("x",)) is None
+    assert replace(Model(2, 3), x=1, scale=5) == Model(5)
+
+
+def test_compiled_replace_attrs() -> None:
+    @attrs.frozen
+    class Model:
+        _private: int = 0
+        x: int = 1
+        y: int = attrs.field(init=False, default=5)
+
+    obj = Model(private=1, x=2)
+    assert replace(obj, private=3) == Model(private=3, x=2)
+    assert replace(obj, x=3)._private == 1
+    with pytest.raises(TypeError):
+        replace(obj, y=1)
+    with pytest.raises(TypeError):
+        replace(obj, _private=1)
+
+
+def test_shallow() -> None:
+    @dataclasses.dataclass
+    class Inner:
+        x: int = 0
+
+    @dataclasses.dataclass
+    class Outer:
+        inner: Inner
+        items: list[int]
+
+    class NT(NamedTuple):
+        inner: Inner
+        y: int = 1
+
+    class PM(pydantic.BaseModel):
+        inner: Any
+        y: int = 1
+
+        if PYDANTIC2:  # (computed fields are ignored)
+
+            @pydantic.computed_field  # type: ignore [prop-decorator]
+            @property
+            def z(self) -> int:
+                return 2
+
+    inner, items = Inner(), [1, 2]
+    for obj in (Outer(inner, items), NT(inner), PM(inner=inner)):
+        d = asdict(obj, recurse=False)
+        t = astuple(obj, recurse=False)
+        names = [f.name for f in fields(obj)]
+        assert list(d) == names
+        assert t == tuple(d.values())
+        # nothing is converted or copied
+        assert d[names[0]] is inner
+        assert type(t) is tuple
+    assert asdict(Outer(inner, items), recurse=False)["items"] is items
+    assert asdict_many([NT(inner)] * 2, recurse=False) == [{"inner": inner, "y": 1}] * 2
+    assert astuple_many([NT(inner)], recurse=False, lazy=True).__next__() == (
+        inner,
+        1,
+    )
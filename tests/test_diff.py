@@ -0,0 +1,60 @@
+import dataclasses
+from typing import NamedTuple
+
+import attrs
+import pydantic
+import pytest
+
+import fieldz
+
+
+@attrs.define
+class Owner:
+    name: str
+    age: int = 0
+    note: str = attrs.field(default="", eq=False)
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    owner: Owner
+    tags: list[str] = dataclasses.field(default_factory=list)
+    cache: dict = dataclasses.field(default_factory=dict, compare=False)
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class PM(pydantic.BaseModel):
+    a: int = 0
+    b: Point = Point(0, 0)
+
+
+def test_diff() -> None:
+    a = Record(1, Owner("a"), ["x"])
+    assert fieldz.diff(a, a) == {}
+    assert fieldz.diff(a, Record(1, Owner("a"), ["x"], {"ignored": 1})) == {}
+
+    b = Record(2, Owner("b", note="ignored"), ["x"])
+    assert fieldz.diff(a, b) == {"id": (1, 2), "owner": (a.owner, b.owner)}
+    assert fieldz.diff(a, b, recurse=True) == {
+        "id": (1, 2),
+        "owner.name": ("a", "b"),
+    }
+    assert fieldz.diff(PM(), PM(a=1, b=Point(0, 1)), recurse=True) == {
+        "a": (0, 1),
+        "b.y": (0, 1),
+    }
+    with pytest.raises(TypeError, match="different classes"):
+        fieldz.diff(a, Owner("a"))
+
+
+def test_diff_many() -> None:
+    olds = [Point(0, 0), Point(1, 1), PM()]
+    news = [Point(0, 0), Point(1, 2), PM(a=3)]
+    assert fieldz.diff_many(olds, news) == [{}, {"y": (1, 2)}, {"a": (0, 3)}]
+    with pytest.raises(ValueError):
+        fieldz.diff_many(olds, news[:2])
@@ -200,6 +200,8 @@ def test_adapters(builder: Callable) -> None:
     obj = model()
     assert asdict(obj) == {"a": 0, "b": None, "c": 0.0, "d": False, "e": [], "f": ()}
     assert astuple(obj) == (0, None, 0.0, False, [], ())
+    assert asdict(obj, compiled=True) == asdict(obj)
+    assert astuple(obj, compiled=True) == (0, None, 0.0, False, [], ())
     fields_ = fields(obj)
     assert [f.name for f in fields_] == ["a", "b", "c", "d", "e", "f"]
     assert [f.type for f in fields_] == [
@@ -0,0 +1,159 @@
+import dataclasses
+import datetime
+import enum
+import json
+import os
+import subprocess
+import sys
+from typing import Any
+
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class Limits:
+    low: float = 0.0
+    high: float = 1.0
+
+
+class Point(msgspec.Struct):
+    x: int
+    y: int
+
+
+class Config(pydantic.BaseModel):
+    name: str = "cfg"
+    tags: dict[str, Any] = {}
+    flags: set[str] = set()
+    limits: Limits = Limits()
+    color: Color = Color.RED
+    when: datetime.date = datetime.date(2020, 1, 1)
+    extra: Any = None
+
+
+@dataclasses.dataclass
+class Same:
+    name: str = "cfg"
+
+
+def test_fingerprint() -> None:
+    a = Config(tags={"x": 1, "y": [1, 2]}, flags={"a", "b", "c"})
+    b = Config(tags={"y": [1, 2], "x": 1}, flags={"c", "b", "a"})
+    assert a is not b
+    assert fieldz.fingerprint(a) == fieldz.fingerprint(b)
+    assert len(fieldz.fingerprint(a)) == 32
+
+    for changed in (
+        Config(tags={"x": 1.0, "y": [1, 2]}, flags={"a", "b", "c"}),  # int vs float
+        Config(tags={"x": 1, "y": (1, 2)}, flags={"a", "b", "c"}),  # list vs tuple
+        Config(**{**dict(a), "limits": Limits(high=2)}),  # nested
+        Config(**{**dict(a), "extra": [Point(1, 2)]}),
+    ):
+        assert fieldz.fingerprint(changed) != fieldz.fingerprint(a)
+
+    # same values of another class
+    assert fieldz.fingerprint(Same()) != fieldz.fingerprint(Config())
+
+    # values are not normalized
+    assert fieldz.fingerprint(Limits(0.0)) != fieldz.fingerprint(Limits(-0.0))
+
+    with pytest.raises(TypeError, match="Cannot fingerprint"):
+        fieldz.fingerprint(Config(tags={"x": object()}))
+    with pytest.raises(TypeError, match="Unsupported"):
+        fieldz.fingerprint({"x": 1})
+
+
+def test_fingerprint_arrays() -> None:
+    np = pytest.importorskip("numpy")
+
+    def digest(array: Any) -> str:
+        return fieldz.fingerprint(Config(extra=array))
+
+    assert digest(np.arange(3)) == digest(np.arange(3))
+    assert digest(np.arange(3)) != digest(np.arange(3.0))
+    objects = np.array([{"b": 1, "a": [1]}, Limits()], dtype=object)
+    assert digest(objects) == digest(objects.copy())
+    assert digest(objects) != digest(objects[::-1])
+    with pytest.raises(TypeError, match="Cannot fingerprint"):
+        digest(np.array([object()]))
+
+
+def _digests_in_subprocesses(value: str) -> set[str]:
+    code = f"import fieldz, tests.test_hashing as t; print(fieldz.fingerprint({value}))"
+    return {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+
+
+def test_fingerprint_stable_across_processes() -> None:
+    value = "t.Config(tags={'a': 1, 'b': 2}, flags={'x', 'y'})"
+    assert len(_digests_in_subprocesses(value)) == 1
+
+
+def test_fingerprint_arrays_stable_across_processes() -> None:
+    pytest.importorskip("numpy")
+    value = "t.Config(extra=__import__('numpy').array([{'a': 1}, 'x'], dtype=object))"
+    assert len(_digests_in_subprocesses(value)) == 1
+
+
+def test_schema_hash() -> None:
+    @dataclasses.dataclass
+    class Model:
+        x: int = 0
+        y: "list[int] | None" = dataclasses.field(default_factory=list)
+
+    snapshot = fieldz.schema(Model)
+    assert snapshot["fields"][0] == {
+        "name": "x",
+        "type": "int",
+        "required": False,
+        "default": 0,
+        "default_factory": None,
+        "constraints": {},
+    }
+    digest = fieldz.schema_hash(Model)
+    assert fieldz.schema_hash(Model()) == digest
+    # the snapshot can be stored, and hashed without the class
+    assert fieldz.schema_hash(json.loads(json.dumps(snapshot))) == digest
+
+    # any change to the name, fields, types or defaults changes the digest
+    variants = [
+        ("Other", "x", int, 0),
+        ("Model", "z", int, 0),
+        ("Model", "x", float, 0),
+        ("Model", "x", int, 1),
+    ]
+    hashes = {
+        fieldz.schema_hash(
+            dataclasses.make_dataclass(name, [(key, tp, dataclasses.field(default=d))])
+        )
+        for name, key, tp, d in variants
+    }
+    assert len(hashes) == len(variants)
+    assert digest not in hashes
+
+
+def test_schema_hash_constraints() -> None:
+    class A(pydantic.BaseModel):
+        x: int = pydantic.Field(0, gt=0)
+
+    class B(pydantic.BaseModel):
+        x: int = pydantic.Field(0, ge=0)
+
+    assert fieldz.schema(A)["fields"][0]["constraints"] == {"gt": 0}
+    assert fieldz.schema_hash(A) != fieldz.schema_hash(B)
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import fieldz
+
+# generous upper bound (in microseconds) for the cumulative time of `import fieldz`,
+# which only needs to import the (tiny) package __init__.
+IMPORT_BUDGET_US = 20_000
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Return {module: cumulative import time in us} for running `code`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time() -> None:
+    times = _importtime("import fieldz")
+    assert times["fieldz"] < IMPORT_BUDGET_US
+
+    # nothing but the package itself should be imported
+    for module in (
+        "importlib.metadata",
+        "typing_extensions",
+        "fieldz._functions",
+        "fieldz.adapters",
+    ):
+        assert module not in times
+
+
+def test_lazy_attributes() -> None:
+    assert set(fieldz.__all__) <= set(dir(fieldz))
+    for name in fieldz.__all__:
+        assert getattr(fieldz, name) is not None
+    assert isinstance(fieldz.__version__, str)
+    assert fieldz.adapters._attrs.is_instance(int) is False
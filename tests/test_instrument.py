@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import time
+from typing import TYPE_CHECKING
+
+import attrs
+import pytest
+
+import fieldz
+from fieldz import _functions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@dataclasses.dataclass
+class DC:
+    x: int = 0
+
+
+@attrs.define
+class AT:
+    x: int = 0
+
+
+def test_profile() -> None:
+    out = io.StringIO()
+    with fieldz.profile(file=out) as profiler:
+        assert _functions._recorder is profiler
+        for _ in range(10):
+            fieldz.asdict(DC())
+            fieldz.fields(DC)
+        fieldz.replace(AT(), x=1)
+        fieldz.asdict_many([AT(), AT()])
+        with pytest.raises(TypeError):
+            fieldz.get_adapter(1)
+    assert _functions._recorder is None
+
+    calls = {(s.cls.rpartition(".")[2], s.operation): s for s in fieldz.stats().calls}
+    asdict = calls["DC", "asdict"]
+    assert asdict.adapter == "dataclasses"
+    assert asdict.calls == 10
+    assert asdict.min_ns <= asdict.p50_ns <= asdict.p99_ns <= asdict.max_ns
+    assert asdict.total_ns >= asdict.calls * asdict.min_ns
+    # nested calls (fields -> get_adapter) are not recorded separately
+    assert ("DC", "get_adapter") not in calls
+    assert calls["AT", "replace"].adapter == "attrs"
+    assert calls["AT", "asdict_many"].calls == 1
+    assert calls["int", "get_adapter"].adapter == "-"
+
+    # cache statistics are relative to the start of the profile
+    assert fieldz.stats().caches["fields"].hits == 9
+
+    table = out.getvalue()
+    assert "test_instrument.DC" in table
+    assert "asdict_many" in table
+    assert "hit rate" in table
+
+
+def test_profile_not_reentrant() -> None:
+    with fieldz.profile(quiet=True), pytest.raises(RuntimeError, match="active"):
+        with fieldz.profile():
+            pass
+    assert _functions._recorder is None
+
+
+def test_profile_batches_without_class() -> None:
+    out = io.StringIO()
+    with fieldz.profile(file=out):
+        fieldz.asdict_many([])
+        fieldz.asdict_many(iter([DC()]))
+    calls = {(s.cls, s.operation): s for s in fieldz.stats().calls}
+    assert calls["-", "asdict_many"].adapter == "-"
+    # batches given as iterators are attributed to the class of their first item
+    assert calls[f"{__name__}.DC", "asdict_many"].adapter == "dataclasses"
+    assert "asdict_many" in out.getvalue()
+
+
+def test_profile_lazy() -> None:
+    def slow() -> Iterator[DC]:
+        for i in range(3):
+            time.sleep(0.01)
+            yield DC(i)
+
+    with fieldz.profile(quiet=True):
+        results = fieldz.asdict_many(slow(), lazy=True)
+        assert not fieldz.stats().calls  # recorded once consumed
+        assert list(results) == [{"x": i} for i in range(3)]
+        fieldz.replace_many([AT()], lazy=True, x=1)  # never consumed
+    (op,) = fieldz.stats().calls
+    assert (op.cls.rpartition(".")[2], op.operation) == ("DC", "asdict_many")
+    # the consumption of the generator is timed, not just its creation
+    assert op.total_ns >= 30_000_000
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import dataclasses
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import attrs
+import pytest
+
+import fieldz
+
+
+@attrs.define
+class Item:
+    name: str
+    tags: list[str] = attrs.Factory(list)
+
+
+@dataclasses.dataclass
+class Record:
+    id: int
+    item: Item
+    values: dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+def _records(n: int) -> list[Record]:
+    return [Record(i, Item(f"i{i}", ["a"] * (i % 3)), {"x": i / 2}) for i in range(n)]
+
+
+class _NoExecutor(Executor):
+    def submit(self, *args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("small inputs should not be submitted")
+
+
+def test_parallel_asdict_many() -> None:
+    records = _records(1050)
+    expected = fieldz.asdict_many(records)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        result = fieldz.parallel.asdict_many(records, executor=pool, chunksize=100)
+        assert result == expected
+        # generators are consumed in chunks, and results are yielded in order
+        lazy = fieldz.parallel.asdict_many(
+            iter(records), executor=pool, chunksize=100, compiled=True, lazy=True
+        )
+        expected = fieldz.asdict_many(records, compiled=True)
+        assert next(lazy) == expected[0]
+        assert list(lazy) == expected[1:]
+
+
+@pytest.mark.parametrize("recurse", [True, False])
+def test_parallel_options(recurse: bool) -> None:
+    records = _records(500)
+    with ThreadPoolExecutor(2) as pool:
+        result = fieldz.parallel.asdict_many(
+            records, executor=pool, chunksize=7, recurse=recurse
+        )
+    assert result == fieldz.asdict_many(records, recurse=recurse)
+
+    # inputs of fewer than two chunks are converted in-process
+    small = fieldz.parallel.asdict_many(
+        records, executor=_NoExecutor(), chunksize=251, recurse=recurse
+    )
+    assert small == fieldz.asdict_many(records, recurse=recurse)
+    assert fieldz.parallel.asdict_many([], executor=_NoExecutor()) == []
+
+
+def test_parallel_errors() -> None:
+    with ThreadPoolExecutor(2) as pool:
+        with pytest.raises(TypeError, match="Unsupported"):
+            fieldz.parallel.asdict_many([*_records(10), 1], executor=pool, chunksize=2)
+    with pytest.raises(ValueError, match="chunksize"):
+        fieldz.parallel.asdict_many([], chunksize=0)
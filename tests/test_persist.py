@@ -0,0 +1,162 @@
+# (no `from __future__ import annotations`: types must be objects, not strings)
+import dataclasses
+import importlib
+import sys
+import textwrap
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Annotated, NamedTuple, TypedDict
+
+import annotated_types as at
+import attrs
+import pydantic
+import pytest
+
+import fieldz
+from fieldz import _functions
+
+PYDANTIC2 = not pydantic.VERSION.startswith("1.")
+
+
+def _default_tags() -> list[str]:
+    return ["a"]
+
+
+@dataclasses.dataclass
+class DC:
+    x: Annotated[int, at.Ge(0), at.Le(10)] = 1
+    tags: list[str] = dataclasses.field(default_factory=_default_tags)
+    meta: str = dataclasses.field(default="m", metadata={"unit": "s"})
+
+
+@attrs.define
+class AT:
+    x: Annotated[float, at.Gt(0)] = 1.0
+    tags: list[str] = attrs.Factory(list)
+
+
+class PD(pydantic.BaseModel):
+    x: int = pydantic.Field(0, ge=0, description="x", json_schema_extra={"k": 1})
+    y: Annotated[str, at.MaxLen(3)] = "y"
+    items: list[DC] = []
+
+
+class NT(NamedTuple):
+    x: int
+    y: str = "y"
+
+
+class TD(TypedDict):
+    x: int
+
+
+class Unpicklable(pydantic.BaseModel):
+    x: Annotated[int, at.Predicate(lambda x: x > 0)] = 1
+
+
+CLASSES = [DC, AT, PD, NT, TD, Unpicklable]
+# e.g. a lambda in a constraint: extracted in every process. pydantic v1 also
+# gives the dataclasses used in its models native fields that aren't in the class
+UNSTORED = [Unpicklable] if PYDANTIC2 else [DC, Unpicklable]
+
+
+@pytest.fixture(autouse=True)
+def _no_persistent_cache() -> Iterator[None]:
+    fieldz.clear_cache()
+    try:
+        yield
+    finally:
+        fieldz.persistent_cache(None)
+        fieldz.clear_cache()
+
+
+def test_persistent_cache(tmp_path: Path) -> None:
+    assert _functions._persistent is None  # disabled by default
+    fieldz.persistent_cache(tmp_path)
+    extracted = {cls: fieldz.fields(cls) for cls in CLASSES}
+    assert not list(tmp_path.iterdir())  # written when disabled (or at exit)
+    fieldz.persistent_cache(None)
+    assert [p.name for p in tmp_path.iterdir()] == [f"{__name__}.pickle"]
+
+    # as if in a new process
+    fieldz.clear_cache()
+    fieldz.persistent_cache(tmp_path)
+    store = _functions._persistent
+    assert store is not None
+    for cls in (cls for cls in CLASSES if cls not in UNSTORED):
+        loaded = store.load(cls)
+        assert loaded == extracted[cls] == fieldz.fields(cls)
+        for new, old in zip(loaded, extracted[cls], strict=True):
+            # objects from the class are looked up, not copies (except strings)
+            for name in ("native_field", "type", "default", "default_factory"):
+                value = getattr(old, name)
+                assert getattr(new, name) is value or isinstance(
+                    value, int | float | str
+                )
+            assert new.annotated_type == old.annotated_type
+    assert fieldz.fields(DC)[0].constraints == fieldz.Constraints(ge=0, le=10)
+    for cls in UNSTORED:
+        assert store.load(cls) is None
+        assert fieldz.fields(cls) == extracted[cls]
+
+
+def test_persistent_cache_unsupported(tmp_path: Path) -> None:
+    @dataclasses.dataclass
+    class Local:
+        x: int = 0
+
+    fieldz.persistent_cache(tmp_path)
+    assert fieldz.fields(Local)
+    fieldz.persistent_cache(None)
+    assert not list(tmp_path.iterdir())  # classes defined in functions
+
+
+def test_persistent_cache_stale(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = """
+    import dataclasses
+
+    @dataclasses.dataclass
+    class Model:
+        x: int = {}
+    """
+    module = tmp_path / "fieldz_persist_model.py"
+    module.write_text(textwrap.dedent(source.format(0)))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, module.stem, raising=False)
+    cache = tmp_path / "cache"
+
+    fieldz.persistent_cache(cache)
+    mod = importlib.import_module(module.stem)
+    assert fieldz.fields(mod.Model)[0].default == 0
+    fieldz.persistent_cache(None)
+
+    # the module changes: its fields are extracted again, and stored
+    module.write_text(textwrap.dedent(source.format(10)))
+    mod = importlib.reload(mod)
+    fieldz.clear_cache()
+    fieldz.persistent_cache(cache)
+    assert _functions._persistent is not None
+    assert _functions._persistent.load(mod.Model) is None
+    assert fieldz.fields(mod.Model)[0].default == 10
+    fieldz.persistent_cache(None)
+    fieldz.clear_cache()
+    fieldz.persistent_cache(cache)
+    assert _functions._persistent.load(mod.Model) is not None
+
+
+def test_persistent_cache_cleared(tmp_path: Path) -> None:
+    fieldz.persistent_cache(tmp_path)
+    fieldz.fields(NT)
+    fieldz.fields(AT)
+    fieldz.persistent_cache(None)
+
+    fieldz.persistent_cache(tmp_path)
+    store = _functions._persistent
+    assert store is not None
+    fieldz.clear_cache(NT)
+    assert store.load(NT) is None
+    assert store.load(AT) is not None
+    fieldz.clear_cache()
+    assert store.load(AT) is None
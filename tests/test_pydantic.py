@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import Annotated
 
 import annotated_types as at
@@ -33,3 +34,19 @@ def test_pydantic_constraints() -> None:
                 assert f.constraints.le == 100
                 assert f.default == 50
                 assert f.default == 50
+
+
+def test_pydantic_field_constraints_differ() -> None:
+    # in pydantic v2, each Field(...) has its own metadata object, of the same
+    # class, with only the constraints that it sets
+    class A(BaseModel):
+        a: str = f_field
+
+    class B(BaseModel):
+        b: Decimal = Field(default=Decimal(1), max_digits=3)
+
+    (a,) = fields(A)
+    (b,) = fields(B)
+    assert a.constraints and a.constraints.pattern == PATTERN
+    assert b.constraints and b.constraints.max_digits == 3
+    assert b.constraints.pattern is None
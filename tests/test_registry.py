@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib.metadata
+import sys
+import textwrap
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import fieldz
+from fieldz import _functions, _registry, adapters
+from fieldz.adapters import _dataclasses
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def _restore_registry() -> Iterator[None]:
+    registrations = list(_registry._registrations)
+    index, pending = _registry._index, _registry._pending
+    try:
+        yield
+    finally:
+        _registry._registrations[:] = registrations
+        _registry._index, _registry._pending = index, pending
+        fieldz.clear_cache()
+
+
+class Record:
+    """An in-house record type: fields are the slots of the class."""
+
+    __slots__: tuple[str, ...] = ()
+
+    def __init__(self, *args: Any) -> None:
+        for name, value in zip(self.__slots__, args, strict=False):
+            setattr(self, name, value)
+
+
+class Point(Record):
+    __slots__ = ("x", "y")
+
+
+class RecordAdapter:
+    def __init__(self) -> None:
+        self.checked: list[type] = []
+
+    def is_instance(self, obj: Any) -> bool:
+        cls = obj if isinstance(obj, type) else type(obj)
+        self.checked.append(cls)
+        return issubclass(cls, Record)
+
+    def fields(self, obj: Any) -> tuple[fieldz.Field, ...]:
+        return tuple(fieldz.Field(name=name) for name in obj.__slots__)
+
+    def asdict(self, obj: Any) -> dict[str, Any]:
+        return {name: getattr(obj, name) for name in obj.__slots__}
+
+    def astuple(self, obj: Any) -> tuple[Any, ...]:
+        return tuple(self.asdict(obj).values())
+
+    def replace(self, obj: Any, /, **changes: Any) -> Any:
+        return type(obj)(*{**self.asdict(obj), **changes}.values())
+
+    def params(self, obj: Any) -> fieldz.DataclassParams:
+        return fieldz.DataclassParams()
+
+
+@pytest.mark.parametrize("types", [[Record], [f"{__name__}.Record"], Record])
+def test_register_adapter(types: Any) -> None:
+    with pytest.raises(TypeError, match="Unsupported"):
+        fieldz.get_adapter(Point)  # the negative result is cached...
+
+    adapter = RecordAdapter()
+    assert fieldz.register_adapter(adapter, types=types) is adapter
+    # ...and cleared by the registration
+    assert fieldz.get_adapter(Point(1, 2)) is adapter
+    assert fieldz.asdict(Point(1, 2)) == {"x": 1, "y": 2}
+    assert fieldz.asdict(fieldz.replace(Point(1, 2), y=3), compiled=True) == {
+        "x": 1,
+        "y": 3,
+    }
+    assert [f.name for f in fieldz.fields(Point)] == ["x", "y"]
+
+
+def test_dispatch_through_mro() -> None:
+    adapter = fieldz.register_adapter(RecordAdapter(), types=[Record])
+
+    @dataclasses.dataclass
+    class Other:
+        x: int = 0
+
+    # only the adapters owning a base (or marker) of a class are asked about it
+    assert fieldz.get_adapter(Other) is _dataclasses
+    assert fieldz.get_adapter(Point) is adapter
+    assert adapter.checked == [Point]
+
+
+def test_priority() -> None:
+    @dataclasses.dataclass
+    class Model:
+        x: int = 0
+
+    class DataclassAdapter(RecordAdapter):
+        def is_instance(self, obj: Any) -> bool:
+            return True
+
+    low = DataclassAdapter()
+    fieldz.register_adapter(low, priority=0, markers="__dataclass_fields__")
+    assert fieldz.get_adapter(Model) is _dataclasses
+    high = fieldz.register_adapter(DataclassAdapter(), markers="__dataclass_fields__")
+    assert fieldz.get_adapter(Model) is high
+    # registering again replaces the previous registration
+    fieldz.register_adapter(high, priority=0)
+    assert fieldz.get_adapter(Model) is _dataclasses
+    fieldz.register_adapter(low, priority=1000)  # no types nor markers: any class
+    assert fieldz.get_adapter(Model) is low
+
+
+def test_deprecated_adapters_tuple() -> None:
+    with pytest.deprecated_call():
+        builtins = _functions.ADAPTERS
+    assert builtins[0] is adapters._pydantic
+    assert builtins[-1] is adapters._typed_dict
+    adapter = fieldz.register_adapter(RecordAdapter(), types=[Record])
+    with pytest.deprecated_call():
+        assert _functions.ADAPTERS == (adapter, *builtins)
+    with pytest.raises(AttributeError):
+        _functions.MISSING_NAME  # noqa: B018
+
+
+def test_register_invalid() -> None:
+    with pytest.raises(TypeError, match=r"missing.*'replace'"):
+        fieldz.register_adapter(object(), types=[Record])  # type: ignore[type-var]
+
+
+def test_entry_points(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    (tmp_path / "fake_plugin.py").write_text(
+        textwrap.dedent(
+            f"""
+            import fieldz
+            from {__name__} import RecordAdapter
+
+            adapter = fieldz.register_adapter(RecordAdapter(), types=["fakelib.Base"])
+            """
+        )
+    )
+    (tmp_path / "broken_plugin.py").write_text("raise ImportError('nope')")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    group = "fieldz.adapters"
+    eps = [
+        importlib.metadata.EntryPoint("fakelib", "fake_plugin", group),
+        importlib.metadata.EntryPoint("brokenlib", "broken_plugin", group),
+    ]
+
+    def entry_points(*, group: str) -> list[importlib.metadata.EntryPoint]:
+        return eps if group == _registry.ENTRY_POINT_GROUP else []
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    monkeypatch.delitem(sys.modules, "fake_plugin", raising=False)
+    _registry._pending = None
+
+    # the plugin is only imported once a class of its package is looked up
+    with pytest.raises(TypeError):
+        fieldz.get_adapter(Point)
+    assert "fake_plugin" not in sys.modules
+
+    base = type("Base", (Record,), {"__module__": "fakelib", "__slots__": ()})
+    sub = type("Sub", (base,), {"__module__": "elsewhere", "__slots__": ("a",)})
+    assert fieldz.asdict(sub(1)) == {"a": 1}
+    assert fieldz.get_adapter(sub) is sys.modules["fake_plugin"].adapter
+
+    broken = type("Broken", (), {"__module__": "brokenlib.models"})
+    with pytest.warns(RuntimeWarning, match="broken_plugin.*nope"):
+        with pytest.raises(TypeError):
+            fieldz.get_adapter(broken)
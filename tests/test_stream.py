@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from typing import Any, NamedTuple
+
+import attrs
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Tag(msgspec.Struct):
+    name: str
+
+
+class Owner(pydantic.BaseModel):
+    name: str
+    tags: list[Any] = []
+
+
+@attrs.define
+class Node:
+    value: Any
+    children: list[Node] = attrs.field(factory=list)
+
+
+@dataclasses.dataclass
+class Root:
+    owner: Owner
+    points: tuple[Point, ...]
+    lookup: dict[str, Any]
+    node: Node | None = None
+
+
+def _rebuild(events: Any) -> Any:
+    """Build the nested result from iter_asdict events."""
+    root: Any = None
+    containers: dict[tuple, Any] = {}
+    for path, value in events:
+        if isinstance(value, dict | list):
+            containers[path] = value
+        if not path:
+            root = value
+            continue
+        parent = containers[path[:-1]]
+        if isinstance(parent, list):
+            parent.append(value)
+        else:
+            parent[path[-1]] = value
+    return root
+
+
+def test_iter_asdict() -> None:
+    obj = Root(
+        owner=Owner(name="o", tags=[Tag("a"), Tag("b")]),
+        points=(Point(1, 2),),
+        lookup={"k": [1, {"n": Node(1)}]},
+        node=Node(0, [Node(1), Node(2)]),
+    )
+    events = list(fieldz.iter_asdict(obj))
+    assert events[:5] == [
+        ((), {}),
+        (("owner",), {}),
+        (("owner", "name"), "o"),
+        (("owner", "tags"), []),
+        (("owner", "tags", 0), {}),
+    ]
+    assert (("points",), []) in events
+
+    expected = fieldz.asdict(obj, compiled=True)
+    # tuples (including named tuples) are rebuilt as lists
+    expected["points"] = [list(point) for point in expected["points"]]
+    assert _rebuild(events) == expected
+
+
+def test_iter_asdict_deep() -> None:
+    depth = sys.getrecursionlimit() * 2
+    node = leaf = Node(0)
+    for i in range(depth):
+        node = Node(i, [node])
+    events = fieldz.iter_asdict(node)
+    assert sum(1 for _ in events) == 3 * (depth + 1)
+    # the same object may appear more than once, but not inside itself
+    assert list(fieldz.iter_asdict(Node(0, [leaf, leaf])))
+    leaf.children.append(leaf)
+    with pytest.raises(ValueError, match="Circular reference"):
+        list(fieldz.iter_asdict(node))
+
+
+def test_iter_asdict_unsupported() -> None:
+    with pytest.raises(TypeError, match="Unsupported"):
+        next(fieldz.iter_asdict(1))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Annotated, Any, NamedTuple, Optional, TypedDict
+
+import attrs
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+
+
+@dataclasses.dataclass(frozen=True)
+class Inner:
+    x: int
+    y: float = 0.5
+
+
+@attrs.define
+class Item:
+    name: str
+    _secret: int = 0
+    tags: list[str] = attrs.Factory(list)
+
+
+class Point(msgspec.Struct):
+    x: int
+    y: int = 0
+
+
+class Pair(NamedTuple):
+    a: int
+    b: Inner | None = None
+
+
+class Movie(TypedDict):
+    title: str
+    inner: Inner
+
+
+class Model(pydantic.BaseModel):
+    value: int = pydantic.Field(alias="v")
+    items: list[Inner] = []
+
+
+@dataclasses.dataclass
+class Outer:
+    inner: Inner
+    items: list[Item]
+    points: dict[str, Point]
+    pair: Pair
+    movie: Movie
+    model: Model
+    maybe: Optional[Inner] = None  # noqa: UP045
+    both: tuple[Inner, int] = (Inner(0), 0)
+    annotated: Annotated[frozenset[Inner], "meta"] = frozenset()
+    anything: Any = None
+    union: Inner | Point | None = None
+
+
+@dataclasses.dataclass
+class Node:
+    value: int
+    children: list[Node] = dataclasses.field(default_factory=list)
+
+
+def _outer() -> Outer:
+    return Outer(
+        inner=Inner(1, 2.0),
+        items=[Item("a", 1, ["t"]), Item("b")],
+        points={"p": Point(1, 2)},
+        pair=Pair(1, Inner(2)),
+        movie={"title": "m", "inner": Inner(3)},
+        model=Model(v=1, items=[Inner(9)]),
+        maybe=Inner(4),
+        both=(Inner(5), 6),
+        annotated=frozenset({Inner(7)}),  # type: ignore [arg-type]
+        anything={"x": 1},
+    )
+
+
+def test_round_trip() -> None:
+    obj = _outer()
+    data = fieldz.asdict(obj, compiled=True)
+    assert data["model"] == {"value": 1, "items": [{"x": 9, "y": 0.5}]}
+    assert fieldz.from_dict(Outer, data) == obj
+    assert fieldz.from_dicts(Outer, [data, data]) == [obj, obj]
+    assert list(fieldz.from_dicts(Outer, [data], lazy=True)) == [obj]
+    # named tuples are kept by asdict, and are lists in JSON
+    assert data["pair"] == Pair(1, {"x": 2, "y": 0.5})  # type: ignore [arg-type]
+    data["pair"] = [1, {"x": 2}]
+    assert fieldz.from_dict(Outer, data) == obj
+
+
+def test_nested_values_as_is() -> None:
+    obj = _outer()
+    # instances (rather than dicts) and unions of several classes are kept as-is
+    data = {f.name: getattr(obj, f.name) for f in fieldz.fields(Outer)}
+    data["union"] = {"x": 1}
+    result = fieldz.from_dict(Outer, data)
+    assert result.inner is obj.inner
+    assert result.union == {"x": 1}
+
+
+def test_defaults() -> None:
+    a = fieldz.from_dict(Item, {"name": "a", "extra": 1})
+    b = fieldz.from_dict(Item, {"name": "b"})
+    assert a == Item("a")
+    assert a.tags is not b.tags
+    assert fieldz.from_dict(Pair, {"a": 1}) == Pair(1)
+    assert fieldz.from_dict(Point, {"x": 1}) == Point(1)
+    assert fieldz.from_dict(Inner, {"x": 1, "y": 2}) == Inner(1, 2)
+
+    with pytest.raises(TypeError, match="'x'"):
+        fieldz.from_dict(Inner, {"y": 1})
+    with pytest.raises(pydantic.ValidationError):
+        fieldz.from_dict(Model, {})
+    with pytest.raises(TypeError, match="Unsupported"):
+        fieldz.from_dict(int, {})
+
+
+def test_recursive() -> None:
+    tree = Node(1, [Node(2, [Node(3)]), Node(4)])
+    assert fieldz.from_dict(Node, fieldz.asdict(tree)) == tree
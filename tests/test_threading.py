@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import dataclasses
+import gc
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import attrs
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+THREADS = 8
+
+
+@pytest.fixture(autouse=True)
+def _switch_often() -> Iterator[None]:
+    # make threads switch as often as possible, to interleave cache operations
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def _run(fn: Callable[[int], Any], n: int = THREADS) -> list[Any]:
+    """Run `fn(i)` for i in range(n) in `n` threads, starting at the same time."""
+    barrier = threading.Barrier(n)
+
+    def target(i: int) -> Any:
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(n) as pool:
+        return list(pool.map(target, range(n)))
+
+
+def _make_class(kind: str, name: str) -> type:
+    """Create a new class of `kind`, whose only field is called `name`."""
+    if kind == "dataclass":
+        return dataclasses.make_dataclass(
+            "T", [(name, int, dataclasses.field(default=0))]
+        )
+    if kind == "attrs":
+        return attrs.make_class("T", {name: attrs.field(default=0)})
+    if kind == "pydantic":
+        return pydantic.create_model("T", **{name: (int, 0)})  # type: ignore
+    return msgspec.defstruct("T", [(name, int, 0)])
+
+
+KINDS = ["dataclass", "attrs", "pydantic", "msgspec"]
+
+
+def test_dynamic_classes() -> None:
+    """Classes created and collected concurrently never see each other's entries.
+
+    The ids of collected classes are reused by new ones: a stale entry would
+    return the fields or functions of another class.
+    """
+
+    def work(i: int) -> int:
+        checked = 0
+        for j in range(50):
+            kind = KINDS[(i + j) % len(KINDS)]
+            name = f"f{i}_{j}"
+            cls = _make_class(kind, name)
+            obj = cls(**{name: j})
+            assert fieldz.get_adapter(cls).__name__.endswith(
+                kind.replace("dataclass", "dataclasses")
+            )
+            assert fieldz.fields(cls)[0].name == name
+            assert fieldz.asdict(obj, recurse=False) == {name: j}
+            assert fieldz.asdict(obj, compiled=True) == {name: j}
+            assert fieldz.astuple(obj, compiled=True) == (j,)
+            assert fieldz.asdict(fieldz.replace(obj, **{name: -j})) == {name: -j}
+            if j % 10 == 0:
+                gc.collect()
+            checked += 1
+        return checked
+
+    assert sum(_run(work)) == THREADS * 50
+
+
+# (at module level: pydantic v1 can't resolve the string annotations of local classes)
+@dataclasses.dataclass
+class SharedPoint:
+    x: int = 0
+    y: Optional[int] = None  # noqa: UP045
+
+
+class SharedModel(pydantic.BaseModel):
+    point: SharedPoint = SharedPoint()
+    tags: list[str] = []
+
+
+def test_shared_classes_with_clear_cache() -> None:
+    types = [
+        Union[int, str, None],  # noqa: UP007
+        list[dict[str, SharedPoint]],
+        Optional[SharedModel],  # noqa: UP045
+    ]
+    expected = [fieldz.display_as_type(tp) for tp in types]
+    model = SharedModel(point=SharedPoint(1, 2), tags=["a"])
+    stop = threading.Event()
+
+    def clear() -> None:
+        while not stop.is_set():
+            fieldz.clear_cache()
+            fieldz.clear_cache(SharedPoint)
+
+    def work(i: int) -> None:
+        for _ in range(500):
+            assert [f.name for f in fieldz.fields(SharedModel)] == ["point", "tags"]
+            assert fieldz.params(SharedPoint).eq
+            assert fieldz.asdict(model, compiled=True) == {
+                "point": {"x": 1, "y": 2},
+                "tags": ["a"],
+            }
+            assert fieldz.diff(model.point, SharedPoint(1, 3)) == {"y": (2, 3)}
+            assert [fieldz.display_as_type(tp) for tp in types] == expected
+
+    clearer = threading.Thread(target=clear)
+    clearer.start()
+    try:
+        _run(work)
+    finally:
+        stop.set()
+        clearer.join()
+
+
+def test_profile_threads() -> None:
+    @dataclasses.dataclass
+    class Point:
+        x: int = 0
+
+    with fieldz.profile(quiet=True):
+        _run(lambda i: [fieldz.asdict(Point(i)) for _ in range(300)])
+    (asdict,) = [s for s in fieldz.stats().calls if s.operation == "asdict"]
+    assert asdict.calls == THREADS * 300
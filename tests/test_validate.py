@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+from decimal import Decimal
+from typing import Annotated, TypedDict
+
+import annotated_types as at
+import msgspec
+import pydantic
+import pytest
+
+import fieldz
+from fieldz import ConstraintViolation
+from fieldz._validate import _decimal_digits
+
+PYDANTIC2 = not pydantic.VERSION.startswith("1.")
+
+
+@dataclasses.dataclass
+class DC:
+    a: Annotated[int, at.Ge(0), at.Lt(10), at.MultipleOf(2)] = 0
+    b: Annotated[str, at.MinLen(1), at.MaxLen(3)] = "b"
+    c: Annotated[float | None, at.Gt(0)] = None
+    d: Annotated[int, at.Predicate(lambda x: x != 7)] = 0
+    e: int = -1  # unconstrained
+
+
+class MS(msgspec.Struct):
+    x: Annotated[str, msgspec.Meta(pattern="^[a-z]+$")] = "x"
+    t: Annotated[datetime.datetime | None, msgspec.Meta(tz=True)] = None
+
+
+class PM(pydantic.BaseModel):
+    x: Annotated[int, at.Le(5)] = 0
+
+
+class TD(TypedDict, total=False):
+    x: Annotated[int, at.Gt(0)]
+
+
+def test_validator() -> None:
+    validate = fieldz.validator(DC)
+    assert fieldz.validator(DC()) is validate  # cached per class
+    assert validate(DC()) == ()
+
+    errors = validate(DC(a=11, b="", c=-1.0, d=7))
+    assert errors[:4] == (
+        ConstraintViolation("a", "lt", 10, 11),
+        ConstraintViolation("a", "multiple_of", 2, 11),
+        ConstraintViolation("b", "min_length", 1, ""),
+        ConstraintViolation("c", "gt", 0, -1.0),
+    )
+    assert (errors[4].field, errors[4].constraint, errors[4].value) == (
+        "d",
+        "predicate",
+        7,
+    )
+    assert len(errors) == 5
+    assert str(errors[0]) == "a: 11 violates lt=10"
+    assert validate(DC(b="abcd"))[0].constraint == "max_length"
+
+
+def test_validator_other_libraries() -> None:
+    assert fieldz.validator(MS)(MS()) == ()
+    naive = datetime.datetime(2020, 1, 1)
+    errors = fieldz.validator(MS)(MS(x="X1", t=naive))
+    assert [e.constraint for e in errors] == ["pattern", "tz"]
+    aware = naive.replace(tzinfo=datetime.timezone.utc)
+    assert fieldz.validator(MS)(MS(t=aware)) == ()
+
+    # (without validation)
+    pm = PM.model_construct(x=6) if PYDANTIC2 else PM.construct(x=6)
+    assert fieldz.validator(PM)(pm) == (ConstraintViolation("x", "le", 5, 6),)
+
+    assert fieldz.validator(TD)({}) == ()
+    assert fieldz.validator(TD)({"x": 0}) == (ConstraintViolation("x", "gt", 0, 0),)
+
+
+def test_decimal_digits() -> None:
+    assert _decimal_digits(Decimal("123.45")) == (5, 2)
+    assert _decimal_digits(Decimal("0.001")) == (3, 3)
+    assert _decimal_digits(Decimal("1E+3")) == (4, 0)
+
+
+def test_validate_many() -> None:
+    objs = [DC(), DC(a=-2), MS(), MS(x="")]
+    result = fieldz.validate_many(objs)
+    assert list(result) == [1, 3]
+    assert result[1] == (ConstraintViolation("a", "ge", 0, -2),)
+    assert fieldz.validate_many([{"x": 1}, {"x": -1}], cls=TD) == {
+        1: (ConstraintViolation("x", "gt", 0, -1),)
+    }
+    with pytest.raises(TypeError, match="Unsupported"):
+        fieldz.validate_many([1])
+
+
+@dataclasses.dataclass
+class Reading:
+    value: Annotated[float, at.Ge(0), at.Le(1)] = 0.0
+    count: Annotated[int, at.MultipleOf(2)] = 0
+    label: Annotated[str, at.MaxLen(2)] = ""
+    note: str = ""
+
+
+def test_validate_columns_python() -> None:
+    columns = {
+        "value": [0.5, -1.0, 2.0, None],
+        "count": (2, 3, 4, 6),
+        "label": ["a", "abc", "", "ab"],
+        "note": ["x", "y", "z", "w"],
+    }
+    assert fieldz.validate_columns(Reading, columns) == {
+        "value": [False, True, True, False],
+        "count": [False, True, False, False],
+        "label": [False, True, False, False],
+    }
+    assert fieldz.validate_columns(Reading, columns, indices=True) == {
+        "value": [1, 2],
+        "count": [1],
+        "label": [1],
+    }
+    with pytest.raises(ValueError, match="Unknown fields"):
+        fieldz.validate_columns(Reading, {"nope": []})
+
+
+def test_validate_columns_numpy() -> None:
+    import array
+
+    np = pytest.importorskip("numpy")
+
+    columns = {
+        "value": np.array([0.5, -1.0, np.nan, 1.0]),
+        "count": array.array("q", [2, 3, 4, 6]),  # a buffer
+        "label": np.array(["a", "abc", "", "ab"]),
+    }
+    result = fieldz.validate_columns(Reading, columns)
+    assert result["value"].tolist() == [False, True, True, False]
+    assert result["count"].tolist() == [False, True, False, False]
+    assert result["label"].tolist() == [False, True, False, False]
+    # object arrays (e.g. with missing values) are checked value by value
+    objects = np.array([0.5, None, 3], dtype=object)
+    result = fieldz.validate_columns(Reading, {"value": objects}, indices=True)
+    assert result["value"].tolist() == [2]
+
+    # matches the per-instance validator
+    objs = fieldz.from_columns(Reading, columns)
+    assert sorted(fieldz.validate_many(objs)) == [1, 2]
+
+
+def test_validate_columns_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    import array
+    import sys
+
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    column = array.array("d", [0.5, -1.0])
+    result = fieldz.validate_columns(Reading, {"value": column}, indices=True)
+    assert result == {"value": [1]}